@@ -0,0 +1,136 @@
+"""Модуль содержит сценарии нагрузки на API сервиса.
+
+Запросы выполняются в том же процессе через ASGI транспорт httpx,
+поэтому измеряется время обработки запроса приложением без сетевого стека.
+"""
+
+from random import Random
+
+import httpx
+from fastapi import FastAPI, status
+
+from benchmarks.dataset import (
+    CATEGORIES,
+    PASSWORD,
+    Dataset,
+    random_advertisement,
+    seed_advertisements,
+)
+from benchmarks.stats import LatencyStats, measure
+
+BASE_URL = 'http://benchmark'
+PAGE_LIMIT = 20
+PRICE_RANGE_MAX = 90000
+PRICE_RANGE_WIDTH = 10000
+
+
+async def run_api_benchmarks(  # noqa: WPS210, WPS212, WPS217
+    app: FastAPI,
+    dataset: Dataset,
+    rng: Random,
+    requests: int,
+    auth_requests: int,
+    concurrency: int,
+) -> dict[str, LatencyStats]:
+    """Выполнить сценарии register, auth, create, list, detail и delete.
+
+    Args:
+        app (FastAPI): приложение
+        dataset (Dataset): набор данных в бд
+        rng (Random): генератор случайных чисел
+        requests (int): количество запросов в сценариях create, list, detail и delete
+        auth_requests (int): количество запросов в сценариях register и auth (bcrypt)
+        concurrency (int): количество параллельных клиентов
+
+    Returns:
+        dict[str, LatencyStats]: статистика по сценариям
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+        clients_count = min(concurrency, len(dataset.user_ids))
+        tokens = [
+            await _access_token(client, dataset.usernames[index])
+            for index in range(clients_count)
+        ]
+        owner_ids = dataset.user_ids[:clients_count]
+
+        async def register(index: int) -> bool:  # noqa: WPS430
+            response = await client.post('/api/users/register', json={
+                'username': 'bench-new-user-{0}'.format(index),
+                'password': PASSWORD,
+            })
+            return response.status_code == status.HTTP_200_OK
+
+        async def auth(index: int) -> bool:  # noqa: WPS430
+            response = await client.post('/api/users/auth', data={
+                'username': rng.choice(dataset.usernames),
+                'password': PASSWORD,
+            })
+            return response.status_code == status.HTTP_200_OK
+
+        async def create(index: int) -> bool:  # noqa: WPS430
+            response = await client.post(
+                '/api/advertisements/create',
+                json=random_advertisement(rng),
+                headers=_auth_header(tokens[index % clients_count]),
+            )
+            return response.status_code == status.HTTP_200_OK
+
+        async def list_page(index: int) -> bool:  # noqa: WPS430
+            response = await client.get(
+                '/api/advertisements',
+                params=_list_params(rng, dataset),
+            )
+            return response.status_code == status.HTTP_200_OK
+
+        async def detail(index: int) -> bool:  # noqa: WPS430
+            response = await client.get(
+                '/api/advertisements/{0}'.format(rng.choice(dataset.advertisement_ids)),
+            )
+            return response.status_code == status.HTTP_200_OK
+
+        latencies = {
+            'register': await measure(register, auth_requests, concurrency),
+            'auth': await measure(auth, auth_requests, concurrency),
+            'create': await measure(create, requests, concurrency),
+            'list': await measure(list_page, requests, concurrency),
+            'detail': await measure(detail, requests, concurrency),
+        }
+
+        delete_targets = await seed_advertisements(owner_ids, requests, rng)
+
+        async def delete(index: int) -> bool:  # noqa: WPS430
+            response = await client.delete(
+                '/api/advertisements/{0}'.format(delete_targets[index]),
+                headers=_auth_header(tokens[index % clients_count]),
+            )
+            return response.status_code == status.HTTP_200_OK
+
+        latencies['delete'] = await measure(delete, requests, concurrency)
+    return latencies
+
+
+async def _access_token(client: httpx.AsyncClient, username: str) -> str:
+    response = await client.post('/api/users/auth', data={
+        'username': username,
+        'password': PASSWORD,
+    })
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+def _auth_header(token: str) -> dict[str, str]:
+    return {'Authorization': 'Bearer {0}'.format(token)}
+
+
+def _list_params(rng: Random, dataset: Dataset) -> dict:
+    query = {'limit': PAGE_LIMIT}
+    variant = rng.randrange(4)
+    if variant == 1:
+        query['category'] = rng.choice(CATEGORIES)
+    elif variant == 2:
+        query['after_id'] = rng.choice(dataset.advertisement_ids)
+    elif variant == 3:
+        price_min = rng.randrange(PRICE_RANGE_MAX)
+        query.update(price_min=price_min, price_max=price_min + PRICE_RANGE_WIDTH)
+    return query
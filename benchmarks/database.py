@@ -0,0 +1,83 @@
+"""Модуль содержит подготовку бд для бенчмарков.
+
+Бенчмарк на postgres использует параметры из конфигурации сервиса
+(например, `EMP_POSTGRES='{"db_name": "marketplace_bench"}'`) и схему,
+созданную миграциями. Вместо postgres можно использовать sqlite файл:
+схема создается по orm моделям, полнотекстовый поиск заменяется поиском подстроки.
+"""
+
+from sqlalchemy import BigInteger, func, select, text
+from sqlalchemy.ext import asyncio as sa_asyncio
+from sqlalchemy.ext.compiler import compiles
+
+from src.app.data_sources import adaptor
+from src.app.data_sources.database import Database
+from src.app.data_sources.models import Base, UserAlchemyModel
+from src.app.data_sources.pool_metrics import InstrumentedAsyncQueuePool
+from src.app.data_sources.query_metrics import instrument_engine
+
+BACKENDS = ('postgres', 'sqlite')
+
+
+@compiles(BigInteger, 'sqlite')
+def _compile_big_integer_sqlite(type_, compiler, **kw) -> str:
+    # sqlite назначает id автоматически только для колонок INTEGER PRIMARY KEY.
+    return 'INTEGER'
+
+
+def use_sqlite(path: str):
+    """Подменить движок сервиса на sqlite файл.
+
+    Должна вызываться до первого обращения к бд.
+
+    Args:
+        path (str): путь к файлу бд
+    """
+    engine = sa_asyncio.create_async_engine(
+        'sqlite+aiosqlite:///{0}'.format(path),
+        poolclass=InstrumentedAsyncQueuePool,
+    )
+    instrument_engine(engine)
+    adaptor.set_database(Database(engine))
+
+
+def use_postgres():
+    """Создать движки сервиса по конфигурации postgres."""
+    adaptor.init_database()
+
+
+async def prepare_schema(backend: str, reset: bool):
+    """Подготовить пустую схему бд.
+
+    Args:
+        backend (str): postgres или sqlite
+        reset (bool): очистить таблицы postgres перед запуском
+
+    Raises:
+        RuntimeError: таблицы postgres не пусты, а очистка не разрешена
+    """
+    if backend == 'sqlite':
+        async with adaptor.get_database().engine.begin() as sqlite_connection:
+            await sqlite_connection.run_sync(Base.metadata.drop_all)
+            await sqlite_connection.run_sync(Base.metadata.create_all)
+        return
+    async with adaptor.get_database().engine.begin() as connection:
+        if reset:
+            await connection.execute(text(
+                'TRUNCATE {0} RESTART IDENTITY CASCADE'.format(
+                    ', '.join(table.name for table in Base.metadata.sorted_tables),
+                ),
+            ))
+            return
+        users_count = (await connection.execute(
+            select(func.count()).select_from(UserAlchemyModel),
+        )).scalar_one()
+    if users_count:
+        raise RuntimeError(
+            'Бд содержит данные, для очистки таблиц перед запуском укажите --reset',
+        )
+
+
+async def dispose():
+    """Закрыть соединения движка."""
+    await adaptor.close_engine()
@@ -0,0 +1,148 @@
+"""Модуль содержит генерацию воспроизводимого набора данных для бенчмарков."""
+
+from dataclasses import dataclass
+from itertools import zip_longest
+from random import Random
+
+from sqlalchemy import insert
+
+from src.app.data_sources import adaptor
+from src.app.data_sources.models import UserAlchemyModel
+from src.app.data_sources.storages.advertisement_write_storage import AdvertisementWriteStorage
+from src.app.users.password import password_hasher_component
+
+PASSWORD = 'bench-password'  # noqa: S105
+CATEGORIES = ('Sell', 'Buy', 'Service')
+WORDS = (
+    'велосипед',
+    'диван',
+    'ноутбук',
+    'квартира',
+    'ремонт',
+    'доставка',
+    'телефон',
+    'стол',
+    'книга',
+    'куртка',
+    'уборка',
+    'перевозка',
+    'камера',
+    'гитара',
+    'шкаф',
+)
+TITLE_WORDS = 3
+DESCRIPTION_WORDS = 20
+MAX_PRICE = 100000
+SEED_CHUNK_SIZE = 1000
+
+ad_storage = AdvertisementWriteStorage()
+
+
+@dataclass
+class Dataset(object):
+    """Созданный набор данных."""
+
+    user_ids: list[int]
+    usernames: list[str]
+    advertisement_ids: list[int]
+
+
+def username(index: int) -> str:
+    """Получить имя пользователя набора данных.
+
+    Args:
+        index (int): номер пользователя
+
+    Returns:
+        str: имя пользователя
+    """
+    return 'bench-user-{0}'.format(index)
+
+
+def random_advertisement(rng: Random) -> dict:
+    """Сгенерировать поля объявления.
+
+    Args:
+        rng (Random): генератор случайных чисел
+
+    Returns:
+        dict: поля category, title, price, description
+    """
+    return {
+        'category': rng.choice(CATEGORIES),
+        'title': ' '.join(rng.sample(WORDS, TITLE_WORDS)),
+        'price': rng.randrange(MAX_PRICE),
+        'description': ' '.join(rng.choices(WORDS, k=DESCRIPTION_WORDS)),
+    }
+
+
+async def seed(users: int, advertisements: int, rng: Random) -> Dataset:
+    """Заполнить бд пользователями и объявлениями.
+
+    Все пользователи получают один пароль, его хеш вычисляется один раз.
+    Объявления распределяются между пользователями по кругу.
+
+    Args:
+        users (int): количество пользователей
+        advertisements (int): количество объявлений
+        rng (Random): генератор случайных чисел
+
+    Returns:
+        Dataset: созданный набор данных
+    """
+    usernames = [username(index) for index in range(users)]
+    password_hash = await password_hasher_component.get().hash(PASSWORD)
+    async with adaptor.create_session() as session:
+        inserted = await session.execute(
+            insert(UserAlchemyModel).returning(
+                UserAlchemyModel.id,
+                sort_by_parameter_order=True,
+            ),
+            [
+                {'username': name, 'password_hash': password_hash, 'is_admin': False}
+                for name in usernames
+            ],
+        )
+        user_ids = list(inserted.scalars().all())
+        await session.commit()
+    return Dataset(
+        user_ids=user_ids,
+        usernames=usernames,
+        advertisement_ids=await seed_advertisements(user_ids, advertisements, rng),
+    )
+
+
+async def seed_advertisements(owner_ids: list[int], count: int, rng: Random) -> list[int]:
+    """Создать объявления, распределенные между владельцами по кругу.
+
+    Args:
+        owner_ids (list[int]): id владельцев
+        count (int): количество объявлений
+        rng (Random): генератор случайных чисел
+
+    Returns:
+        list[int]: id созданных объявлений,
+        i-е объявление принадлежит owner_ids[i % len(owner_ids)]
+    """
+    base_count, remainder = divmod(count, len(owner_ids))
+    async with adaptor.create_session() as session:
+        return _round_robin([
+            await _seed_owner(session, owner_id, base_count + int(index < remainder), rng)
+            for index, owner_id in enumerate(owner_ids)
+        ])
+
+
+async def _seed_owner(session, owner_id: int, count: int, rng: Random) -> list[int]:
+    ad_ids = []
+    for offset in range(0, count, SEED_CHUNK_SIZE):
+        chunk_size = min(SEED_CHUNK_SIZE, count - offset)
+        ad_ids.extend(await ad_storage.add_many(
+            session=session,
+            owner_id=owner_id,
+            advertisements=[random_advertisement(rng) for _ in range(chunk_size)],
+        ))
+    return ad_ids
+
+
+def _round_robin(by_owner: list[list[int]]) -> list[int]:
+    return [ad_id for row in zip_longest(*by_owner) for ad_id in row if ad_id is not None]
@@ -0,0 +1,182 @@
+"""Точка входа бенчмарков API и хранилищ.
+
+Пример запуска из корня проекта:
+
+    poetry install --with bench
+    poetry run python -m benchmarks.run --backend sqlite --output bench.json
+
+Результаты выводятся в формате json, чтобы запуски можно было сравнивать между собой.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess  # noqa: S404
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from random import Random
+
+from benchmarks import database
+
+DEFAULT_USERS = 100
+DEFAULT_ADVERTISEMENTS = 10000
+DEFAULT_CONCURRENCY = 16
+DEFAULT_REQUESTS = 1000
+DEFAULT_AUTH_REQUESTS = 100
+DEFAULT_STORAGE_OPERATIONS = 500
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки.
+
+    Args:
+        argv (list[str] | None): аргументы, по умолчанию sys.argv
+
+    Returns:
+        argparse.Namespace: параметры запуска
+    """
+    parser = argparse.ArgumentParser(description='Бенчмарки API и хранилищ marketplace')
+    parser.add_argument('--backend', choices=database.BACKENDS, default='sqlite')
+    parser.add_argument('--sqlite-path', default='benchmark.sqlite3')
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help='очистить таблицы postgres перед запуском',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='файл для результатов, по умолчанию stdout')
+    _add_load_arguments(parser)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Подготовить бд, заполнить ее данными и выполнить бенчмарки.
+
+    Args:
+        args (argparse.Namespace): параметры запуска
+
+    Returns:
+        dict: результаты запуска
+    """
+    if args.backend == 'sqlite':
+        database.use_sqlite(args.sqlite_path)
+    else:
+        database.use_postgres()
+    # Модули сервиса импортируются после подмены движка.
+    from src.config.config import settings  # noqa: WPS433
+
+    # Клиенты бенчмарка обращаются с одного адреса, лимиты искажали бы результаты.
+    settings.rate_limit.enabled = False
+    # Фоновая архивация конкурировала бы с измеряемыми запросами.
+    settings.advertisement_lifecycle.archiver_enabled = False
+    rng = Random(args.seed)  # noqa: S311
+    report: dict = {'meta': _meta(args)}
+    try:  # noqa: WPS501
+        report.update(await _run_benchmarks(args, rng))
+    finally:
+        await database.dispose()
+    return report
+
+
+def main(argv: list[str] | None = None):
+    """Запустить бенчмарки и вывести результаты.
+
+    Args:
+        argv (list[str] | None): аргументы, по умолчанию sys.argv
+    """
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(report_json)
+    else:
+        sys.stdout.write('{0}\n'.format(report_json))
+
+
+def _add_load_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS)
+    parser.add_argument('--advertisements', type=int, default=DEFAULT_ADVERTISEMENTS)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=DEFAULT_REQUESTS,
+        help='запросов в сценариях create, list, detail и delete',
+    )
+    parser.add_argument(
+        '--auth-requests',
+        type=int,
+        default=DEFAULT_AUTH_REQUESTS,
+        help='запросов в сценариях register и auth',
+    )
+    parser.add_argument('--storage-operations', type=int, default=DEFAULT_STORAGE_OPERATIONS)
+    parser.add_argument('--skip-api', action='store_true')
+    parser.add_argument('--skip-storage', action='store_true')
+
+
+async def _run_benchmarks(args: argparse.Namespace, rng: Random) -> dict:
+    from benchmarks.api import run_api_benchmarks  # noqa: WPS433
+    from benchmarks.dataset import seed  # noqa: WPS433
+    from benchmarks.storage import run_storage_benchmarks  # noqa: WPS433
+    from src.app.service import create_app  # noqa: WPS433
+
+    report = {}
+    # Фабрика приложения создает пул bcrypt и кеши, которые нужны и для заполнения бд.
+    app = create_app()
+    await database.prepare_schema(args.backend, reset=args.reset)
+    _log('seeding {0} users and {1} advertisements'.format(args.users, args.advertisements))
+    dataset = await seed(args.users, args.advertisements, rng)
+    if not args.skip_storage:
+        _log('running storage benchmarks')
+        storage_latencies = await run_storage_benchmarks(dataset, rng, args.storage_operations)
+        report['storage'] = _as_dicts(storage_latencies)
+    if not args.skip_api:
+        _log('running api benchmarks')
+        api_latencies = await run_api_benchmarks(
+            app,
+            dataset,
+            rng,
+            requests=args.requests,
+            auth_requests=args.auth_requests,
+            concurrency=args.concurrency,
+        )
+        report['api'] = _as_dicts(api_latencies)
+    return report
+
+
+def _meta(args: argparse.Namespace) -> dict:
+    return {
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': vars(args),  # noqa: WPS421
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(  # noqa: S603, S607
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _as_dicts(latencies: dict) -> dict:
+    return {name: asdict(stats) for name, stats in latencies.items()}
+
+
+def _log(message: str):
+    sys.stderr.write('{0}\n'.format(message))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Модуль содержит подсчет статистики задержек и пропускной способности."""
+
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Awaitable, Callable, Iterator
+
+MEDIAN = 50
+P95 = 95
+P99 = 99
+
+
+@dataclass
+class LatencyStats(object):
+    """Статистика серии операций."""
+
+    operations: int
+    errors: int
+    concurrency: int
+    duration_seconds: float
+    throughput_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def percentile(sorted_samples: list[float], rank: float) -> float:
+    """Получить перцентиль методом ближайшего ранга.
+
+    Args:
+        sorted_samples (list[float]): отсортированные значения
+        rank (float): перцентиль от 0 до 100
+
+    Returns:
+        float: значение перцентиля или 0 для пустой выборки
+    """
+    if not sorted_samples:
+        return 0
+    nearest_rank = int(round(rank / 100 * len(sorted_samples)))
+    index = max(nearest_rank - 1, 0)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
+def summarize(
+    latencies: list[float],
+    errors: int,
+    concurrency: int,
+    duration: float,
+) -> LatencyStats:
+    """Посчитать статистику серии операций.
+
+    Args:
+        latencies (list[float]): время успешных операций в секундах
+        errors (int): количество неуспешных операций
+        concurrency (int): количество параллельных клиентов
+        duration (float): общее время серии в секундах
+
+    Returns:
+        LatencyStats: статистика серии
+    """
+    samples = sorted(latency * 1000 for latency in latencies)
+    return LatencyStats(
+        operations=len(samples),
+        errors=errors,
+        concurrency=concurrency,
+        duration_seconds=round(duration, 4),
+        throughput_per_second=round(len(samples) / duration, 2) if duration else 0,
+        mean_ms=round(sum(samples) / len(samples), 3) if samples else 0,
+        p50_ms=round(percentile(samples, MEDIAN), 3),
+        p95_ms=round(percentile(samples, P95), 3),
+        p99_ms=round(percentile(samples, P99), 3),
+        max_ms=round(samples[-1], 3) if samples else 0,
+    )
+
+
+async def measure(
+    operation: Callable[[int], Awaitable[bool]],
+    total: int,
+    concurrency: int,
+) -> LatencyStats:
+    """Выполнить серию операций параллельными клиентами и измерить задержки.
+
+    Каждый клиент последовательно берет следующий номер операции,
+    пока не будет выполнено total операций.
+
+    Args:
+        operation (Callable[[int], Awaitable[bool]]): операция по номеру, возвращает успешность
+        total (int): количество операций
+        concurrency (int): количество параллельных клиентов
+
+    Returns:
+        LatencyStats: статистика серии
+    """
+    indexes = iter(range(total))
+    latencies: list[float] = []
+    started_at = perf_counter()
+    errors = await asyncio.gather(*(
+        _client(operation, indexes, latencies) for _ in range(concurrency)
+    ))
+    return summarize(latencies, sum(errors), concurrency, perf_counter() - started_at)
+
+
+async def _client(
+    operation: Callable[[int], Awaitable[bool]],
+    indexes: Iterator[int],
+    latencies: list[float],
+) -> int:
+    errors = 0
+    for index in indexes:
+        started_at = perf_counter()
+        succeeded = await operation(index)
+        if succeeded:
+            latencies.append(perf_counter() - started_at)
+        else:
+            errors += 1
+    return errors
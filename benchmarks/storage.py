@@ -0,0 +1,90 @@
+"""Модуль содержит микробенчмарки хранилищ.
+
+Методы вызываются напрямую, каждая операция выполняется в отдельной сессии,
+как при обработке запроса.
+"""
+
+from random import Random
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.dataset import CATEGORIES, WORDS, Dataset, random_advertisement
+from benchmarks.stats import LatencyStats, measure
+from src.app.data_sources import adaptor
+from src.app.data_sources.dtos.advertisement_filter import AdvertisementFilter
+from src.app.data_sources.storages.advertisement_search_storage import AdvertisementSearchStorage
+from src.app.data_sources.storages.advertisement_storage import AdvertisementStorage
+from src.app.data_sources.storages.advertisement_write_storage import AdvertisementWriteStorage
+from src.app.data_sources.storages.user_storage import UserStorage
+
+PAGE_LIMIT = 20
+
+StorageCall = Callable[[AsyncSession], Awaitable]
+
+
+async def run_storage_benchmarks(  # noqa: WPS210
+    dataset: Dataset,
+    rng: Random,
+    operations: int,
+) -> dict[str, LatencyStats]:
+    """Выполнить микробенчмарки методов хранилищ объявлений и UserStorage.
+
+    Args:
+        dataset (Dataset): набор данных в бд
+        rng (Random): генератор случайных чисел
+        operations (int): количество вызовов каждого метода
+
+    Returns:
+        dict[str, LatencyStats]: статистика по методам
+    """
+    ad_storage = AdvertisementStorage()
+    search_storage = AdvertisementSearchStorage()
+    write_storage = AdvertisementWriteStorage()
+    user_storage = UserStorage()
+    benchmarks: dict[str, StorageCall] = {
+        'AdvertisementStorage.get_by_id': lambda session: ad_storage.get_by_id(
+            session=session, ad_id=rng.choice(dataset.advertisement_ids),
+        ),
+        'AdvertisementStorage.get_cached_by_id': lambda session: ad_storage.get_cached_by_id(
+            ad_id=rng.choice(dataset.advertisement_ids),
+        ),
+        'AdvertisementStorage.get_all': lambda session: ad_storage.get_all(
+            session=session, limit=PAGE_LIMIT,
+        ),
+        'AdvertisementStorage.get_all[category]': lambda session: ad_storage.get_all(
+            session=session,
+            limit=PAGE_LIMIT,
+            ad_filter=AdvertisementFilter(category=rng.choice(CATEGORIES)),
+        ),
+        'AdvertisementStorage.get_all[after_id]': lambda session: ad_storage.get_all(
+            session=session,
+            limit=PAGE_LIMIT,
+            after_id=rng.choice(dataset.advertisement_ids),
+        ),
+        'AdvertisementSearchStorage.search': lambda session: search_storage.search(
+            session=session, text=rng.choice(WORDS), limit=PAGE_LIMIT, offset=0,
+        ),
+        'AdvertisementWriteStorage.add': lambda session: write_storage.add(
+            session=session, owner_id=rng.choice(dataset.user_ids), **random_advertisement(rng),
+        ),
+        'UserStorage.get_user_by_id': lambda session: user_storage.get_user_by_id(
+            session=session, user_id=rng.choice(dataset.user_ids),
+        ),
+        'UserStorage.get_user_by_username': lambda session: user_storage.get_user_by_username(
+            session=session,
+            username=rng.choice(dataset.usernames),
+        ),
+    }
+    return {
+        name: await measure(_in_session(call), operations, concurrency=1)
+        for name, call in benchmarks.items()
+    }
+
+
+def _in_session(call: StorageCall) -> Callable[[int], Awaitable[bool]]:
+    async def operation(index: int) -> bool:  # noqa: WPS430
+        async with adaptor.create_session() as session:
+            await call(session)
+        return True
+    return operation
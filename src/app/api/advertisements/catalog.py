@@ -0,0 +1,155 @@
+"""Модуль содержащий эндпоинты поиска, фасетов, выгрузки и журнала изменений объявлений.
+
+Роутер подключается раньше роутера объявлений, чтобы пути /api/advertisements/search
+и другие не совпадали с шаблоном /api/advertisements/{ad_id}.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Annotated
+
+from src.app.api.advertisements.export import EXPORT_FORMATS, export_chunks
+from src.app.api.advertisements.models import (
+    AdvertisementChangePage,
+    AdvertisementSearchPage,
+    Category,
+)
+from src.app.api.users.controller import get_current_user
+from src.app.data_sources.adaptor import get_read_session
+from src.app.data_sources.dtos.advertisement_facets import AdvertisementFacets
+from src.app.data_sources.dtos.user import User
+from src.app.data_sources.storages.advertisement_change_storage import (
+    AdvertisementChangeStorage,
+    ChangesPurgedError,
+)
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+from src.app.data_sources.storages.advertisement_search_storage import AdvertisementSearchStorage
+from src.app.data_sources.storages.advertisement_storage import AdvertisementStorage
+
+router = APIRouter()
+ad_storage = AdvertisementStorage()
+search_storage = AdvertisementSearchStorage()
+facet_storage = AdvertisementFacetStorage()
+change_storage = AdvertisementChangeStorage()
+
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+MAX_QUERY_LENGTH = 200
+MAX_SEARCH_OFFSET = 1000
+DEFAULT_CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+SEARCH_QUERY = Query(min_length=1, max_length=MAX_QUERY_LENGTH, pattern=r'\S')
+
+
+@router.get('/api/advertisements/export')
+async def export_advertisements(
+    current_user: Annotated[User, Depends(get_current_user)],
+    export_format: Annotated[Literal['ndjson', 'csv'], Query(alias='format')] = 'ndjson',
+) -> StreamingResponse:
+    """Потоковая выгрузка всех объявлений в формате NDJSON или CSV.
+
+    Args:
+        current_user (Annotated[User, Depends]): текущий пользователь
+        export_format (Literal['ndjson', 'csv']): формат выгрузки
+
+    Raises:
+        HTTPException: текущий пользователь не является администратором
+
+    Returns:
+        StreamingResponse: поток объявлений
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    media_type, encoder = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        export_chunks(storage=ad_storage, encoder=encoder),
+        media_type=media_type,
+    )
+
+
+@router.get('/api/advertisements/search', response_model=AdvertisementSearchPage)
+async def search_advertisements(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    q: Annotated[str, SEARCH_QUERY],  # noqa: WPS111
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    offset: Annotated[int, Query(ge=0, le=MAX_SEARCH_OFFSET)] = 0,
+) -> Response:
+    """Полнотекстовый поиск объявлений по заголовку и описанию.
+
+    Args:
+        session(AsyncSession): сессия подключения к бд
+        q (str): поисковый запрос
+        limit (int): количество объявлений на странице
+        offset (int): количество пропускаемых объявлений
+
+    Returns:
+        Response: AdvertisementSearchPage с объявлениями в порядке релевантности
+        и смещением следующей страницы
+    """
+    advertisements = await search_storage.search(
+        session=session,
+        text=q,
+        limit=limit,
+        offset=offset,
+    )
+    next_offset = offset + limit if len(advertisements) == limit else None
+    return ORJSONResponse({'items': advertisements, 'next_offset': next_offset})
+
+
+@router.get('/api/advertisements/facets', response_model=AdvertisementFacets)
+async def get_advertisement_facets(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    category: Category | None = None,
+) -> Response:
+    """Получить количества объявлений по категориям и ценовым диапазонам.
+
+    Args:
+        session(AsyncSession): сессия подключения к бд
+        category (Category | None): категория для гистограммы цен
+
+    Returns:
+        Response: AdvertisementFacets с количествами по категориям
+        и гистограммой цен
+    """
+    facets = await facet_storage.get_facets(session=session, category=category)
+    return ORJSONResponse(facets)
+
+
+@router.get('/api/advertisements/changes', response_model=AdvertisementChangePage)
+async def get_advertisement_changes(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    since: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=MAX_CHANGES_LIMIT)] = DEFAULT_CHANGES_LIMIT,
+) -> Response:
+    """Получить изменения объявлений после номера since.
+
+    Каждое измененное объявление возвращается один раз с последним состоянием,
+    удаленное - отметкой deleted. Синхронизация начинается с since=0 и продолжается
+    со значения next_since, пока has_more истинно.
+
+    Args:
+        session(AsyncSession): сессия подключения к бд
+        since (int): номер последнего полученного изменения
+        limit (int): количество изменений на странице
+
+    Raises:
+        HTTPException: отметки об удалении после since удалены, нужна полная синхронизация
+
+    Returns:
+        Response: AdvertisementChangePage с изменениями в порядке номеров
+    """
+    try:
+        changes = await change_storage.get_changes(session=session, since=since, limit=limit)
+    except ChangesPurgedError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(exception),
+        )
+    return ORJSONResponse({
+        'items': changes,
+        'next_since': changes[-1].seq if changes else since,
+        'has_more': len(changes) == limit,
+    })
@@ -1,118 +1,156 @@
-"""Модуль содержащий эндпоинты связанные с объявлениями."""
+"""Модуль содержащий эндпоинты чтения объявлений."""
 
-from annotated_types import Ge
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Annotated
 
-from src.app.api.advertisements.models import CreateAdvertisement
+from src.app.api.advertisements.models import AdvertisementPage, Category, OwnerAdvertisementPage
+from src.app.api.http_cache import (
+    advertisements_etag,
+    cache_headers,
+    is_not_modified,
+    last_modified,
+)
 from src.app.api.users.controller import get_current_user
-from src.app.data_sources.adaptor import get_session
+from src.app.data_sources.adaptor import get_read_session, get_session
 from src.app.data_sources.dtos.advertisement import Advertisement
+from src.app.data_sources.dtos.advertisement_filter import AdvertisementFilter
 from src.app.data_sources.dtos.user import User
 from src.app.data_sources.storages.advertisement_storage import AdvertisementStorage
 
 router = APIRouter()
 ad_storage = AdvertisementStorage()
 
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
 
-@router.post('/api/advertisements/create')
-async def create_advertisement(
-    advertisement: CreateAdvertisement,
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> Response:
-    """Создать новое объявление.
+
+def advertisement_filter(
+    category: Category | None = None,
+    price_min: Annotated[int | None, Query(ge=0)] = None,
+    price_max: Annotated[int | None, Query(ge=0)] = None,
+    owner_id: Annotated[int | None, Query(ge=0)] = None,
+) -> AdvertisementFilter:
+    """Получить фильтр объявлений из параметров запроса.
 
     Args:
-        advertisement (CreateAdvertisement): объявление
-        current_user (Annotated[User, Depends): текущий пользователь
-        session(AsyncSession): сессия подключения к бд
+        category (Category | None): категория объявления
+        price_min (int | None): минимальная стоимость
+        price_max (int | None): максимальная стоимость
+        owner_id (int | None): id владельца
 
     Returns:
-        Response: статус код 200, объявление создано
+        AdvertisementFilter: фильтр объявлений
     """
-    await ad_storage.add(
-        session=session,
-        category=advertisement.category,
-        owner_id=current_user.user_id,
-        title=advertisement.title,
-        price=advertisement.price,
-        description=advertisement.description,
+    return AdvertisementFilter(
+        category=category,
+        price_min=price_min,
+        price_max=price_max,
+        owner_id=owner_id,
     )
-    return Response(status_code=status.HTTP_200_OK)
 
 
-@router.get('/api/advertisements')
-async def get_advertisements(session: Annotated[AsyncSession, Depends(get_session)]) -> list:
-    """Получить список всех объявлений.
+@router.get('/api/advertisements', response_model=AdvertisementPage)
+async def get_advertisements(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    ad_filter: Annotated[AdvertisementFilter, Depends(advertisement_filter)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    after_id: Annotated[int | None, Query(ge=0)] = None,
+) -> Response:
+    """Получить страницу объявлений.
+
+    Поддерживает условные запросы по ETag и Last-Modified.
 
     Args:
+        request (Request): запрос
         session(AsyncSession): сессия подключения к бд
+        ad_filter (AdvertisementFilter): фильтр по категории, стоимости и владельцу
+        limit (int): количество объявлений на странице
+        after_id (int | None): курсор, id последнего объявления предыдущей страницы
 
     Returns:
-        list: объявления
+        Response: AdvertisementPage с объявлениями и курсором следующей страницы
+        или 304 если не изменились
     """
-    return await ad_storage.get_all(session=session)
+    advertisements = await ad_storage.get_all(
+        session=session,
+        limit=limit,
+        after_id=after_id,
+        ad_filter=ad_filter,
+    )
+    next_cursor = advertisements[-1].id if len(advertisements) == limit else None
+    etag = advertisements_etag(advertisements, next_cursor)
+    modified_at = last_modified(advertisements)
+    headers = cache_headers(etag, modified_at)
+    if is_not_modified(request, etag, modified_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(
+        {'items': advertisements, 'next_cursor': next_cursor},
+        headers=headers,
+    )
 
 
-@router.get('/api/advertisements/{ad_id}')
-async def get_advertisement(
-    ad_id: Annotated[int, Ge(0)],
+@router.get('/api/users/me/advertisements', response_model=OwnerAdvertisementPage)
+async def get_my_advertisements(
+    current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> Advertisement:
-    """Получить объявление по id.
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    before_id: Annotated[int | None, Query(ge=0)] = None,
+) -> Response:
+    """Получить страницу объявлений текущего пользователя, начиная с новых.
+
+    Читается основная бд, чтобы только что созданные объявления
+    были видны владельцу без задержки репликации.
 
     Args:
-        ad_id (int): id объявления
+        current_user (Annotated[User, Depends]): текущий пользователь
         session(AsyncSession): сессия подключения к бд
-
-    Raises:
-        HTTPException: объявление с указанным id не найдено
+        limit (int): количество объявлений на странице
+        before_id (int | None): курсор, id последнего объявления предыдущей страницы
 
     Returns:
-        Advertisement: объявление
+        Response: OwnerAdvertisementPage с объявлениями и курсором следующей страницы
     """
-    advertisement = await ad_storage.get_by_id(session=session, ad_id=ad_id)
-    if not advertisement:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Объявление с указанным id не найдено',
-        )
-    return advertisement
+    advertisements = await ad_storage.get_by_owner(
+        session=session,
+        owner_id=current_user.user_id,
+        limit=limit,
+        before_id=before_id,
+    )
+    next_cursor = advertisements[-1].id if len(advertisements) == limit else None
+    return ORJSONResponse({'items': advertisements, 'next_cursor': next_cursor})
 
 
-@router.delete('/api/advertisements/{ad_id}')
-async def remove_advertisement(
-    ad_id: Annotated[int, Ge(0)],
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(get_session)],
+@router.get('/api/advertisements/{ad_id}', response_model=Advertisement)
+async def get_advertisement(
+    ad_id: Annotated[int, Path(ge=0)],
+    request: Request,
 ) -> Response:
-    """Удаление объявления.
+    """Получить объявление по id.
+
+    Поддерживает условные запросы по ETag и Last-Modified.
+    Объявление читается через кеш, промах кеша читается с основной бд.
 
     Args:
-        ad_id (Annotated[int, Ge): id объявления
-        current_user (Annotated[User, Depends): текущий пользователь
-        session(AsyncSession): сессия подключения к бд
+        ad_id (int): id объявления
+        request (Request): запрос
 
     Raises:
         HTTPException: объявление с указанным id не найдено
-        HTTPException: текущий пользователь не является владельцем объявления
 
     Returns:
-        Response: _description_
+        Response: Advertisement или 304 если объявление не изменилось
     """
-    advertisement = await ad_storage.get_by_id(session=session, ad_id=ad_id)
+    advertisement = await ad_storage.get_cached_by_id(ad_id=ad_id)
     if not advertisement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Объявление с указанным id не найдено',
         )
-    if advertisement.owner.user_id != current_user.user_id and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail='Текущий пользователь не является владельцем объявления',
-        )
-    await ad_storage.remove(session=session, ad_id=ad_id)
-    return Response(status_code=status.HTTP_200_OK)
+    etag = advertisements_etag([advertisement])
+    headers = cache_headers(etag, advertisement.updated_at)
+    if is_not_modified(request, etag, advertisement.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(advertisement, headers=headers)
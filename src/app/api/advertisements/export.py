@@ -0,0 +1,79 @@
+"""Модуль содержит сериализацию объявлений для потоковой выгрузки."""
+
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable
+
+from src.app.data_sources.adaptor import create_session, read_only
+from src.app.data_sources.storages.advertisement_queries import EXPORT_COLUMNS
+from src.app.data_sources.storages.advertisement_storage import AdvertisementStorage
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def encode_ndjson(rows: list, with_header: bool) -> str:
+    """Сериализовать порцию строк в NDJSON.
+
+    Args:
+        rows (list): порция строк
+        with_header (bool): не используется, в NDJSON нет заголовка
+
+    Returns:
+        str: по одному json объекту на строку
+    """
+    return ''.join(
+        '{0}\n'.format(json.dumps(dict(row), ensure_ascii=False))
+        for row in rows
+    )
+
+
+def encode_csv(rows: list, with_header: bool) -> str:
+    """Сериализовать порцию строк в CSV.
+
+    Args:
+        rows (list): порция строк
+        with_header (bool): добавить строку заголовка перед данными
+
+    Returns:
+        str: строки csv
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if with_header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+EXPORT_FORMATS = {  # noqa: WPS407
+    'ndjson': ('application/x-ndjson', encode_ndjson),
+    'csv': ('text/csv', encode_csv),
+}
+
+
+async def export_chunks(
+    storage: AdvertisementStorage,
+    encoder: Callable[[list, bool], str],
+) -> AsyncIterator[str]:
+    """Потоково выгрузить все объявления.
+
+    Сессия открывается внутри генератора, так как ответ отправляется
+    уже после завершения обработчика эндпоинта, и читает с реплики, если они настроены.
+
+    Args:
+        storage (AdvertisementStorage): хранилище объявлений
+        encoder (Callable[[list, bool], str]): функция сериализации порции строк
+
+    Yields:
+        str: сериализованная порция объявлений
+    """
+    with_header = True
+    async with create_session() as session:
+        read_only(session)
+        async for rows in storage.stream_all(session=session, chunk_size=EXPORT_CHUNK_SIZE):
+            yield encoder(rows, with_header)
+            with_header = False
+    if with_header:
+        yield encoder([], with_header)
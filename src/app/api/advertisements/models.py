@@ -1,15 +1,83 @@
 """Модуль содержит pydantic модели для валидации параметров запросов и возвращаемых ответов."""
 
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
 from annotated_types import Ge
 from pydantic import BaseModel, Field
 
+from src.app.data_sources.dtos.advertisement import Advertisement
+from src.app.data_sources.dtos.advertisement_change import AdvertisementChange
+
+Category = Literal['Sell', 'Buy', 'Service']
+
 
 class CreateAdvertisement(BaseModel):
     """Модель для создания объявления."""
 
-    category: Literal['Sell', 'Buy', 'Service']
+    category: Category
     title: str = Field(max_length=200)  # noqa: WPS432
     price: Annotated[int, Ge(0)]
     description: str = Field(max_length=1000)
+
+
+class AdvertisementPage(BaseModel):
+    """Модель страницы объявлений."""
+
+    items: list[Advertisement]  # noqa: WPS110
+    next_cursor: int | None = Field(
+        description='Значение after_id для запроса следующей страницы',
+    )
+
+
+class OwnerAdvertisementPage(BaseModel):
+    """Модель страницы объявлений текущего пользователя."""
+
+    items: list[Advertisement]  # noqa: WPS110
+    next_cursor: int | None = Field(
+        description='Значение before_id для запроса следующей страницы',
+    )
+
+
+class AdvertisementSearchPage(BaseModel):
+    """Модель страницы результатов поиска объявлений."""
+
+    items: list[Advertisement]  # noqa: WPS110
+    next_offset: int | None = Field(
+        description='Значение offset для запроса следующей страницы',
+    )
+
+
+class AdvertisementChangePage(BaseModel):
+    """Модель страницы журнала изменений объявлений."""
+
+    items: list[AdvertisementChange]  # noqa: WPS110
+    next_since: int = Field(
+        description='Значение since для запроса следующей страницы',
+    )
+    has_more: bool = Field(
+        description='Признак того, что в журнале могут быть следующие изменения',
+    )
+
+
+class BulkCreateAdvertisements(BaseModel):
+    """Модель для пакетного создания объявлений.
+
+    Элементы проверяются по модели CreateAdvertisement по отдельности,
+    чтобы ошибка в одном элементе не отклоняла весь запрос.
+    """
+
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=1000)  # noqa: WPS110, WPS432
+
+
+class BulkItemError(BaseModel):
+    """Модель ошибки валидации элемента пакета."""
+
+    index: int
+    detail: list[dict[str, Any]]
+
+
+class BulkCreateResult(BaseModel):
+    """Модель результата пакетного создания объявлений."""
+
+    created_ids: list[int]
+    errors: list[BulkItemError]
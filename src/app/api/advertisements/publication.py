@@ -0,0 +1,145 @@
+"""Модуль содержащий эндпоинты создания и удаления объявлений."""
+
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi.responses import Response
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Annotated
+
+from src.app.api.advertisements.models import (
+    BulkCreateAdvertisements,
+    BulkCreateResult,
+    BulkItemError,
+    CreateAdvertisement,
+)
+from src.app.api.users.controller import get_current_user
+from src.app.data_sources.adaptor import get_session
+from src.app.data_sources.dtos.user import User
+from src.app.data_sources.storages.advertisement_batcher import batcher_component
+from src.app.data_sources.storages.advertisement_write_storage import (
+    AdvertisementOwnershipError,
+    AdvertisementWriteStorage,
+)
+from src.config.config import settings
+
+router = APIRouter()
+write_storage = AdvertisementWriteStorage()
+
+
+@router.post('/api/advertisements/create')
+async def create_advertisement(
+    advertisement: CreateAdvertisement,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> Response:
+    """Создать новое объявление.
+
+    При включенной групповой записи объявление записывается вместе
+    с объявлениями параллельных запросов воркера одним коммитом.
+
+    Args:
+        advertisement (CreateAdvertisement): объявление
+        current_user (Annotated[User, Depends): текущий пользователь
+        session(AsyncSession): сессия подключения к бд
+
+    Returns:
+        Response: статус код 200, объявление создано
+    """
+    if settings.advertisement_batching.enabled:
+        # Пачка пишется своей сессией, соединение запроса не должно удерживаться на время ожидания.
+        await session.close()
+        await batcher_component.get().add(
+            category=advertisement.category,
+            owner_id=current_user.user_id,
+            title=advertisement.title,
+            price=advertisement.price,
+            description=advertisement.description,
+        )
+        return Response(status_code=status.HTTP_200_OK)
+    await write_storage.add(
+        session=session,
+        category=advertisement.category,
+        owner_id=current_user.user_id,
+        title=advertisement.title,
+        price=advertisement.price,
+        description=advertisement.description,
+    )
+    return Response(status_code=status.HTTP_200_OK)
+
+
+@router.post('/api/advertisements/bulk')
+async def create_advertisements_bulk(
+    bulk: BulkCreateAdvertisements,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> BulkCreateResult:
+    """Создать несколько объявлений одним запросом.
+
+    Корректные элементы записываются в одной транзакции,
+    для некорректных возвращаются ошибки валидации с индексом элемента.
+
+    Args:
+        bulk (BulkCreateAdvertisements): объявления
+        current_user (Annotated[User, Depends]): текущий пользователь
+        session(AsyncSession): сессия подключения к бд
+
+    Returns:
+        BulkCreateResult: id созданных объявлений и ошибки по элементам
+    """
+    valid_items = []
+    errors = []
+    for index, raw_advertisement in enumerate(bulk.items):
+        try:
+            valid_items.append(
+                CreateAdvertisement.model_validate(raw_advertisement).model_dump(),
+            )
+        except ValidationError as exception:
+            errors.append(BulkItemError(
+                index=index,
+                detail=exception.errors(include_url=False, include_context=False),
+            ))
+    created_ids = await write_storage.add_many(
+        session=session,
+        owner_id=current_user.user_id,
+        advertisements=valid_items,
+    )
+    return BulkCreateResult(created_ids=created_ids, errors=errors)
+
+
+@router.delete('/api/advertisements/{ad_id}')
+async def remove_advertisement(
+    ad_id: Annotated[int, Path(ge=0)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> Response:
+    """Удаление объявления.
+
+    Args:
+        ad_id (Annotated[int, Path]): id объявления
+        current_user (Annotated[User, Depends): текущий пользователь
+        session(AsyncSession): сессия подключения к бд
+
+    Raises:
+        HTTPException: объявление с указанным id не найдено
+        HTTPException: текущий пользователь не является владельцем объявления
+
+    Returns:
+        Response: _description_
+    """
+    try:
+        await write_storage.remove(
+            session=session,
+            ad_id=ad_id,
+            owner_id=None if current_user.is_admin else current_user.user_id,
+        )
+    except ValueError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exception),
+        )
+    except AdvertisementOwnershipError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exception),
+        )
+    return Response(status_code=status.HTTP_200_OK)
@@ -0,0 +1,108 @@
+"""Модуль содержит функции для условных GET запросов и заголовков кеширования HTTP."""
+
+from dataclasses import astuple
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request
+
+from src.app.data_sources.dtos.advertisement import Advertisement
+from src.config.config import settings
+
+ETAG_DIGEST_SIZE = 16
+
+
+def advertisements_etag(advertisements: list[Advertisement], *extra) -> str:
+    """Вычислить сильный ETag для ответа с объявлениями без сериализации ответа.
+
+    Тело ответа однозначно определяется id и временем изменения объявлений,
+    данными владельцев и дополнительными полями ответа (например, курсором).
+
+    Args:
+        advertisements (list[Advertisement]): объявления ответа
+        extra: дополнительные значения, влияющие на тело ответа
+
+    Returns:
+        str: ETag в кавычках
+    """
+    digest = blake2b(digest_size=ETAG_DIGEST_SIZE)
+    for advertisement in advertisements:
+        fingerprint = (
+            advertisement.id,
+            advertisement.updated_at.isoformat(),
+            astuple(advertisement.owner),
+        )
+        digest.update(repr(fingerprint).encode())
+    digest.update(repr(extra).encode())
+    return '"{0}"'.format(digest.hexdigest())
+
+
+def last_modified(advertisements: list[Advertisement]) -> datetime | None:
+    """Получить время последнего изменения объявлений.
+
+    Args:
+        advertisements (list[Advertisement]): объявления ответа
+
+    Returns:
+        datetime | None: время последнего изменения в UTC или None для пустого списка
+    """
+    if not advertisements:
+        return None
+    return max(_as_utc(advertisement.updated_at) for advertisement in advertisements)
+
+
+def is_not_modified(request: Request, etag: str, modified_at: datetime | None) -> bool:
+    """Проверить условия If-None-Match и If-Modified-Since запроса.
+
+    If-Modified-Since учитывается только при отсутствии If-None-Match.
+
+    Args:
+        request (Request): запрос
+        etag (str): текущий ETag ресурса
+        modified_at (datetime | None): время последнего изменения ресурса
+
+    Returns:
+        bool: клиент располагает актуальной версией, можно ответить 304
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        candidates = {candidate.strip() for candidate in if_none_match.split(',')}
+        return '*' in candidates or etag in candidates or 'W/{0}'.format(etag) in candidates
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None or modified_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(modified_at).replace(microsecond=0) <= _as_utc(since)
+
+
+def cache_headers(etag: str, modified_at: datetime | None) -> dict[str, str]:
+    """Получить заголовки кеширования для публичного ответа.
+
+    Args:
+        etag (str): ETag ресурса
+        modified_at (datetime | None): время последнего изменения ресурса
+
+    Returns:
+        dict[str, str]: заголовки ETag, Last-Modified и Cache-Control
+    """
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'public, max-age={0}, s-maxage={1}, stale-while-revalidate={2}'.format(
+            settings.http_cache.max_age,
+            settings.http_cache.s_maxage,
+            settings.http_cache.stale_while_revalidate,
+        ),
+    }
+    if modified_at is not None:
+        headers['Last-Modified'] = format_datetime(_as_utc(modified_at), usegmt=True)
+    return headers
+
+
+def _as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
@@ -0,0 +1,63 @@
+"""Модуль содержит эндпоинт метрик prometheus."""
+
+import hmac
+from ipaddress import ip_address
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.app.api.metrics.multiprocess import create_registry
+from src.app.api.metrics.publisher import stats_publisher_component
+from src.config.config import settings
+
+router = APIRouter()
+
+
+def metrics_access(request: Request):
+    """Проверка доступа к метрикам.
+
+    Если в настройках задан metrics_token, запрос должен передать его
+    в заголовке Authorization, иначе метрики отдаются только адресам loopback.
+
+    Args:
+        request (Request): запрос
+
+    Raises:
+        HTTPException: токен не передан или неверен, либо адрес клиента не loopback
+    """
+    metrics_token = settings.service.metrics_token
+    if metrics_token is not None:
+        expected = 'Bearer {0}'.format(metrics_token)
+        authorization = request.headers.get('authorization', '')
+        if not hmac.compare_digest(authorization.encode(), expected.encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    elif request.client is None or not _is_loopback(request.client.host):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+
+@router.get('/metrics', include_in_schema=False, dependencies=[Depends(metrics_access)])
+def get_metrics() -> Response:
+    """Получить метрики сервиса в текстовом формате prometheus.
+
+    Обработчик синхронный: сериализация метрик выполняется в пуле потоков
+    и не задерживает цикл событий. Перед сериализацией публикуется статистика
+    компонентов воркера. При запуске нескольких воркеров метрики суммируются
+    по всем воркерам, статистику других воркеров они публикуют периодически в фоне.
+
+    Returns:
+        Response: метрики сервиса
+    """
+    stats_publisher = stats_publisher_component.peek()
+    if stats_publisher is not None:
+        stats_publisher.publish()
+    return Response(
+        content=generate_latest(create_registry()),
+        headers={'Content-Type': CONTENT_TYPE_LATEST},
+    )
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ip_address(host).is_loopback
+    except ValueError:
+        return False
@@ -0,0 +1,124 @@
+"""Модуль содержит ASGI middleware для сбора метрик HTTP запросов."""
+
+from functools import lru_cache
+from time import perf_counter
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette import status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = '<unmatched>'
+# Шаблон маршрута запроса, отклоненного middleware до маршрутизации.
+ROUTE_PATH_SCOPE_KEY = 'metrics.route_path'
+OTHER_METHOD = 'OTHER'
+KNOWN_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+METHOD_LABEL = 'method'
+ROUTE_LABEL = 'route'
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+http_requests = Counter(
+    'http_requests',
+    'Количество обработанных HTTP запросов',
+    [METHOD_LABEL, ROUTE_LABEL, 'status'],
+)
+http_request_duration = Histogram(
+    'http_request_duration_seconds',
+    'Время обработки HTTP запроса, включая отправку тела ответа',
+    [METHOD_LABEL, ROUTE_LABEL],
+    buckets=DURATION_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    'http_requests_in_flight',
+    'Количество HTTP запросов в обработке',
+    [METHOD_LABEL],
+    multiprocess_mode='livesum',
+)
+
+
+class PrometheusMiddleware(object):
+    """Middleware, измеряющий количество и время обработки запросов по шаблонам маршрутов.
+
+    Реализован как чистое ASGI приложение, чтобы не буферизовать тело ответа.
+    Шаблон маршрута (например, `/api/advertisements/{ad_id}`) берется из scope
+    после маршрутизации, поэтому число временных рядов не зависит от значений
+    параметров пути. Для запроса, отклоненного до маршрутизации (например, ограничением
+    частоты запросов), шаблон берется из scope по ключу ROUTE_PATH_SCOPE_KEY.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Обработать запрос.
+
+        Args:
+            scope (Scope): scope запроса
+            receive (Receive): функция получения сообщений
+            send (Send): функция отправки сообщений
+        """
+        if scope['type'] != 'http':
+            await self._app(scope, receive, send)
+            return
+
+        method = scope['method'] if scope['method'] in KNOWN_METHODS else OTHER_METHOD
+        response = _ResponseStatus(send)
+        in_flight = _in_flight_gauge(method)
+        in_flight.inc()
+        started_at = perf_counter()
+        try:  # noqa: WPS501
+            await self._app(scope, receive, response.send)
+        finally:
+            in_flight.dec()
+            _observe(scope, method, response.status_code, perf_counter() - started_at)
+
+
+class _ResponseStatus(object):
+    """Обертка функции отправки, запоминающая статус ответа."""
+
+    def __init__(self, send: Send):
+        self.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        self._send = send
+
+    async def send(self, message: Message):
+        if message['type'] == 'http.response.start':
+            self.status_code = message['status']
+        await self._send(message)
+
+
+def _observe(scope: Scope, method: str, status_code: int, duration: float):
+    route = scope.get('route')
+    if route is not None:
+        route_path = route.path
+    else:
+        route_path = scope.get(ROUTE_PATH_SCOPE_KEY, UNMATCHED_ROUTE)
+    _duration_histogram(method, route_path).observe(duration)
+    _requests_counter(method, route_path, status_code).inc()
+
+
+@lru_cache(maxsize=None)
+def _in_flight_gauge(method: str):
+    return http_requests_in_flight.labels(method)
+
+
+@lru_cache(maxsize=None)
+def _duration_histogram(method: str, route_path: str):
+    return http_request_duration.labels(method, route_path)
+
+
+@lru_cache(maxsize=None)
+def _requests_counter(method: str, route_path: str, status_code: int):
+    return http_requests.labels(method, route_path, status_code)
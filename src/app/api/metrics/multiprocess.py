@@ -0,0 +1,58 @@
+"""Модуль содержит поддержку метрик prometheus при запуске нескольких воркеров.
+
+В многопроцессном режиме каждый воркер пишет значения метрик в файлы каталога
+PROMETHEUS_MULTIPROC_DIR, а эндпоинт метрик любого воркера суммирует их.
+Переменная окружения должна быть задана до импорта prometheus_client в воркере.
+"""
+
+import os
+import tempfile
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+def is_enabled() -> bool:
+    """Проверить, включен ли многопроцессный режим метрик.
+
+    Returns:
+        bool: задан каталог для файлов метрик
+    """
+    return MULTIPROC_DIR_ENV in os.environ
+
+
+def prepare_directory() -> str | None:
+    """Создать пустой каталог для файлов метрик воркеров.
+
+    Вызывается в родительском процессе до запуска воркеров.
+    Заданный оператором каталог не изменяется.
+
+    Returns:
+        str | None: созданный каталог или None, если каталог уже задан
+    """
+    if is_enabled():
+        return None
+    directory = tempfile.mkdtemp(prefix='marketplace-metrics-')
+    os.environ[MULTIPROC_DIR_ENV] = directory
+    return directory
+
+
+def create_registry() -> CollectorRegistry:
+    """Получить реестр для эндпоинта метрик.
+
+    Returns:
+        CollectorRegistry: реестр, объединяющий метрики всех воркеров,
+        или реестр текущего процесса в однопроцессном режиме
+    """
+    if not is_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_worker_dead():
+    """Удалить значения gauge метрик остановленного воркера."""
+    if is_enabled():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,183 @@
+"""Модуль содержит публикацию статистики компонентов воркера в метрики prometheus.
+
+Пул соединений, пул bcrypt и кеши накапливают статистику сами и не обновляют метрики
+при обработке запросов. Статистика переносится в метрики prometheus_client при запросе
+метрик и, в многопроцессном режиме, периодически в фоне каждого воркера: значения метрик
+воркера записываются в его файлы PROMETHEUS_MULTIPROC_DIR, и эндпоинт любого воркера
+суммирует статистику всех воркеров.
+"""
+
+import asyncio
+import logging
+import threading
+
+from prometheus_client import Counter, Gauge
+
+from src.app.component import Component
+from src.app.data_sources.adaptor import get_pool_stats
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.storages.user_storage import (
+    token_version_cache_component,
+    user_cache_component,
+)
+from src.app.users.password import password_hasher_component
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+LIVESUM = 'livesum'
+
+db_pool_size = Gauge('db_pool_size', 'Размер пула соединений', multiprocess_mode=LIVESUM)
+db_pool_checked_out = Gauge(
+    'db_pool_checked_out',
+    'Количество выданных соединений',
+    multiprocess_mode=LIVESUM,
+)
+db_pool_overflow = Gauge(
+    'db_pool_overflow',
+    'Количество соединений сверх pool_size',
+    multiprocess_mode=LIVESUM,
+)
+db_pool_checkouts = Counter('db_pool_checkouts', 'Количество выдач соединений')
+db_pool_wait = Counter('db_pool_wait_seconds', 'Суммарное время ожидания соединения')
+db_pool_overflow_events = Counter(
+    'db_pool_overflow_events',
+    'Количество открытий соединений сверх pool_size',
+)
+db_pool_timeouts = Counter('db_pool_timeouts', 'Количество превышений pool_timeout')
+password_hasher_queue_depth = Gauge(
+    'password_hasher_queue_depth',
+    'Количество операций bcrypt в очереди',
+    multiprocess_mode=LIVESUM,
+)
+password_hasher_completed = Counter(
+    'password_hasher_completed',
+    'Количество выполненных операций bcrypt',
+)
+password_hasher_rejected = Counter(
+    'password_hasher_rejected',
+    'Количество отклоненных операций bcrypt',
+)
+password_hasher_wait = Counter(
+    'password_hasher_wait_seconds',
+    'Суммарное время ожидания потока bcrypt',
+)
+cache_hits = Counter('cache_hits', 'Количество попаданий в кеш', ['cache'])
+cache_misses = Counter('cache_misses', 'Количество промахов кеша', ['cache'])
+
+
+class _CounterTotals(object):
+    """Последние опубликованные значения накопительной статистики по счетчикам."""
+
+    def __init__(self):
+        self._published: dict[Counter, float] = {}
+
+    def advance(self, counter: Counter, total: float):
+        published = self._published.get(counter, 0)
+        if total < published:
+            # Компонент создан заново, его статистика начата с нуля.
+            published = 0
+        if total > published:
+            counter.inc(total - published)
+        self._published[counter] = total
+
+
+class ServiceStatsPublisher(object):
+    """Перенос статистики пула соединений, пула bcrypt и кешей в метрики prometheus.
+
+    Счетчики увеличиваются на прирост статистики с предыдущей публикации.
+    Компоненты, еще не созданные при запуске воркера, пропускаются.
+    Публикация вызывается и из пула потоков эндпоинта метрик, и из цикла событий,
+    поэтому выполняется под блокировкой.
+    """
+
+    def __init__(self, interval_seconds: float):
+        """Создание публикации.
+
+        Args:
+            interval_seconds (float): период публикации в фоне
+        """
+        self._interval = interval_seconds
+        self._totals = _CounterTotals()
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Запустить периодическую публикацию в фоне."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Остановить периодическую публикацию."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass  # noqa: WPS420
+        self._task = None
+
+    def publish(self):
+        """Перенести текущую статистику компонентов воркера в метрики."""
+        with self._lock:
+            self._publish_pool()
+            self._publish_password_hasher()
+            self._publish_caches()
+
+    async def _run(self):
+        while True:
+            try:
+                self.publish()
+            except OSError as exception:
+                # Файлы метрик многопроцессного режима записываются при публикации.
+                logger.warning('Публикация статистики в метрики не удалась: {0}'.format(
+                    exception,
+                ))
+            await asyncio.sleep(self._interval)
+
+    def _publish_pool(self):
+        pool = get_pool_stats()
+        if pool is None:
+            return
+        db_pool_size.set(pool.size)
+        db_pool_checked_out.set(pool.checked_out)
+        db_pool_overflow.set(pool.overflow)
+        self._totals.advance(db_pool_checkouts, pool.checkouts)
+        self._totals.advance(db_pool_wait, pool.total_wait_seconds)
+        self._totals.advance(db_pool_overflow_events, pool.overflow_events)
+        self._totals.advance(db_pool_timeouts, pool.timeouts)
+
+    def _publish_password_hasher(self):
+        password_hasher = password_hasher_component.peek()
+        if password_hasher is None:
+            return
+        hasher = password_hasher.stats()
+        password_hasher_queue_depth.set(hasher.queue_depth)
+        self._totals.advance(password_hasher_completed, hasher.completed)
+        self._totals.advance(password_hasher_rejected, hasher.rejected)
+        self._totals.advance(password_hasher_wait, hasher.total_wait_seconds)
+
+    def _publish_caches(self):
+        caches = {
+            'user': user_cache_component.peek(),
+            'token_version': token_version_cache_component.peek(),
+            'advertisement': advertisement_cache_component.peek(),
+        }
+        for name, cache in caches.items():
+            if cache is not None:
+                cache_stats = cache.stats()
+                self._totals.advance(cache_hits.labels(name), cache_stats.hits)
+                self._totals.advance(cache_misses.labels(name), cache_stats.misses)
+
+
+def create_stats_publisher() -> ServiceStatsPublisher:
+    """Создать публикацию статистики компонентов по настройкам service.
+
+    Returns:
+        ServiceStatsPublisher: публикация статистики в метрики
+    """
+    return ServiceStatsPublisher(interval_seconds=settings.service.metrics_interval_seconds)
+
+
+stats_publisher_component: Component[ServiceStatsPublisher] = Component('stats_publisher')
@@ -0,0 +1,210 @@
+"""Модуль содержит ASGI middleware для ограничения частоты запросов."""
+
+import math
+from functools import lru_cache
+from urllib.parse import parse_qs
+
+import orjson
+from jose import JWTError, jwt
+from prometheus_client import Counter
+from starlette import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.api.metrics.middleware import ROUTE_PATH_SCOPE_KEY
+from src.app.api.rate_limit.store import TokenBucketStore
+from src.config.config import settings
+
+USERNAME_MAX_LENGTH = 100
+IP_KEY = 'ip'
+SUBJECT_KEY = 'subject'
+USERNAME_KEY = 'username'
+IP_USERNAME_KEY = 'ip_username'
+
+rate_limited_requests = Counter(
+    'rate_limited_requests',
+    'Количество запросов, отклоненных ограничением частоты',
+    ['route'],
+)
+
+
+class RateLimitMiddleware(object):
+    """Middleware, ограничивающий частоту запросов корзинами токенов.
+
+    Лимиты задаются для маршрутов вида `POST /api/users/auth` в настройках rate_limit.routes.
+    Для каждого запроса берется по токену из корзин по ключам правила:
+    ip - адрес клиента, username - имя пользователя из тела запроса
+    (форма или json), ip_username - пара адреса клиента и имени пользователя,
+    subject - id пользователя из токена доступа.
+    Запрос отклоняется статусом 429 с заголовком Retry-After до маршрутизации,
+    то есть до обращений к бд и хеширования паролей. Если для ключа нужно тело запроса,
+    а оно больше max_body_size, запрос отклоняется статусом 413.
+    Правила задаются для путей без параметров, поэтому путь отклоненного запроса
+    передается в метрики HTTP запросов как шаблон маршрута.
+    """
+
+    def __init__(self, app: ASGIApp, store: TokenBucketStore):
+        self._app = app
+        self._store = store
+        self._rules = settings.rate_limit.routes
+        self._max_body_size = settings.rate_limit.max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Обработать запрос.
+
+        Args:
+            scope (Scope): scope запроса
+            receive (Receive): функция получения сообщений
+            send (Send): функция отправки сообщений
+        """
+        route = '{0} {1}'.format(scope.get('method'), scope.get('path'))
+        rule = self._rules.get(route) if scope['type'] == 'http' else None
+        if rule is None:
+            await self._app(scope, receive, send)
+            return
+
+        scope[ROUTE_PATH_SCOPE_KEY] = scope['path']
+        bucket_keys, receive = await self._bucket_keys(scope, receive, route, rule.keys)
+        if bucket_keys is None:
+            await _body_too_large()(scope, receive, send)
+            return
+        wait = 0
+        if bucket_keys:
+            wait = await self._store.take(bucket_keys, rule.rate, rule.burst)
+        if wait > 0:
+            _rejected_counter(route).inc()
+            await _too_many_requests(wait)(scope, receive, send)
+            return
+        await self._app(scope, receive, send)
+
+    async def _bucket_keys(
+        self,
+        scope: Scope,
+        receive: Receive,
+        route: str,
+        kinds: list[str],
+    ) -> tuple[list[str] | None, Receive]:
+        key_values = {}
+        if scope.get('client'):
+            key_values[IP_KEY] = scope['client'][0]
+        if SUBJECT_KEY in kinds:
+            key_values[SUBJECT_KEY] = _token_subject(scope)
+        if USERNAME_KEY in kinds or IP_USERNAME_KEY in kinds:
+            body, receive = await self._read_body(scope, receive)
+            if body is None:
+                return None, receive
+            key_values[USERNAME_KEY] = _username(scope, body)
+        if key_values.get(IP_KEY) and key_values.get(USERNAME_KEY):
+            key_values[IP_USERNAME_KEY] = '{0}:{1}'.format(
+                key_values[IP_KEY],
+                key_values[USERNAME_KEY],
+            )
+        return [
+            'rate_limit:{0}:{1}:{2}'.format(route, kind, key_values[kind])
+            for kind in kinds
+            if key_values.get(kind)
+        ], receive
+
+    async def _read_body(self, scope: Scope, receive: Receive) -> tuple[bytes | None, Receive]:
+        content_length = _header(scope, b'content-length') or ''
+        if content_length.isdigit() and int(content_length) > self._max_body_size:
+            return None, receive
+        # Тело без content-length (chunked) читается, пока не превысит max_body_size.
+        messages = await _receive_body(receive, self._max_body_size)
+
+        async def replay() -> Message:  # noqa: WPS430
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        body = b''.join(
+            message.get('body', b'')
+            for message in messages
+            if message['type'] == 'http.request'
+        )
+        if len(body) > self._max_body_size:
+            return None, replay
+        return body, replay
+
+
+async def _receive_body(receive: Receive, max_body_size: int) -> list[Message]:
+    messages: list[Message] = []
+    body_size = 0
+    more_body = True
+    while more_body and body_size <= max_body_size:
+        message = await receive()
+        messages.append(message)
+        if message['type'] != 'http.request':
+            break
+        body_size += len(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return messages
+
+
+def _too_many_requests(wait: float) -> JSONResponse:
+    return JSONResponse(
+        {'detail': 'Слишком много запросов, повторите позже'},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': str(max(math.ceil(wait), 1))},
+    )
+
+
+def _body_too_large() -> JSONResponse:
+    return JSONResponse(
+        {'detail': 'Слишком большое тело запроса'},
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    )
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for header_name, header_value in scope['headers']:
+        if header_name == name:
+            return header_value.decode('latin-1')
+    return None
+
+
+def _token_subject(scope: Scope) -> str | None:
+    authorization = _header(scope, b'authorization')
+    if not authorization:
+        return None
+    scheme, _, access_token = authorization.partition(' ')
+    if scheme.lower() != 'bearer':
+        return None
+    try:
+        payload = jwt.decode(access_token, settings.access_token.secret, algorithms='HS256')
+    except JWTError:
+        return None
+    return payload.get('sub')
+
+
+def _username(scope: Scope, body: bytes | None) -> str | None:
+    if not body:
+        return None
+    content_type = _header(scope, b'content-type') or ''
+    if content_type.startswith('application/x-www-form-urlencoded'):
+        username = _form_username(body)
+    elif content_type.startswith('application/json'):
+        username = _json_username(body)
+    else:
+        return None
+    if isinstance(username, str):
+        return username[:USERNAME_MAX_LENGTH]
+    return None
+
+
+def _form_username(body: bytes) -> str | None:
+    usernames = parse_qs(body.decode(errors='replace')).get(USERNAME_KEY)
+    return usernames[0] if usernames else None
+
+
+def _json_username(body: bytes):
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    return payload.get(USERNAME_KEY) if isinstance(payload, dict) else None
+
+
+@lru_cache(maxsize=None)
+def _rejected_counter(route: str):
+    return rate_limited_requests.labels(route)
@@ -0,0 +1,170 @@
+"""Модуль содержит хранилища корзин токенов для ограничения частоты запросов."""
+
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+# KEYS - ключи корзин, ARGV[1] - скорость пополнения в секунду, ARGV[2] - емкость.
+# Токены забираются, только если они есть во всех корзинах.
+# Возвращает строкой время в секундах до появления токена в самой пустой корзине.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local ttl = math.ceil(burst / rate * 1000)
+local function refilled(key)
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local updated_at = tonumber(bucket[2]) or now
+    return math.min(burst, (tonumber(bucket[1]) or burst) + math.max(now - updated_at, 0) * rate)
+end
+local wait = 0
+for _, key in ipairs(KEYS) do
+    local tokens = refilled(key)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+local taken = 1
+if wait > 0 then
+    taken = 0
+end
+for _, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'tokens', tostring(refilled(key) - taken), 'updated_at', tostring(now))
+    redis.call('PEXPIRE', key, ttl)
+end
+return tostring(wait)
+"""
+
+
+class TokenBucketStore(ABC):
+    """Базовый класс хранилища корзин токенов.
+
+    Корзина вмещает burst токенов и пополняется со скоростью rate токенов в секунду,
+    каждый запрос забирает по одному токену из всех своих корзин. Если хотя бы
+    в одной корзине токена нет, запрос отклоняется и токены не забираются ни из одной.
+    """
+
+    @abstractmethod
+    async def take(self, keys: list[str], rate: float, burst: int) -> float:
+        """Забрать по токену из корзин.
+
+        Args:
+            keys (list[str]): ключи корзин
+            rate (float): скорость пополнения корзины в токенах в секунду
+            burst (int): емкость корзины
+
+        Returns:
+            float: 0, если токены есть во всех корзинах, иначе время в секундах
+            до появления токена в самой пустой корзине
+        """
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """Хранилище корзин в памяти процесса.
+
+    Лимиты действуют в пределах одного воркера. Число корзин ограничено,
+    при переполнении вытесняются давно не использованные корзины.
+    """
+
+    def __init__(self, max_keys: int):
+        """Создание хранилища.
+
+        Args:
+            max_keys (int): максимальное количество корзин
+        """
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, keys: list[str], rate: float, burst: int) -> float:
+        """Забрать по токену из корзин.
+
+        Args:
+            keys (list[str]): ключи корзин
+            rate (float): скорость пополнения корзины в токенах в секунду
+            burst (int): емкость корзины
+
+        Returns:
+            float: 0, если токены есть во всех корзинах, иначе время в секундах
+            до появления токена в самой пустой корзине
+        """
+        now = monotonic()
+        refilled = {key: self._refill(key, rate, burst, now) for key in keys}
+        wait = max(
+            ((1 - tokens) / rate for tokens in refilled.values() if tokens < 1),
+            default=0,
+        )
+        if wait == 0:
+            refilled = {key: tokens - 1 for key, tokens in refilled.items()}
+        for key, tokens in refilled.items():
+            self._buckets.pop(key, None)
+            self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def _refill(self, key: str, rate: float, burst: int, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        return min(burst, tokens + (now - updated_at) * rate)
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """Хранилище корзин в redis (или совместимом по протоколу сервере).
+
+    Лимиты общие для всех воркеров и экземпляров сервиса. Все корзины запроса
+    обновляются атомарно одним lua скриптом по часам сервера redis.
+    При недоступности redis запросы пропускаются без ограничения.
+    Требует установленного пакета redis (`poetry install -E redis`).
+    """
+
+    def __init__(self, url: str):
+        """Создание хранилища.
+
+        Args:
+            url (str): адрес сервера, например redis://localhost:6379/0
+
+        Raises:
+            RuntimeError: пакет redis не установлен
+        """
+        try:
+            from redis import asyncio as redis_asyncio  # noqa: WPS433
+        except ImportError:
+            raise RuntimeError('Для хранилища лимитов redis требуется пакет redis')
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._take_script = self._client.register_script(_TAKE_SCRIPT)
+        self._errors = (redis_asyncio.RedisError, OSError)
+
+    async def take(self, keys: list[str], rate: float, burst: int) -> float:
+        """Забрать по токену из корзин.
+
+        Args:
+            keys (list[str]): ключи корзин
+            rate (float): скорость пополнения корзины в токенах в секунду
+            burst (int): емкость корзины
+
+        Returns:
+            float: 0, если токены есть во всех корзинах или redis недоступен,
+            иначе время в секундах до появления токена в самой пустой корзине
+        """
+        try:
+            wait = await self._take_script(keys=keys, args=[rate, burst])
+        except self._errors as exception:
+            logger.warning('Ошибка ограничения частоты запросов в redis: {0}'.format(exception))
+            return 0
+        return float(wait)
+
+
+def create_store() -> TokenBucketStore:
+    """Создать хранилище корзин по настройкам rate_limit.
+
+    Returns:
+        TokenBucketStore: хранилище в памяти или в redis
+    """
+    if settings.rate_limit.backend == 'redis':
+        return RedisTokenBucketStore(settings.rate_limit.redis_url)
+    return MemoryTokenBucketStore(settings.rate_limit.max_keys)
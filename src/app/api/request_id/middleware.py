@@ -0,0 +1,58 @@
+"""Модуль содержит ASGI middleware, присваивающий HTTP запросам id."""
+
+import re
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.data_sources.slow_queries import request_id
+
+REQUEST_ID_HEADER = b'x-request-id'
+REQUEST_ID_PATTERN = re.compile(rb'[\w.:-]{1,64}')
+
+
+class RequestIdMiddleware(object):
+    """Middleware, присваивающий запросу id и возвращающий его в заголовке X-Request-ID.
+
+    Если клиент или балансировщик передал корректный X-Request-ID, используется он,
+    иначе создается новый. Id доступен в контекстной переменной request_id,
+    например в журнале медленных запросов.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Обработать запрос.
+
+        Args:
+            scope (Scope): scope запроса
+            receive (Receive): функция получения сообщений
+            send (Send): функция отправки сообщений
+        """
+        if scope['type'] != 'http':
+            await self._app(scope, receive, send)
+            return
+
+        current_id = _incoming_request_id(scope) or uuid4().hex
+
+        async def send_wrapper(message: Message):  # noqa: WPS430
+            if message['type'] == 'http.response.start':
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (REQUEST_ID_HEADER, current_id.encode()),
+                ]
+            await send(message)
+
+        token = request_id.set(current_id)
+        try:  # noqa: WPS501
+            await self._app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
+
+
+def _incoming_request_id(scope: Scope) -> str | None:
+    for name, header_value in scope['headers']:
+        if name == REQUEST_ID_HEADER and REQUEST_ID_PATTERN.fullmatch(header_value):
+            return header_value.decode()
+    return None
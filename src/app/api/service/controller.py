@@ -0,0 +1,99 @@
+"""Модуль содержащий служебные эндпоинты сервиса."""
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.exc import SQLAlchemyError
+from typing_extensions import Annotated
+
+from src.app.api.service.models import ServiceStats, SlowQueryReport
+from src.app.api.users.controller import get_current_user
+from src.app.data_sources.adaptor import get_pool_stats, get_replica_pool_stats
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.dtos.user import User
+from src.app.data_sources.slow_queries import slow_query_log_component
+from src.app.data_sources.storages.user_storage import user_cache_component
+from src.app.startup import Startup, StartupReport
+from src.app.users.password import password_hasher_component
+
+router = APIRouter()
+
+
+@router.get('/api/service/stats')
+async def get_service_stats(
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> ServiceStats:
+    """Получить внутреннюю статистику сервиса для подбора параметров конфигурации.
+
+    Args:
+        current_user (Annotated[User, Depends]): текущий пользователь
+
+    Raises:
+        HTTPException: текущий пользователь не является администратором
+
+    Returns:
+        ServiceStats: статистика компонентов сервиса
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return ServiceStats(
+        password_hasher=password_hasher_component.get().stats(),
+        user_cache=user_cache_component.get().stats(),
+        advertisement_cache=advertisement_cache_component.get().stats(),
+        db_pool=get_pool_stats(),
+        db_replica_pools=get_replica_pool_stats(),
+    )
+
+
+@router.get('/api/service/slow-queries')
+async def get_slow_queries(
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> SlowQueryReport:
+    """Получить последние медленные запросы к бд воркера, обработавшего запрос.
+
+    Журнал хранится в памяти каждого воркера отдельно, поэтому при нескольких воркерах
+    ответ содержит только запросы воркера с pid worker_pid. Журналы всех воркеров
+    собираются повторными запросами или по логу медленных запросов.
+
+    Args:
+        current_user (Annotated[User, Depends]): текущий пользователь
+
+    Raises:
+        HTTPException: текущий пользователь не является администратором
+
+    Returns:
+        SlowQueryReport: pid воркера и его медленные запросы, начиная с самого нового
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return SlowQueryReport(
+        worker_pid=os.getpid(),
+        items=slow_query_log_component.get().recent(),
+    )
+
+
+@router.get('/api/service/ready', response_model=StartupReport)
+async def get_readiness(request: Request) -> Response:
+    """Проверить готовность воркера к обслуживанию запросов.
+
+    Воркер готов, когда пул соединений прогрет и основные запросы подготовлены.
+    Если прогрев при запуске не удался, он повторяется при проверке.
+
+    Args:
+        request (Request): запрос
+
+    Returns:
+        Response: StartupReport со статусом 200, если воркер готов, иначе 503
+    """
+    startup: Startup = request.app.state.startup
+    try:
+        await startup.warm_up()
+    except (SQLAlchemyError, OSError):
+        # TimeoutError прогрева является подклассом OSError.
+        pass  # noqa: WPS420
+    report = startup.report()
+    return ORJSONResponse(
+        report,
+        status_code=status.HTTP_200_OK if report.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
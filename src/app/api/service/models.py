@@ -0,0 +1,26 @@
+"""Модуль содержит pydantic модели для валидации параметров запросов и возвращаемых ответов."""
+
+from pydantic import BaseModel
+
+from src.app.data_sources.caches.advertisement_cache import AdvertisementCacheStats
+from src.app.data_sources.caches.ttl_cache import CacheStats
+from src.app.data_sources.pool_metrics import PoolStats
+from src.app.data_sources.slow_queries import SlowQuery
+from src.app.users.password import PasswordHasherStats
+
+
+class ServiceStats(BaseModel):
+    """Модель внутренней статистики сервиса."""
+
+    password_hasher: PasswordHasherStats
+    user_cache: CacheStats
+    advertisement_cache: AdvertisementCacheStats
+    db_pool: PoolStats | None
+    db_replica_pools: list[PoolStats]
+
+
+class SlowQueryReport(BaseModel):
+    """Модель журнала медленных запросов одного воркера."""
+
+    worker_pid: int
+    items: list[SlowQuery]  # noqa: WPS110
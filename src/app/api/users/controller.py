@@ -13,12 +13,15 @@ from src.app.data_sources.dtos.user import User
 from src.app.data_sources.storages.user_storage import UserStorage
 from src.app.users.access_token import create_access_token
 from src.app.users.auth import authenticate_user
+from src.app.users.password import PasswordHasherOverloadedError
 from src.config.config import settings
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/users/auth')
 user_storage = UserStorage()
 
+OVERLOADED_RETRY_AFTER_SECONDS = 1
+
 
 async def get_current_user(
     access_token: Annotated[str, Depends(oauth2_scheme)],
@@ -26,19 +29,32 @@ async def get_current_user(
 ) -> User:
     """Получение пользователя по токену доступа.
 
+    В режиме stateless_claims пользователь восстанавливается из данных токена,
+    а из бд (через кеш) читается только версия токенов для проверки отзыва.
+
     Args:
         access_token (Annotated[str, Depends]): токен доступа
         session(AsyncSession): сессия подключения к бд
 
     Raises:
         HTTPException: не удалось декодировать токен
-        HTTPException: пользователь с таким id не найден
+        HTTPException: пользователь с таким id не найден или токен отозван
 
     Returns:
         User: текущий пользователь
     """
+    user = await _token_user(session, _decode_token(access_token))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Пользователь с таким id не найден или токен доступа отозван',
+        )
+    return user
+
+
+def _decode_token(access_token: str) -> dict:
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             access_token,
             settings.access_token.secret,
             algorithms='HS256',
@@ -48,15 +64,31 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Не удалось декодировать токен',
         )
+
+
+async def _token_user(session: AsyncSession, payload: dict) -> User | None:
     user_id = int(payload.get('sub'))
-    if user_id:
-        user = await user_storage.get_user_by_id(session=session, user_id=user_id)
-        if user:
-            return user
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail='Пользователь с таким id не найден',
-    )
+    token_version = payload.get('ver', 0)
+    if not user_id:
+        return None
+    if settings.access_token.stateless_claims and 'username' in payload:
+        current_version = await user_storage.get_cached_token_version(
+            session=session,
+            user_id=user_id,
+        )
+        if current_version != token_version:
+            return None
+        return User(
+            user_id=user_id,
+            username=payload['username'],
+            password_hash=None,
+            is_admin=payload['adm'],
+            token_version=token_version,
+        )
+    user = await user_storage.get_cached_user_by_id(session=session, user_id=user_id)
+    if user and user.token_version == token_version:
+        return user
+    return None
 
 
 @router.post('/api/users/register')
@@ -72,6 +104,7 @@ async def register(
 
     Raises:
         HTTPException: пользователь с таким именем уже существует
+        HTTPException: очередь хеширования паролей заполнена
 
     Returns:
         Response: статус код 200, пользователь успешно создан
@@ -87,6 +120,12 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exception),
         )
+    except PasswordHasherOverloadedError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exception),
+            headers={'Retry-After': str(OVERLOADED_RETRY_AFTER_SECONDS)},
+        )
     return Response(status_code=status.HTTP_200_OK)
 
 
@@ -104,23 +143,31 @@ async def auth_for_access_token(
 
     Raises:
         HTTPException: неверрные данные пользователя
+        HTTPException: очередь проверки паролей заполнена
 
     Returns:
         AccessToken: токен доступа и тип токена
     """
-    user = await authenticate_user(
-        storage=user_storage,
-        session=session,
-        username=form_data.username,
-        password=form_data.password,
-    )
+    try:
+        user = await authenticate_user(
+            storage=user_storage,
+            session=session,
+            username=form_data.username,
+            password=form_data.password,
+        )
+    except PasswordHasherOverloadedError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exception),
+            headers={'Retry-After': str(OVERLOADED_RETRY_AFTER_SECONDS)},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Неверный пароль или имя пользователя',
             headers={'WWW-Authenticate': 'Bearer'},
         )
-    access_token = create_access_token(user.user_id)
+    access_token = create_access_token(user)
     return AccessToken(access_token=access_token, token_type=settings.access_token.token_type)
 
 
@@ -146,12 +193,11 @@ async def promote_to_admin(
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
-    user = await user_storage.get_user_by_username(session=session, username=username)
-    if not user:
+    try:
+        await user_storage.update_user(session=session, username=username, is_admin=True)
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Пользователь с таким именем не найден',
         )
-    user.is_admin = True
-    await user_storage.update_user(session=session, username=username, updated_user=user)
     return Response(status_code=status.HTTP_200_OK)
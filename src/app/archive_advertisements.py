@@ -0,0 +1,48 @@
+"""Модуль однократно архивирует объявления с истекшим сроком жизни.
+
+Воркеры сервиса архивируют объявления периодически (advertisement_lifecycle.archiver_enabled),
+команда нужна, если фоновая архивация отключена или секции нужно подготовить до запуска.
+Запуск из корня проекта:
+
+    poetry run python -m src.app.archive_advertisements
+"""
+
+import asyncio
+import sys
+
+from src.app.components import close_components, create_components
+from src.app.data_sources.adaptor import close_engine, init_database
+from src.app.data_sources.storages.advertisement_archiver import ArchiveResult, archiver_component
+
+
+async def archive() -> ArchiveResult:
+    """Создать недостающие секции, архивировать объявления и очистить журнал изменений.
+
+    Returns:
+        ArchiveResult: созданные секции, количество вычтенных из фасетов
+        и архивированных объявлений и удаленных отметок
+    """
+    create_components()
+    init_database()
+    try:  # noqa: WPS501
+        return await archiver_component.get().archive()
+    finally:
+        await close_components()
+        await close_engine()
+
+
+def main():
+    """Архивировать объявления и вывести результат."""
+    archive_result = asyncio.run(archive())
+    sys.stdout.write('partitions created: {0}\n'.format(len(archive_result.created_partitions)))
+    sys.stdout.write('advertisements expired: {0}\n'.format(
+        archive_result.expired_advertisements,
+    ))
+    sys.stdout.write('advertisements archived: {0}\n'.format(
+        archive_result.archived_advertisements,
+    ))
+    sys.stdout.write('tombstones purged: {0}\n'.format(archive_result.purged_tombstones))
+
+
+if __name__ == '__main__':
+    main()
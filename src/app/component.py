@@ -0,0 +1,51 @@
+"""Модуль содержит контейнер объекта воркера, создаваемого при запуске, а не при импорте."""
+
+from typing import Generic, TypeVar
+
+_InstanceType = TypeVar('_InstanceType')
+
+
+class Component(Generic[_InstanceType]):
+    """Контейнер объекта, общего для воркера (движки бд, пулы, кеши).
+
+    Модуль объявляет контейнер при импорте, а сам объект создается и задается
+    при запуске приложения или команды, когда настройки уже загружены.
+    """
+
+    def __init__(self, name: str):
+        """Создание пустого контейнера.
+
+        Args:
+            name (str): название объекта для сообщений об ошибках
+        """
+        self._name = name
+        self._instance: _InstanceType | None = None
+
+    def get(self) -> _InstanceType:
+        """Получить объект.
+
+        Raises:
+            RuntimeError: объект еще не создан
+
+        Returns:
+            _InstanceType: объект
+        """
+        if self._instance is None:
+            raise RuntimeError('{0} еще не создан'.format(self._name))
+        return self._instance
+
+    def peek(self) -> _InstanceType | None:
+        """Получить объект, если он создан.
+
+        Returns:
+            _InstanceType | None: объект или None
+        """
+        return self._instance
+
+    def set(self, instance: _InstanceType | None):
+        """Задать или сбросить объект.
+
+        Args:
+            instance (_InstanceType | None): объект, None - сбросить
+        """
+        self._instance = instance
@@ -0,0 +1,79 @@
+"""Модуль содержит создание и остановку объектов воркера по настройкам.
+
+Объекты создаются фабрикой приложения в процессе воркера или командой при запуске,
+а не при импорте модулей, поэтому настройки читаются при создании объектов.
+Движки бд создаются отдельно при запуске воркера (init_database).
+"""
+
+from src.app.api.metrics.publisher import create_stats_publisher, stats_publisher_component
+from src.app.data_sources.caches.advertisement_cache import (
+    advertisement_cache_component,
+    create_advertisement_cache,
+)
+from src.app.data_sources.caches.advertisement_cache_invalidator import (
+    cache_invalidator_component,
+    create_cache_invalidator,
+)
+from src.app.data_sources.single_flight import create_single_flight
+from src.app.data_sources.slow_queries import create_slow_query_log, slow_query_log_component
+from src.app.data_sources.storages.advertisement_archiver import archiver_component, create_archiver
+from src.app.data_sources.storages.advertisement_batcher import batcher_component, create_batcher
+from src.app.data_sources.storages.advertisement_change_watermark import (
+    change_watermark_component,
+    create_change_watermark,
+)
+from src.app.data_sources.storages.advertisement_storage import (
+    by_id_flight_component,
+    page_flight_component,
+)
+from src.app.data_sources.storages.user_storage import (
+    create_token_version_cache,
+    create_user_cache,
+    token_version_cache_component,
+    user_cache_component,
+)
+from src.app.users.password import create_password_hasher, password_hasher_component
+from src.config.config import settings
+
+
+def create_components():
+    """Создать пул bcrypt, кеши, объединение чтений, журнал медленных запросов и фоновые задачи.
+
+    Групповая запись объявлений создается, только если она включена, сброс кеша объявлений
+    по журналу изменений - только для кеша в памяти при нескольких воркерах.
+    """
+    password_hasher_component.set(create_password_hasher())
+    _create_caches()
+    by_id_flight_component.set(create_single_flight('advertisement_by_id'))
+    page_flight_component.set(create_single_flight('advertisement_page'))
+    _create_metrics()
+    archiver_component.set(create_archiver())
+    change_watermark_component.set(create_change_watermark())
+    if settings.advertisement_batching.enabled:
+        batcher_component.set(create_batcher())
+
+
+def _create_metrics():
+    slow_query_log_component.set(create_slow_query_log())
+    stats_publisher_component.set(create_stats_publisher())
+
+
+def _create_caches():
+    user_cache_component.set(create_user_cache())
+    token_version_cache_component.set(create_token_version_cache())
+    advertisement_cache_component.set(create_advertisement_cache())
+    cache_invalidator_component.set(create_cache_invalidator())
+
+
+async def close_components():
+    """Остановить фоновые задачи, записать накопленные объявления и остановить пул bcrypt."""
+    await archiver_component.get().close()
+    await change_watermark_component.get().close()
+    await stats_publisher_component.get().close()
+    cache_invalidator = cache_invalidator_component.peek()
+    if cache_invalidator is not None:
+        await cache_invalidator.close()
+    batcher = batcher_component.peek()
+    if batcher is not None:
+        await batcher.close()
+    password_hasher_component.get().shutdown()
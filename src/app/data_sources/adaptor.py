@@ -1,22 +1,60 @@
-"""Модуль содержит генератор для создания сессий подключения к бд."""
+"""Модуль содержит генератор для создания сессий подключения к бд.
 
-from asyncio import current_task
+Движки и фабрика сессий создаются при запуске воркера (lifespan) или команды,
+а не при импорте, поэтому каждый процесс воркера создает собственные пулы соединений.
+"""
 
 from sqlalchemy.ext import asyncio as sa_asyncio
 
-from src.config.config import settings
+from src.app.component import Component
+from src.app.data_sources.database import Database, create_database
+from src.app.data_sources.pool_metrics import PoolStats
+from src.app.data_sources.replicas import READ_ONLY_KEY
 
-engine = sa_asyncio.create_async_engine(
-    url=settings.postgres.uri,
-)
-async_session_factory = sa_asyncio.async_sessionmaker(
-    engine,
-    expire_on_commit=False,
-)
-async_scoped_session = sa_asyncio.async_scoped_session(
-    async_session_factory,
-    scopefunc=current_task,
-)
+database_component: Component[Database] = Component('database')
+
+
+def init_database() -> Database:
+    """Метод для создания движков бд по настройкам, если они еще не созданы или не заданы.
+
+    Вызывается только при запуске воркера или команды из цикла событий.
+
+    Returns:
+        Database: движки и фабрики сессий
+    """
+    database = database_component.peek()
+    if database is None:
+        database = create_database()
+        database_component.set(database)
+    return database
+
+
+def get_database() -> Database:
+    """Метод для получения движков бд.
+
+    Returns:
+        Database: движки и фабрики сессий
+    """
+    return database_component.get()
+
+
+def set_database(database: Database | None):
+    """Метод для замены движков бд (например, на sqlite в бенчмарках).
+
+    Args:
+        database (Database | None): движки,
+            None - сбросить, init_database создаст движки заново по настройкам
+    """
+    database_component.set(database)
+
+
+def create_session() -> sa_asyncio.AsyncSession:
+    """Метод для создания сессии вне запроса (выгрузка, фоновые задачи, команды).
+
+    Returns:
+        AsyncSession: новая сессия подключения к бд, закрывается вызывающим
+    """
+    return get_database().session_factory()
 
 
 async def get_session() -> sa_asyncio.AsyncSession:
@@ -25,8 +63,75 @@ async def get_session() -> sa_asyncio.AsyncSession:
     Yields:
         Iterator[AsyncSession]: новая сессия подключения к бд
     """
-    session = async_scoped_session()
+    scoped_session = get_database().scoped_session
+    session = scoped_session()
     try:  # noqa: WPS501
         yield session
     finally:
-        await async_scoped_session.remove()
+        await scoped_session.remove()
+
+
+async def get_read_session() -> sa_asyncio.AsyncSession:
+    """Метод для создания сессии, читающей с реплик бд.
+
+    Используется эндпоинтами, которые только читают данные. Если в сессии
+    выполнялась запись, последующие запросы выполняются на основной бд.
+    Без настроенных реплик равнозначен get_session.
+
+    Yields:
+        Iterator[AsyncSession]: сессия подключения к бд
+    """
+    scoped_session = get_database().scoped_session
+    session = scoped_session()
+    read_only(session)
+    try:  # noqa: WPS501
+        yield session
+    finally:
+        await scoped_session.remove()
+
+
+def read_only(session: sa_asyncio.AsyncSession) -> sa_asyncio.AsyncSession:
+    """Метод для разрешения чтения сессии с реплик бд.
+
+    Args:
+        session (AsyncSession): сессия подключения к бд
+
+    Returns:
+        AsyncSession: та же сессия
+    """
+    session.info[READ_ONLY_KEY] = True
+    return session
+
+
+def get_pool_stats() -> PoolStats | None:
+    """Метод для получения статистики пула соединений с основной бд.
+
+    Returns:
+        PoolStats | None: статистика пула соединений, None - движки еще не созданы
+    """
+    database = database_component.peek()
+    if database is None:
+        return None
+    return database.engine.pool.stats()
+
+
+def get_replica_pool_stats() -> list[PoolStats]:
+    """Метод для получения статистики пулов соединений с репликами бд.
+
+    Returns:
+        list[PoolStats]: статистика пулов в порядке реплик в конфигурации
+    """
+    database = database_component.peek()
+    if database is None:
+        return []
+    return [replica_engine.pool.stats() for replica_engine in database.replica_engines]
+
+
+async def close_engine():
+    """Метод для закрытия всех соединений пулов при остановке воркера."""
+    database = database_component.peek()
+    if database is None:
+        return
+    for engine in database.engines:
+        await engine.dispose()
+    set_database(None)
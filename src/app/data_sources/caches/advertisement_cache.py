@@ -0,0 +1,186 @@
+"""Модуль содержит кеш объявлений, используемый при чтении объявления по id."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.component import Component
+from src.app.data_sources.caches.backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from src.app.data_sources.caches.ttl_cache import CacheStats
+from src.app.data_sources.dtos.advertisement import Advertisement, AdvertisementOwner
+from src.app.data_sources.models import AdvertisementAlchemyModel
+from src.config.config import settings
+
+MISSING = object()
+_NOT_FOUND = b'null'
+_INVALIDATED = b'invalidated'
+
+
+@dataclass
+class AdvertisementCacheStats(object):
+    """Статистика кеша объявлений."""
+
+    backend: str
+    hits: int
+    negative_hits: int
+    misses: int
+    backend_stats: CacheStats | None
+
+
+class AdvertisementCache(object):
+    """Кеш объявлений с поддержкой кеширования отсутствующих id.
+
+    Сброс записи сохраняет вместо нее отметку о сбросе, а прочитанное из бд объявление
+    сохраняется, только если записи нет. Поэтому чтение, начатое до изменения объявления
+    и завершенное после сброса, не возвращает в кеш устаревшие данные.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        invalidated_ttl_seconds: float,
+    ):
+        """Создание кеша.
+
+        Args:
+            backend (CacheBackend): хранилище кеша
+            ttl_seconds (float): время жизни найденного объявления
+            negative_ttl_seconds (float): время жизни записи об отсутствующем объявлении
+            invalidated_ttl_seconds (float): время жизни отметки о сбросе записи
+        """
+        self._backend = backend
+        self._ttl = ttl_seconds
+        self._negative_ttl = negative_ttl_seconds
+        self._invalidated_ttl = invalidated_ttl_seconds
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    async def get(self, ad_id: int) -> Advertisement | None | object:
+        """Получить объявление из кеша.
+
+        Args:
+            ad_id (int): id объявления
+
+        Returns:
+            Advertisement | None | object: объявление, None если известно что объявления нет,
+            MISSING если записи в кеше нет
+        """
+        payload = await self._backend.get(self._key(ad_id))
+        if payload is None or payload == _INVALIDATED:
+            self._misses += 1
+            return MISSING
+        if payload == _NOT_FOUND:
+            self._negative_hits += 1
+            return None
+        self._hits += 1
+        return _decode(payload)
+
+    async def set(self, ad_id: int, advertisement: Advertisement | None):  # noqa: WPS125
+        """Сохранить прочитанное из бд объявление или запись о его отсутствии.
+
+        Запись не сохраняется, если в кеше уже есть запись или отметка о сбросе.
+
+        Args:
+            ad_id (int): id объявления
+            advertisement (Advertisement | None): объявление или None если не найдено
+        """
+        if advertisement is None:
+            await self._backend.add(self._key(ad_id), _NOT_FOUND, self._negative_ttl)
+            return
+        payload = orjson.dumps(advertisement)
+        await self._backend.add(self._key(ad_id), payload, self._ttl)
+
+    async def invalidate(self, ad_ids: list[int]):
+        """Сбросить записи объявлений, заменив их отметками о сбросе.
+
+        Args:
+            ad_ids (list[int]): id объявлений
+        """
+        await self._backend.set_many(
+            [self._key(ad_id) for ad_id in ad_ids],
+            _INVALIDATED,
+            self._invalidated_ttl,
+        )
+
+    async def invalidate_owner(self, session: AsyncSession, owner_id: int):
+        """Сбросить записи всех объявлений пользователя после изменения его данных.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            owner_id (int): id владельца объявлений
+        """
+        ad_ids = (await session.execute(
+            select(AdvertisementAlchemyModel.id).where(
+                AdvertisementAlchemyModel.owner_id == owner_id,
+            ),
+        )).scalars().all()
+        await self.invalidate(list(ad_ids))
+
+    def stats(self) -> AdvertisementCacheStats:
+        """Получить статистику кеша.
+
+        Returns:
+            AdvertisementCacheStats: статистика кеша
+        """
+        return AdvertisementCacheStats(
+            backend=type(self._backend).__name__,
+            hits=self._hits,
+            negative_hits=self._negative_hits,
+            misses=self._misses,
+            backend_stats=self._backend.stats(),
+        )
+
+    def _key(self, ad_id: int) -> str:
+        # Версия формата в ключе не дает прочитать записи прежнего формата из общего redis.
+        return 'advertisement:v3:{0}'.format(ad_id)
+
+
+def _decode(payload: bytes) -> Advertisement:
+    fields = orjson.loads(payload)
+    for field_name in ('updated_at', 'created_at', 'expires_at'):
+        fields[field_name] = datetime.fromisoformat(fields[field_name])
+    fields['owner'] = AdvertisementOwner(**fields['owner'])
+    return Advertisement(**fields)
+
+
+def _create_backend() -> CacheBackend:
+    cache_settings = settings.advertisement_cache
+    if cache_settings.backend == 'redis':
+        return RedisCacheBackend(url=cache_settings.redis_url)
+    return MemoryCacheBackend(
+        max_size=cache_settings.max_size,
+        ttl_seconds=cache_settings.ttl_seconds,
+    )
+
+
+def create_advertisement_cache() -> AdvertisementCache:
+    """Создать кеш объявлений по настройкам advertisement_cache.
+
+    Кеш в памяти при нескольких воркерах хранит записи не дольше multi_worker_ttl_seconds:
+    изменения других воркеров сбрасываются по журналу изменений,
+    а ttl ограничивает устаревание, если чтение журнала не удается.
+
+    Returns:
+        AdvertisementCache: кеш объявлений
+    """
+    cache_settings = settings.advertisement_cache
+    ttl_seconds = cache_settings.ttl_seconds
+    negative_ttl_seconds = cache_settings.negative_ttl_seconds
+    if cache_settings.backend == 'memory' and settings.service.worker_count > 1:
+        ttl_seconds = min(ttl_seconds, cache_settings.multi_worker_ttl_seconds)
+        negative_ttl_seconds = min(negative_ttl_seconds, cache_settings.multi_worker_ttl_seconds)
+    return AdvertisementCache(
+        backend=_create_backend(),
+        ttl_seconds=ttl_seconds,
+        negative_ttl_seconds=negative_ttl_seconds,
+        invalidated_ttl_seconds=cache_settings.invalidated_ttl_seconds,
+    )
+
+
+advertisement_cache_component: Component[AdvertisementCache] = Component('advertisement_cache')
@@ -0,0 +1,107 @@
+"""Модуль содержит сброс кеша объявлений в памяти воркера по журналу изменений объявлений.
+
+Изменение объявления сбрасывает запись только в кеше воркера, обработавшего запрос.
+При кеше в памяти и нескольких воркерах каждый воркер периодически читает id измененных
+объявлений из журнала изменений и сбрасывает их в своем кеше, поэтому измененное другим
+воркером объявление отдается из кеша не дольше нескольких периодов чтения журнала.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.component import Component
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class AdvertisementCacheInvalidator(object):
+    """Периодический сброс измененных объявлений в кеше объявлений воркера."""
+
+    def __init__(self, change_storage: AdvertisementChangeStorage, interval_seconds: float):
+        """Создание сброса кеша.
+
+        Args:
+            change_storage (AdvertisementChangeStorage): хранилище журнала изменений объявлений
+            interval_seconds (float): период чтения журнала изменений
+        """
+        self._change_storage = change_storage
+        self._interval = interval_seconds
+        self._since: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Запустить периодический сброс в фоне."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Остановить периодический сброс."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass  # noqa: WPS420
+        self._task = None
+
+    async def poll(self) -> int:
+        """Сбросить в кеше объявления, измененные после предыдущего чтения журнала.
+
+        Первое чтение только запоминает текущий номер журнала: записи, сохраненные
+        в кеш до него, сбрасываются по ttl.
+
+        Returns:
+            int: количество сброшенных объявлений
+        """
+        async with create_session() as session:
+            ad_ids, since = await self._change_storage.get_changed_ids(
+                session=session,
+                since=self._since,
+                limit=BATCH_SIZE,
+            )
+        self._since = since
+        if ad_ids:
+            await advertisement_cache_component.get().invalidate(ad_ids)
+        return len(ad_ids)
+
+    async def _run(self):
+        while True:
+            try:
+                while await self.poll() == BATCH_SIZE:
+                    await asyncio.sleep(0)
+            except (SQLAlchemyError, OSError) as exception:
+                logger.warning('Чтение журнала изменений для сброса кеша не удалось: {0}'.format(
+                    exception,
+                ))
+            await asyncio.sleep(self._interval)
+
+
+def create_cache_invalidator() -> AdvertisementCacheInvalidator | None:
+    """Создать сброс кеша по настройкам advertisement_cache.
+
+    Сброс нужен только кешу в памяти при нескольких воркерах: общий кеш в redis
+    сбрасывается изменившим объявление воркером.
+
+    Returns:
+        AdvertisementCacheInvalidator | None: сброс кеша, None - сброс не нужен
+    """
+    if settings.advertisement_cache.backend != 'memory' or settings.service.worker_count == 1:
+        return None
+    return AdvertisementCacheInvalidator(
+        change_storage=AdvertisementChangeStorage(),
+        interval_seconds=settings.advertisement_cache.invalidation_interval_seconds,
+    )
+
+
+cache_invalidator_component: Component[AdvertisementCacheInvalidator] = Component(
+    'advertisement_cache_invalidator',
+)
@@ -0,0 +1,179 @@
+"""Модуль содержит хранилища для кеша: в памяти процесса и redis."""
+
+import logging
+from abc import ABC, abstractmethod
+
+from src.app.data_sources.caches.ttl_cache import CacheStats, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Базовый класс хранилища кеша.
+
+    Хранилище работает с сериализованными значениями, ошибки хранилища
+    не должны прерывать запрос и трактуются как промах.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Получить значение.
+
+        Args:
+            key (str): ключ
+        """
+
+    @abstractmethod
+    async def add(self, key: str, payload: bytes, ttl_seconds: float):
+        """Сохранить значение, если записи с таким ключом нет.
+
+        Args:
+            key (str): ключ
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записи
+        """
+
+    @abstractmethod
+    async def set_many(self, keys: list[str], payload: bytes, ttl_seconds: float):
+        """Сохранить одно значение по нескольким ключам, заменив существующие записи.
+
+        Args:
+            keys (list[str]): ключи
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записей
+        """
+
+    def stats(self) -> CacheStats | None:  # noqa: WPS324
+        """Получить статистику хранилища, если оно ее ведет.
+
+        Returns:
+            CacheStats | None: статистика хранилища
+        """
+        return None  # noqa: WPS324
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Хранилище кеша в памяти процесса (LRU с временем жизни записей)."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Создание хранилища.
+
+        Args:
+            max_size (int): максимальное количество записей
+            ttl_seconds (float): время жизни записи по умолчанию
+        """
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> bytes | None:
+        """Получить значение.
+
+        Args:
+            key (str): ключ
+
+        Returns:
+            bytes | None: значение или None при промахе
+        """
+        return self._cache.get(key)
+
+    async def add(self, key: str, payload: bytes, ttl_seconds: float):
+        """Сохранить значение, если записи с таким ключом нет.
+
+        Args:
+            key (str): ключ
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записи
+        """
+        self._cache.add(key, payload, ttl_seconds=ttl_seconds)
+
+    async def set_many(self, keys: list[str], payload: bytes, ttl_seconds: float):
+        """Сохранить одно значение по нескольким ключам, заменив существующие записи.
+
+        Args:
+            keys (list[str]): ключи
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записей
+        """
+        for key in keys:
+            self._cache.set(key, payload, ttl_seconds=ttl_seconds)
+
+    def stats(self) -> CacheStats:
+        """Получить статистику хранилища.
+
+        Returns:
+            CacheStats: статистика LRU кеша
+        """
+        return self._cache.stats()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Хранилище кеша в redis (или совместимом по протоколу сервере).
+
+    Требует установленного пакета redis (`poetry install -E redis`).
+    """
+
+    def __init__(self, url: str):
+        """Создание хранилища.
+
+        Args:
+            url (str): адрес сервера, например redis://localhost:6379/0
+
+        Raises:
+            RuntimeError: пакет redis не установлен
+        """
+        try:
+            from redis import asyncio as redis_asyncio  # noqa: WPS433
+        except ImportError:
+            raise RuntimeError('Для хранилища кеша redis требуется пакет redis')
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._errors = (redis_asyncio.RedisError, OSError)
+
+    async def get(self, key: str) -> bytes | None:
+        """Получить значение.
+
+        Args:
+            key (str): ключ
+
+        Returns:
+            bytes | None: значение или None при промахе или недоступности redis
+        """
+        try:
+            payload = await self._client.get(key)
+        except self._errors as exception:
+            logger.warning('Ошибка чтения из redis: {0}'.format(exception))
+            payload = None
+        return payload
+
+    async def add(self, key: str, payload: bytes, ttl_seconds: float):
+        """Сохранить значение, если записи с таким ключом нет (SET NX).
+
+        Args:
+            key (str): ключ
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записи
+        """
+        try:
+            await self._client.set(key, payload, px=_milliseconds(ttl_seconds), nx=True)
+        except self._errors as exception:
+            logger.warning('Ошибка записи в redis: {0}'.format(exception))
+
+    async def set_many(self, keys: list[str], payload: bytes, ttl_seconds: float):
+        """Сохранить одно значение по нескольким ключам одним конвейером команд.
+
+        Args:
+            keys (list[str]): ключи
+            payload (bytes): сериализованное значение
+            ttl_seconds (float): время жизни записей
+        """
+        if not keys:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.set(key, payload, px=_milliseconds(ttl_seconds))
+                await pipeline.execute()
+        except self._errors as exception:
+            logger.warning('Ошибка записи в redis: {0}'.format(exception))
+
+
+def _milliseconds(seconds: float) -> int:
+    return int(seconds * 1000)  # noqa: WPS432
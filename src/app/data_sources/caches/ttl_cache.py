@@ -0,0 +1,118 @@
+"""Модуль содержит ограниченный по размеру кеш с временем жизни записей."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Hashable
+
+
+@dataclass
+class CacheStats(object):
+    """Статистика кеша."""
+
+    max_size: int
+    ttl_seconds: float
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class TTLCache(object):
+    """LRU кеш в памяти процесса с временем жизни записей.
+
+    Кеш не потокобезопасен и рассчитан на использование из одного цикла событий.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Создание кеша.
+
+        Args:
+            max_size (int): максимальное количество записей
+            ttl_seconds (float): время жизни записи в секундах
+        """
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получить значение по ключу.
+
+        Args:
+            key (Hashable): ключ
+            default (Any): значение, возвращаемое при отсутствии записи
+
+        Returns:
+            Any: значение или default, если записи нет или ее время жизни истекло
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                del self._entries[key]  # noqa: WPS420
+            self._misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, entry: Any, ttl_seconds: float | None = None):  # noqa: WPS125
+        """Сохранить значение.
+
+        Args:
+            key (Hashable): ключ
+            entry (Any): значение
+            ttl_seconds (float | None): время жизни записи, по умолчанию время жизни кеша
+        """
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (monotonic() + ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def add(self, key: Hashable, entry: Any, ttl_seconds: float | None = None) -> bool:
+        """Сохранить значение, если действующей записи с таким ключом нет.
+
+        Args:
+            key (Hashable): ключ
+            entry (Any): значение
+            ttl_seconds (float | None): время жизни записи, по умолчанию время жизни кеша
+
+        Returns:
+            bool: сохранено ли значение
+        """
+        existing = self._entries.get(key)
+        if existing is not None and existing[0] > monotonic():
+            return False
+        self.set(key, entry, ttl_seconds=ttl_seconds)
+        return True
+
+    def invalidate(self, key: Hashable):
+        """Удалить запись.
+
+        Args:
+            key (Hashable): ключ
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Удалить все записи."""
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Получить статистику кеша.
+
+        Returns:
+            CacheStats: статистика кеша
+        """
+        return CacheStats(
+            max_size=self._max_size,
+            ttl_seconds=self._ttl,
+            size=len(self._entries),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
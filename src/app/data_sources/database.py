@@ -0,0 +1,132 @@
+"""Модуль содержит создание движков основной бд и реплик с фабриками сессий."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext import asyncio as sa_asyncio
+
+from src.app.data_sources.pool_metrics import InstrumentedAsyncQueuePool
+from src.app.data_sources.query_metrics import instrument_engine
+from src.app.data_sources.replicas import ReplicaSelector, RoutingSession
+from src.config.config import settings
+
+
+class Database(object):
+    """Движки основной бд и реплик с фабриками сессий."""
+
+    def __init__(
+        self,
+        engine: sa_asyncio.AsyncEngine,
+        replica_engines: list[sa_asyncio.AsyncEngine] | None = None,
+    ):
+        """Создание фабрик сессий.
+
+        Args:
+            engine (AsyncEngine): движок основной бд
+            replica_engines (list[AsyncEngine] | None): движки реплик для чтения
+        """
+        self.engine = engine
+        self.replica_engines = replica_engines or []
+        self.session_factory = sa_asyncio.async_sessionmaker(
+            engine,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            replicas=ReplicaSelector(
+                engines=self.replica_engines,
+                selection=settings.postgres.replica_selection,
+            ) if self.replica_engines else None,
+        )
+        self.scoped_session = sa_asyncio.async_scoped_session(
+            self.session_factory,
+            scopefunc=asyncio.current_task,
+        )
+
+    @property
+    def engines(self) -> list[sa_asyncio.AsyncEngine]:
+        """Все движки: основной бд и реплик.
+
+        Returns:
+            list[AsyncEngine]: движки
+        """
+        return [self.engine, *self.replica_engines]
+
+
+def create_database() -> Database:
+    """Создать движки основной бд и реплик по настройкам postgres.
+
+    Returns:
+        Database: движки и фабрики сессий
+    """
+    return Database(
+        engine=_create_engine(settings.postgres.uri),
+        replica_engines=[_create_engine(replica_uri) for replica_uri in settings.postgres.replicas],
+    )
+
+
+@asynccontextmanager
+async def open_connections(
+    engine: sa_asyncio.AsyncEngine,
+    count: int,
+) -> AsyncIterator[list[sa_asyncio.AsyncConnection]]:
+    """Метод для одновременного открытия нескольких соединений пула.
+
+    Соединения удерживаются до выхода из контекста, поэтому пул
+    открывает count разных соединений, которые затем остаются в пуле.
+    Первое соединение открывается отдельно: при нем выполняется
+    инициализация диалекта, которую нельзя выполнять параллельно.
+
+    Args:
+        engine (AsyncEngine): движок
+        count (int): количество соединений
+
+    Если какое-то соединение открыть не удалось, открытые соединения закрываются
+    и пробрасывается первая ошибка.
+
+    Yields:
+        list[AsyncConnection]: открытые соединения
+    """
+    opened: list = []
+    if count > 0:
+        opened.append(await engine.connect().start())
+    opened.extend(await asyncio.gather(
+        *(engine.connect().start() for _ in range(count - 1)),
+        return_exceptions=True,
+    ))
+    connections = [
+        connection for connection in opened if not isinstance(connection, BaseException)
+    ]
+    errors = [error for error in opened if isinstance(error, BaseException)]
+    if errors:
+        await _close_all(connections)
+        _raise_first(errors)
+    try:  # noqa: WPS501
+        yield connections
+    finally:
+        await _close_all(connections)
+
+
+def _raise_first(errors: list[BaseException]):
+    raise errors[0]
+
+
+async def _close_all(connections: list[sa_asyncio.AsyncConnection]):
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+def _create_engine(url: str) -> sa_asyncio.AsyncEngine:
+    created_engine = sa_asyncio.create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.postgres.pool_size,
+        max_overflow=settings.postgres.max_overflow,
+        pool_timeout=settings.postgres.pool_timeout,
+        pool_recycle=settings.postgres.pool_recycle,
+        pool_pre_ping=settings.postgres.pool_pre_ping,
+        connect_args={
+            'statement_cache_size': settings.postgres.statement_cache_size,
+            'prepared_statement_cache_size': settings.postgres.statement_cache_size,
+        },
+    )
+    instrument_engine(created_engine)
+    return created_engine
@@ -0,0 +1,22 @@
+"""Модуль содержит конструкции запросов, зависящие от диалекта бд."""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DIALECT_INSERTS = {  # noqa: WPS407
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def dialect_insert(session: AsyncSession, table):
+    """Создать INSERT с поддержкой ON CONFLICT для диалекта сессии.
+
+    Args:
+        session: (AsyncSession): сессия подключения к бд
+        table: orm модель или таблица
+
+    Returns:
+        Insert: INSERT диалекта postgresql или sqlite
+    """
+    return DIALECT_INSERTS[session.bind.dialect.name](table)
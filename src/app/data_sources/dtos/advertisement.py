@@ -1,9 +1,17 @@
-"""Модуль содержит датакласс Advertisement."""
+"""Модуль содержит датаклассы Advertisement и AdvertisementOwner."""
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
 
-from src.app.data_sources.dtos.user import User
-from src.app.data_sources.models import AdvertisementAlchemyModel
+from sqlalchemy import Row
+
+
+@dataclass
+class AdvertisementOwner(object):
+    """Публичные данные владельца объявления."""
+
+    user_id: int
+    username: str
 
 
 @dataclass
@@ -15,23 +23,41 @@ class Advertisement(object):
     title: str
     price: int
     description: str
-    owner: User
+    updated_at: datetime
+    created_at: datetime
+    expires_at: datetime
+    owner: AdvertisementOwner
 
     @classmethod
-    def from_orm(cls, advertisement: AdvertisementAlchemyModel):
-        """Метод инициализации объявления на данных из бд.
+    def from_row(cls, row: Row):
+        """Метод инициализации объявления на строке выборки из бд.
 
         Args:
-            advertisement (AdvertisementAlchemyModel): запись объявления из бд
+            row (Row): строка с колонками объявления, owner_id и owner_username
 
         Returns:
-            advertisement: объявление
+            Advertisement: объявление
         """
         return cls(
-            id=advertisement.id,
-            category=advertisement.category,
-            title=advertisement.title,
-            price=advertisement.price,
-            description=advertisement.description,
-            owner=User.from_orm(advertisement.owner),
+            id=row.id,
+            category=row.category,
+            title=row.title,
+            price=row.price,
+            description=row.description,
+            updated_at=row.updated_at,
+            created_at=row.created_at,
+            expires_at=row.expires_at,
+            owner=AdvertisementOwner(user_id=row.owner_id, username=row.owner_username),
         )
+
+    def is_expired(self) -> bool:
+        """Проверить, истек ли срок жизни объявления.
+
+        Returns:
+            bool: срок жизни истек
+        """
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            # sqlite возвращает время без часового пояса, время в бд хранится в UTC
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at <= datetime.now(timezone.utc)
@@ -0,0 +1,19 @@
+"""Модуль содержит датакласс изменения объявления."""
+
+from dataclasses import dataclass
+
+from src.app.data_sources.dtos.advertisement import Advertisement
+
+
+@dataclass
+class AdvertisementChange(object):
+    """Изменение объявления: текущее состояние или отметка об удалении.
+
+    Объявления не изменяются после создания, поэтому текущее состояние
+    возвращается для созданного объявления и после смены имени владельца.
+    """
+
+    seq: int
+    ad_id: int
+    deleted: bool
+    advertisement: Advertisement | None
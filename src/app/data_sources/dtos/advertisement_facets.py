@@ -0,0 +1,29 @@
+"""Модуль содержит датаклассы фасетов объявлений."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class CategoryFacet(object):
+    """Количество объявлений в категории."""
+
+    category: str
+    count: int
+
+
+@dataclass
+class PriceBucketFacet(object):
+    """Количество объявлений в ценовом диапазоне [price_min, price_max)."""
+
+    price_min: int
+    price_max: int | None
+    count: int
+
+
+@dataclass
+class AdvertisementFacets(object):
+    """Фасеты объявлений: количества по категориям и гистограмма цен."""
+
+    total: int
+    categories: list[CategoryFacet]
+    price_buckets: list[PriceBucketFacet]
@@ -0,0 +1,16 @@
+"""Модуль содержит датакласс AdvertisementFilter."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AdvertisementFilter(object):
+    """Фильтр для выборки объявлений.
+
+    Все условия применяются на стороне бд, незаданные поля не участвуют в запросе.
+    """
+
+    category: str | None = None
+    price_min: int | None = None
+    price_max: int | None = None
+    owner_id: int | None = None
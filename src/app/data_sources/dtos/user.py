@@ -10,8 +10,9 @@ class User(object):
 
     user_id: int
     username: str
-    password_hash: str
+    password_hash: str | None
     is_admin: bool
+    token_version: int
 
     @classmethod
     def from_orm(cls, user: UserAlchemyModel):
@@ -28,4 +29,5 @@ class User(object):
             username=user.username,
             password_hash=user.password_hash,
             is_admin=user.is_admin,
+            token_version=user.token_version,
         )
@@ -1,3 +1,14 @@
 from src.app.data_sources.models.base import Base
 from src.app.data_sources.models.user import UserAlchemyModel
-from src.app.data_sources.models.advertisement import AdvertisementAlchemyModel
+from src.app.data_sources.models.advertisement import (
+    AdvertisementAlchemyModel,
+    AdvertisementIdAlchemyModel,
+)
+from src.app.data_sources.models.advertisement_facet import (
+    AdvertisementFacetAlchemyModel,
+    AdvertisementFacetExpiryAlchemyModel,
+)
+from src.app.data_sources.models.advertisement_change import (
+    AdvertisementChangeAlchemyModel,
+    AdvertisementChangeCounterAlchemyModel,
+)
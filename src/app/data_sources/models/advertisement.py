@@ -1,9 +1,13 @@
 """Модуль содержит orm модель объявления."""
-from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.schema import FetchedValue, Index
 
 from src.app.data_sources.models.base import Base
 
+SEARCH_CONFIG = 'russian'
+
 
 class AdvertisementAlchemyModel(Base):
     """Класс описывает orm модель объявления.
@@ -13,12 +17,55 @@ class AdvertisementAlchemyModel(Base):
     """
 
     __tablename__ = 'advertisements'
+    __table_args__ = (
+        Index('ix_advertisements_category_id', 'category', 'id'),
+        Index('ix_advertisements_category_price', 'category', 'price'),
+        Index('ix_advertisements_owner_id_id', 'owner_id', 'id'),
+        Index('ix_advertisements_price', 'price'),
+        Index('ix_advertisements_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
+    # на postgres таблица секционирована по expires_at, первичный ключ - (id, expires_at),
+    # id выдается последовательностью advertisements_id_seq (см. миграцию 00009),
+    # уникальность id обеспечивает таблица advertisement_ids
     id = Column(BigInteger, primary_key=True)
     category = Column(String(length=50), nullable=False)  # noqa: WPS432
     owner_id = Column(BigInteger, ForeignKey('users.id'))
     title = Column(String(length=200), nullable=False)  # noqa: WPS432
     price = Column(Integer, nullable=False)
     description = Column(String(length=1000))
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # после expires_at объявление не показывается, затем архивируется (см. AdvertisementArchiver)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # генерируемая колонка postgres (см. миграцию 00004), на sqlite остается пустой
+    search_vector = deferred(Column(
+        TSVECTOR().with_variant(Text(), 'sqlite'),
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    ))
 
     owner = relationship('UserAlchemyModel', back_populates='advertisements')
+
+
+class AdvertisementIdAlchemyModel(Base):
+    """Класс описывает id и expires_at объявления.
+
+    Первичный ключ секционированной таблицы объявлений включает expires_at
+    и не гарантирует уникальность id, ее гарантирует первичный ключ этой таблицы.
+    По expires_at из этой таблицы запрос объявления по id читает только одну секцию.
+    Строка добавляется и удаляется в транзакции создания и удаления объявления.
+
+    Args:
+        Base (DeclarativeMeta): базовая orm модель
+    """
+
+    __tablename__ = 'advertisement_ids'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
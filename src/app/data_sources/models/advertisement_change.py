@@ -0,0 +1,57 @@
+"""Модуль содержит orm модели журнала изменений объявлений."""
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, func
+
+from src.app.data_sources.models.base import Base
+
+CHANGE_COUNTER_ID = 1
+# последовательность номеров изменений на postgres (см. миграцию 00012)
+CHANGE_SEQUENCE = 'advertisement_change_seq'
+
+
+class AdvertisementChangeAlchemyModel(Base):
+    """Класс описывает последнее изменение объявления.
+
+    Для каждого объявления хранится только последнее изменение, поэтому чтение
+    журнала с номера since возвращает каждое измененное объявление один раз.
+    Удаленное объявление остается в журнале записью с deleted (tombstone).
+
+    Args:
+        Base (DeclarativeMeta): базовая orm модель
+    """
+
+    __tablename__ = 'advertisement_changes'
+
+    ad_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    seq = Column(BigInteger, nullable=False, unique=True)
+    deleted = Column(Boolean, nullable=False)
+    # expires_at объявления для соединения с секционированной таблицей объявлений
+    # по первичному ключу
+    expires_at = Column(DateTime(timezone=True))
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class AdvertisementChangeCounterAlchemyModel(Base):
+    """Класс описывает состояние нумерации изменений объявлений.
+
+    Таблица содержит одну строку. На postgres номера выделяются последовательностью
+    advertisement_change_seq и могут стать видимыми не в порядке номеров, поэтому
+    читатели журнала получают изменения только до safe_seq. На остальных бд
+    номера выделяются из last_seq под блокировкой строки до конца транзакции.
+
+    Args:
+        Base (DeclarativeMeta): базовая orm модель
+    """
+
+    __tablename__ = 'advertisement_change_counter'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    # номер последнего изменения на бд без последовательностей
+    last_seq = Column(BigInteger, nullable=False)
+    # наибольший номер удаленной отметки об удалении,
+    # чтение с меньшего номера может пропустить удаление
+    purged_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
+    # все изменения с номером не больше safe_seq зафиксированы или отменены
+    safe_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
+    # pending_seq становится safe_seq, когда завершатся все транзакции с xid меньше pending_xmax
+    pending_seq = Column(BigInteger, nullable=False, default=0)
+    pending_xmax = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,74 @@
+"""Модуль содержит orm модель сводной таблицы фасетов объявлений."""
+from bisect import bisect_right
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, case
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.app.data_sources.models.base import Base
+
+# Нижние границы ценовых диапазонов. После изменения границ
+# сводную таблицу нужно пересобрать (python -m src.app.rebuild_facets).
+PRICE_BUCKETS = (0, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+FACET_EXPIRY_ID = 1
+
+
+def price_bucket(price: int) -> int:
+    """Получить нижнюю границу ценового диапазона.
+
+    Args:
+        price (int): стоимость
+
+    Returns:
+        int: нижняя граница диапазона, в который попадает стоимость
+    """
+    return PRICE_BUCKETS[max(bisect_right(PRICE_BUCKETS, price) - 1, 0)]
+
+
+def price_bucket_expression(price: ColumnElement) -> ColumnElement:
+    """Получить sql выражение нижней границы ценового диапазона.
+
+    Args:
+        price (ColumnElement): колонка стоимости
+
+    Returns:
+        ColumnElement: выражение CASE, вычисляющее то же, что и price_bucket
+    """
+    return case(
+        *((price >= bound, bound) for bound in reversed(PRICE_BUCKETS[1:])),
+        else_=PRICE_BUCKETS[0],
+    )
+
+
+class AdvertisementFacetAlchemyModel(Base):
+    """Класс описывает количество объявлений в категории и ценовом диапазоне.
+
+    Учитываются только действующие объявления: строки обновляются в транзакциях
+    создания и удаления объявлений, истекшие объявления вычитаются периодически
+    (см. AdvertisementFacetStorage.expire).
+
+    Args:
+        Base (DeclarativeMeta): базовая orm модель
+    """
+
+    __tablename__ = 'advertisement_facets'
+
+    category = Column(String(length=50), primary_key=True)  # noqa: WPS432
+    price_bucket = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+
+class AdvertisementFacetExpiryAlchemyModel(Base):
+    """Класс описывает время, до которого истекшие объявления вычтены из фасетов.
+
+    Таблица содержит одну строку. Объявление, срок жизни которого истек
+    не позже expired_until, уже не учитывается в счетчиках фасетов.
+
+    Args:
+        Base (DeclarativeMeta): базовая orm модель
+    """
+
+    __tablename__ = 'advertisement_facet_expiry'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    # None - истекшие объявления еще не вычитались
+    expired_until = Column(DateTime(timezone=True))
@@ -1,5 +1,5 @@
 """Модуль содержит orm модель пользователя."""
-from sqlalchemy import BigInteger, Boolean, Column, String
+from sqlalchemy import BigInteger, Boolean, Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.app.data_sources.models.base import Base
@@ -18,5 +18,6 @@ class UserAlchemyModel(Base):
     username = Column(String(length=100), index=True, nullable=False, unique=True)
     password_hash = Column(String(length=60), nullable=False)
     is_admin = Column(Boolean, nullable=False)
+    token_version = Column(Integer, nullable=False, default=0, server_default='0')
 
     advertisements = relationship('AdvertisementAlchemyModel', back_populates='owner')
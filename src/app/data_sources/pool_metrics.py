@@ -0,0 +1,73 @@
+"""Модуль содержит пул соединений с бд, собирающий статистику ожидания соединений."""
+
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats(object):
+    """Статистика пула соединений."""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+    overflow_events: int
+    timeouts: int
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, измеряющий время получения соединения.
+
+    Время ожидания включает ожидание свободного соединения и открытие нового,
+    если пул еще не заполнен. Событие переполнения фиксируется при открытии
+    соединения сверх pool_size.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._total_wait: float = 0
+        self._max_wait: float = 0
+        self._overflow_events = 0
+        self._timeouts = 0
+
+    def stats(self) -> PoolStats:
+        """Получить статистику пула.
+
+        Returns:
+            PoolStats: статистика пула
+        """
+        return PoolStats(
+            size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            checkouts=self._checkouts,
+            total_wait_seconds=self._total_wait,
+            max_wait_seconds=self._max_wait,
+            overflow_events=self._overflow_events,
+            timeouts=self._timeouts,
+        )
+
+    def _do_get(self):
+        overflow_before = self.overflow()
+        started_at = perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        wait = perf_counter() - started_at
+        self._checkouts += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        if self.overflow() > max(overflow_before, 0):
+            self._overflow_events += 1
+        return connection
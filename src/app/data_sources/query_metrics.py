@@ -0,0 +1,140 @@
+"""Модуль содержит метрики времени выполнения запросов к бд.
+
+Время запроса измеряется обработчиками событий before_cursor_execute и
+after_cursor_execute движка, метка метода хранилища передается через
+контекстную переменную, которую выставляют методы хранилищ. Запросы дольше
+порога дополнительно записываются в журнал медленных запросов.
+"""
+
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from inspect import getmembers, isasyncgenfunction, iscoroutinefunction, isfunction
+from time import perf_counter
+from typing import TypeVar
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.app.data_sources.slow_queries import slow_query_log_component
+
+UNKNOWN_METHOD = 'unknown'
+
+_StorageType = TypeVar('_StorageType', bound=type)
+_STARTED_AT_KEY = 'query_metrics_started_at'
+_EXHAUSTED = object()
+
+storage_method: ContextVar[str] = ContextVar('storage_method', default=UNKNOWN_METHOD)
+
+db_query_duration = Histogram(
+    'db_query_duration_seconds',
+    'Время выполнения запроса к бд',
+    ['method'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Подключить сбор времени выполнения запросов к движку.
+
+    Args:
+        engine (AsyncEngine): движок бд
+    """
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine.sync_engine, 'handle_error', _handle_error)
+
+
+def instrument_storage(storage_class: _StorageType) -> _StorageType:
+    """Декоратор класса хранилища, помечающий запросы его публичных методов.
+
+    Запросы, выполненные внутри метода, получают метку вида
+    `AdvertisementStorage.get_all`. При вложенных вызовах используется
+    метка самого внутреннего метода.
+
+    Args:
+        storage_class (_StorageType): класс хранилища
+
+    Returns:
+        _StorageType: тот же класс с обернутыми методами
+    """
+    for name, method in getmembers(storage_class, isfunction):
+        if name.startswith('_'):
+            continue
+        label = '{0}.{1}'.format(storage_class.__name__, name)
+        if isasyncgenfunction(method):
+            setattr(storage_class, name, _label_async_generator(method, label))
+        elif iscoroutinefunction(method):
+            setattr(storage_class, name, _label_coroutine(method, label))
+    return storage_class
+
+
+def _label_coroutine(method, label: str):
+    @wraps(method)
+    async def wrapper(*args, **kwargs):  # noqa: WPS430
+        token = storage_method.set(label)
+        try:  # noqa: WPS501
+            return await method(*args, **kwargs)
+        finally:
+            storage_method.reset(token)
+    return wrapper
+
+
+def _label_async_generator(method, label: str):
+    @wraps(method)
+    async def wrapper(*args, **kwargs):  # noqa: WPS430
+        # Метка выставляется только на время получения очередного элемента,
+        # так как между элементами генератора выполняется код вызывающей стороны.
+        generator = method(*args, **kwargs)
+        try:  # noqa: WPS501
+            while True:
+                element = await _next_labeled(generator, label)
+                if element is _EXHAUSTED:
+                    return
+                yield element
+        finally:
+            await generator.aclose()
+    return wrapper
+
+
+async def _next_labeled(generator, label: str):
+    token = storage_method.set(label)
+    try:
+        return await anext(generator)
+    except StopAsyncIteration:
+        return _EXHAUSTED
+    finally:
+        storage_method.reset(token)
+
+
+@lru_cache(maxsize=None)
+def _duration_histogram(method: str):
+    return db_query_duration.labels(method)
+
+
+def _before_cursor_execute(conn, cursor, statement, query_parameters, context, executemany):
+    conn.info.setdefault(_STARTED_AT_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, query_parameters, context, executemany):
+    duration = perf_counter() - conn.info[_STARTED_AT_KEY].pop()
+    method = storage_method.get()
+    _duration_histogram(method).observe(duration)
+    slow_query_log = slow_query_log_component.peek()
+    if slow_query_log is not None:
+        slow_query_log.observe(
+            conn,
+            statement,
+            query_parameters,
+            context,
+            executemany,
+            duration,
+            method,
+        )
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute не вызывается для запроса с ошибкой.
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_STARTED_AT_KEY):
+        connection.info[_STARTED_AT_KEY].pop()
@@ -0,0 +1,101 @@
+"""Модуль содержит маршрутизацию запросов на чтение между репликами бд."""
+
+from itertools import cycle
+from typing import Literal
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_ONLY_KEY = 'read_only'
+HAS_WRITES_KEY = 'has_writes'
+REPLICA_KEY = 'replica'
+
+ReplicaSelection = Literal['round_robin', 'least_connections']
+
+
+class ReplicaSelector(object):
+    """Выбор реплики для очередной сессии."""
+
+    def __init__(self, engines: list[AsyncEngine], selection: ReplicaSelection):
+        """Создание селектора.
+
+        round_robin выбирает реплики по кругу, least_connections - реплику
+        с наименьшим числом выданных соединений пула.
+
+        Args:
+            engines (list[AsyncEngine]): движки реплик
+            selection (ReplicaSelection): round_robin или least_connections
+        """
+        self.engines = engines
+        self._selection = selection
+        self._round_robin = cycle(engines)
+
+    def select(self) -> AsyncEngine | None:
+        """Выбрать реплику.
+
+        Returns:
+            AsyncEngine | None: движок реплики или None, если реплики не настроены
+        """
+        if not self.engines:
+            return None
+        if self._selection == 'least_connections':
+            return min(self.engines, key=lambda engine: engine.pool.checkedout())
+        return next(self._round_robin)
+
+
+class RoutingSession(Session):
+    """Сессия, выполняющая чтение на реплике, если сессия помечена как read_only.
+
+    Запись, а также любые запросы после первой записи в сессии выполняются
+    на основной бд, чтобы запрос видел собственные изменения. Записью считаются
+    выражения INSERT/UPDATE/DELETE и сброс изменений orm (событие before_flush),
+    обе отмечаются флагом has_writes в info сессии. Реплика выбирается
+    один раз на сессию, поэтому все чтения запроса видят одно состояние реплики.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSelector | None = None, **kwargs):
+        """Создание сессии.
+
+        Args:
+            args: аргументы Session
+            replicas (ReplicaSelector | None): селектор реплик
+            kwargs: именованные аргументы Session
+        """
+        super().__init__(*args, **kwargs)
+        self._replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        """Выбрать движок для запроса.
+
+        Args:
+            mapper: orm модель запроса
+            clause: выражение запроса
+            kwargs: остальные аргументы Session.get_bind
+
+        Returns:
+            Engine: движок реплики или основной бд
+        """
+        if isinstance(clause, UpdateBase):
+            mark_writes(self)
+        read_only = self.info.get(READ_ONLY_KEY) and not self.info.get(HAS_WRITES_KEY)
+        if self._replicas and read_only:
+            if REPLICA_KEY not in self.info:
+                self.info[REPLICA_KEY] = self._replicas.select()
+            return self.info[REPLICA_KEY].sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def mark_writes(session: Session):
+    """Отметить, что в сессии выполнялась запись, все дальнейшие запросы идут на основную бд.
+
+    Args:
+        session (Session): сессия подключения к бд
+    """
+    session.info[HAS_WRITES_KEY] = True
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _mark_flush_writes(session: Session, flush_context, instances):
+    mark_writes(session)
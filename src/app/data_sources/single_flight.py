@@ -0,0 +1,120 @@
+"""Модуль содержит объединение одинаковых параллельных запросов на чтение (single flight)."""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from prometheus_client import Counter
+
+from src.config.config import settings
+
+_ResultType = TypeVar('_ResultType')
+
+single_flight_requests = Counter(
+    'single_flight_requests',
+    ' '.join((
+        'Количество чтений через single flight: leader - выполнил запрос к бд,',
+        'coalesced - получил результат чужого запроса, fallback - не дождался и выполнил свой',
+    )),
+    ['name', 'outcome'],
+)
+
+
+class _LeaderCancelledError(Exception):
+    """Запрос, выполнявший чтение для остальных, был отменен."""
+
+
+class SingleFlight(object):
+    """Объединение одинаковых параллельных чтений в пределах воркера.
+
+    Первый запрос с ключом выполняет чтение, запросы с тем же ключом, пришедшие
+    до его завершения, получают тот же результат или ту же ошибку. Ожидание
+    ограничено: по истечении wait_timeout_seconds или при отмене первого запроса
+    ожидающий выполняет чтение сам. Результат разделяется между запросами,
+    поэтому изменять его нельзя.
+    """
+
+    def __init__(self, name: str, wait_timeout_seconds: float, enabled: bool = True):
+        """Создание объединения чтений.
+
+        Args:
+            name (str): имя для метрик
+            wait_timeout_seconds (float): максимальное время ожидания чужого чтения
+            enabled (bool): объединять чтения, иначе каждое чтение выполняется отдельно
+        """
+        self._wait_timeout = wait_timeout_seconds
+        self._enabled = enabled
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._leader = single_flight_requests.labels(name, 'leader')
+        self._coalesced = single_flight_requests.labels(name, 'coalesced')
+        self._fallback = single_flight_requests.labels(name, 'fallback')
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[_ResultType]]) -> _ResultType:
+        """Выполнить чтение или дождаться результата такого же чтения.
+
+        Args:
+            key (Hashable): ключ чтения, одинаковый для одинаковых запросов
+            call (Callable[[], Awaitable]): функция чтения
+
+        Returns:
+            _ResultType: результат чтения
+        """
+        if not self._enabled:
+            return await call()
+        shared = self._calls.get(key)
+        if shared is None:
+            return await self._lead(key, call)
+        try:
+            shared_result = await asyncio.wait_for(asyncio.shield(shared), self._wait_timeout)
+        except (asyncio.TimeoutError, _LeaderCancelledError):
+            self._fallback.inc()
+            return await call()
+        self._coalesced.inc()
+        return shared_result
+
+    def in_flight(self) -> int:
+        """Получить количество выполняемых чтений.
+
+        Returns:
+            int: количество ключей, по которым выполняется чтение
+        """
+        return len(self._calls)
+
+    async def _lead(self, key: Hashable, call: Callable[[], Awaitable[_ResultType]]) -> _ResultType:
+        shared = asyncio.get_running_loop().create_future()
+        # Ошибка без ожидающих не должна попадать в журнал как необработанная.
+        shared.add_done_callback(_retrieve_exception)
+        self._calls[key] = shared
+        self._leader.inc()
+        try:
+            call_result = await call()
+        except asyncio.CancelledError:
+            shared.set_exception(_LeaderCancelledError())
+            raise
+        except Exception as exception:
+            shared.set_exception(exception)
+            raise
+        finally:
+            self._calls.pop(key)
+        shared.set_result(call_result)
+        return call_result
+
+
+def _retrieve_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+def create_single_flight(name: str) -> SingleFlight:
+    """Создать объединение чтений по настройкам single_flight.
+
+    Args:
+        name (str): имя для метрик
+
+    Returns:
+        SingleFlight: объединение чтений
+    """
+    return SingleFlight(
+        name=name,
+        wait_timeout_seconds=settings.single_flight.wait_timeout_seconds,
+        enabled=settings.single_flight.enabled,
+    )
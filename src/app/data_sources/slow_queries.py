@@ -0,0 +1,218 @@
+"""Модуль содержит журнал медленных запросов к бд.
+
+Запросы дольше порога записываются в журнал воркера вместе с меткой метода
+хранилища, типами параметров (значения не сохраняются) и id HTTP запроса.
+Для части медленных запросов на postgres в фоне снимается план EXPLAIN
+на отдельном соединении.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from contextvars import Context, ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from prometheus_client import Counter
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.app.component import Component
+from src.config.config import settings
+
+MAX_PARAMETER_ROWS = 10
+PLAN_STATEMENT = 'slow_query_plan'
+# EXPLAIN без ANALYZE не выполняет запрос, поэтому план можно снять и для изменяющих запросов.
+EXPLAINABLE_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+logger = logging.getLogger(__name__)
+
+request_id: ContextVar[str | None] = ContextVar('request_id', default=None)
+_explaining: ContextVar[bool] = ContextVar('slow_query_explaining', default=False)
+
+db_slow_queries = Counter(
+    'db_slow_queries',
+    'Количество запросов к бд дольше порога журнала медленных запросов',
+    ['method'],
+)
+
+
+@dataclass
+class SlowQuery(object):
+    """Медленный запрос к бд."""
+
+    finished_at: datetime
+    duration_seconds: float
+    method: str
+    statement: str
+    parameter_types: list[dict[str, str]] | None
+    request_id: str | None
+    plan: str | None = None
+
+
+class SlowQueryLog(object):
+    """Журнал последних медленных запросов воркера.
+
+    Хранит не больше capacity запросов, старые вытесняются новыми. План снимается
+    не больше чем для одного запроса одновременно. Используется EXPLAIN без ANALYZE:
+    запрос не выполняется повторно, поэтому его побочные эффекты (например, вызовы
+    функций в SELECT) не повторяются. План строится общим (force_generic_plan),
+    поэтому значения параметров не попадают в его текст.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float,
+        capacity: int,
+        explain_sample_rate: float,
+        explain_timeout_ms: int,
+    ):
+        """Создание журнала.
+
+        Args:
+            threshold_seconds (float): минимальная длительность запроса для записи в журнал
+            capacity (int): количество хранимых запросов
+            explain_sample_rate (float): доля медленных запросов на postgres, для которых снят план
+            explain_timeout_ms (int): ограничение времени выполнения EXPLAIN
+        """
+        self._threshold = threshold_seconds
+        self._explain_sample_rate = explain_sample_rate
+        self._explain_timeout_ms = explain_timeout_ms
+        self._queries: deque[SlowQuery] = deque(maxlen=capacity)
+        self._explain: asyncio.Task | None = None
+
+    def observe(  # noqa: WPS211
+        self,
+        connection: Connection,
+        statement: str,
+        query_parameters,
+        context: ExecutionContext | None,
+        executemany: bool,
+        duration: float,
+        method: str,
+    ):
+        """Записать запрос в журнал, если он выполнялся дольше порога.
+
+        Args:
+            connection (Connection): соединение, на котором выполнен запрос
+            statement (str): текст запроса
+            query_parameters: параметры запроса в формате драйвера
+            context (ExecutionContext | None): контекст выполнения запроса
+            executemany (bool): запрос выполнен для нескольких наборов параметров
+            duration (float): длительность запроса в секундах
+            method (str): метка метода хранилища
+        """
+        if duration < self._threshold or _explaining.get():
+            return
+        query = SlowQuery(
+            finished_at=datetime.now(timezone.utc),
+            duration_seconds=duration,
+            method=method,
+            statement=statement,
+            parameter_types=_parameter_types(context),
+            request_id=request_id.get(),
+        )
+        self._queries.append(query)
+        db_slow_queries.labels(method).inc()
+        logger.warning('Медленный запрос {0}: {1:.3f} с, id запроса {2}, параметры {3}\n{4}'.format(
+            query.method,
+            query.duration_seconds,
+            query.request_id,
+            query.parameter_types,
+            query.statement,
+        ))
+        if not executemany and self._should_explain(connection, statement):
+            # План снимается вне контекста запроса, чтобы EXPLAIN не попал в метрики его метода.
+            self._explain = Context().run(
+                asyncio.get_running_loop().create_task,
+                self._capture_plan(AsyncEngine(connection.engine), query, query_parameters),
+            )
+
+    def recent(self) -> list[SlowQuery]:
+        """Получить медленные запросы из журнала.
+
+        Returns:
+            list[SlowQuery]: запросы, начиная с самого нового
+        """
+        return list(reversed(self._queries))
+
+    def _should_explain(self, connection: Connection, statement: str) -> bool:
+        if connection.dialect.name != 'postgresql':
+            return False
+        if not statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+            return False
+        if self._explain is not None and not self._explain.done():
+            return False
+        return random.random() < self._explain_sample_rate  # noqa: S311
+
+    async def _capture_plan(self, engine: AsyncEngine, query: SlowQuery, query_parameters):
+        _explaining.set(True)
+        try:
+            async with engine.connect() as connection:
+                # SET LOCAL действует до конца транзакции, она откатывается при закрытии соединения.
+                await connection.exec_driver_sql(
+                    'SET LOCAL statement_timeout = {0:d}'.format(self._explain_timeout_ms),
+                )
+                query.plan = await _generic_plan(connection, query.statement, len(query_parameters))
+        except SQLAlchemyError as exception:
+            logger.warning('Не удалось получить план медленного запроса {0}: {1}'.format(
+                query.method,
+                exception,
+            ))
+            return
+        logger.warning('План медленного запроса {0}, id запроса {1}:\n{2}'.format(
+            query.method,
+            query.request_id,
+            query.plan,
+        ))
+
+
+async def _generic_plan(connection, statement: str, parameters_count: int) -> str:
+    # Общий план строится без значений параметров, поэтому они не попадают в текст плана.
+    await connection.exec_driver_sql('SET LOCAL plan_cache_mode = force_generic_plan')
+    await connection.exec_driver_sql('PREPARE {0} AS {1}'.format(PLAN_STATEMENT, statement))
+    try:  # noqa: WPS501
+        plan_rows = await connection.exec_driver_sql('EXPLAIN EXECUTE {0}{1}'.format(
+            PLAN_STATEMENT,
+            _null_arguments(parameters_count),
+        ))
+    finally:
+        # Подготовленный запрос не откатывается вместе с транзакцией и удаляется явно.
+        await connection.rollback()
+        await connection.exec_driver_sql('DEALLOCATE {0}'.format(PLAN_STATEMENT))
+    return '\n'.join(row[0] for row in plan_rows)
+
+
+def _null_arguments(parameters_count: int) -> str:
+    if not parameters_count:
+        return ''
+    return '({0})'.format(', '.join('NULL' for _ in range(parameters_count)))
+
+
+def _parameter_types(context: ExecutionContext | None) -> list[dict[str, str]] | None:
+    # Значения параметров могут содержать персональные данные, в журнал попадают только типы.
+    if context is None or context.compiled is None:
+        return None
+    return [
+        {name: type(parameter).__name__ for name, parameter in row.items()}
+        for row in context.compiled_parameters[:MAX_PARAMETER_ROWS]
+    ]
+
+
+def create_slow_query_log() -> SlowQueryLog:
+    """Создать журнал медленных запросов по настройкам slow_queries.
+
+    Returns:
+        SlowQueryLog: журнал медленных запросов
+    """
+    return SlowQueryLog(
+        threshold_seconds=settings.slow_queries.threshold_ms / 1000,
+        capacity=settings.slow_queries.capacity,
+        explain_sample_rate=settings.slow_queries.explain_sample_rate,
+        explain_timeout_ms=settings.slow_queries.explain_timeout_ms,
+    )
+
+
+slow_query_log_component: Component[SlowQueryLog] = Component('slow_query_log')
@@ -0,0 +1,181 @@
+"""Модуль содержит фоновую архивацию объявлений с истекшим сроком жизни.
+
+Архиватор заранее создает секции таблицы объявлений на postgres и архивирует
+секции, срок жизни всех объявлений которых истек. Истекшие объявления вычитаются
+из счетчиков фасетов при каждом проходе, не дожидаясь архивации. Воркеры выполняют архивацию
+независимо, повторная работа исключается advisory блокировкой в хранилище.
+Также удаляются устаревшие отметки об удалении из журнала изменений объявлений.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.component import Component
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+from src.app.data_sources.storages.advertisement_partition_storage import (
+    AdvertisementPartitionStorage,
+)
+from src.config.config import settings
+
+_ResultType = TypeVar('_ResultType')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchiveResult(object):
+    """Результат прохода архивации."""
+
+    created_partitions: list[str]
+    expired_advertisements: int
+    archived_advertisements: int
+    purged_tombstones: int
+
+    def changed(self) -> bool:
+        """Проверить, изменил ли проход архивации что-либо.
+
+        Returns:
+            bool: созданы секции, вычтены из фасетов или архивированы объявления
+            или удалены отметки
+        """
+        return any((
+            self.created_partitions,
+            self.expired_advertisements,
+            self.archived_advertisements,
+            self.purged_tombstones,
+        ))
+
+
+class AdvertisementArchiver(object):
+    """Периодическая подготовка секций и архивация объявлений."""
+
+    def __init__(  # noqa: WPS211
+        self,
+        storage: AdvertisementPartitionStorage,
+        change_storage: AdvertisementChangeStorage,
+        facet_storage: AdvertisementFacetStorage,
+        lifetime_days: int,
+        archive_after_days: int,
+        premake_days: int,
+        interval_seconds: float,
+        lock_timeout_ms: int,
+        tombstone_retention_days: int,
+    ):
+        """Создание архиватора.
+
+        Args:
+            storage (AdvertisementPartitionStorage): хранилище секций объявлений
+            change_storage (AdvertisementChangeStorage): хранилище журнала изменений объявлений
+            facet_storage (AdvertisementFacetStorage): хранилище фасетов объявлений
+            lifetime_days (int): срок жизни объявления
+            archive_after_days (int): через сколько дней после истечения срока архивировать
+            premake_days (int): на сколько дней сверх срока жизни создаются секции
+            interval_seconds (float): период архивации
+            lock_timeout_ms (int): ограничение ожидания блокировки таблицы при отсоединении секции
+            tombstone_retention_days (int): сколько дней хранятся отметки об удалении в журнале
+        """
+        self._storage = storage
+        self._change_storage = change_storage
+        self._facet_storage = facet_storage
+        self._lifetime = timedelta(days=lifetime_days)
+        self._archive_after = timedelta(days=archive_after_days)
+        self._premake = timedelta(days=premake_days)
+        self._interval = interval_seconds
+        self._lock_timeout_ms = lock_timeout_ms
+        self._tombstone_retention = timedelta(days=tombstone_retention_days)
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Запустить периодическую архивацию в фоне."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Остановить периодическую архивацию."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass  # noqa: WPS420
+        self._task = None
+
+    async def archive(self) -> ArchiveResult:
+        """Создать секции, вычесть истекшие объявления из фасетов, архивировать и очистить журнал.
+
+        Каждый шаг выполняется в отдельной сессии.
+
+        Returns:
+            ArchiveResult: созданные секции, количество вычтенных и архивированных объявлений
+            и удаленных отметок
+        """
+        now = datetime.now(timezone.utc)
+        created_partitions = await _in_session(partial(
+            self._storage.prepare_partitions,
+            until=now + self._lifetime + self._premake,
+        ))
+        expired_count = await _in_session(partial(self._facet_storage.expire, until=now))
+        archived_count = await _in_session(partial(
+            self._storage.archive_expired,
+            before=now - self._archive_after,
+            lock_timeout_ms=self._lock_timeout_ms,
+        ))
+        purged_count = await _in_session(partial(
+            self._change_storage.purge_tombstones,
+            before=now - self._tombstone_retention,
+        ))
+        return ArchiveResult(
+            created_partitions=created_partitions,
+            expired_advertisements=expired_count,
+            archived_advertisements=archived_count,
+            purged_tombstones=purged_count,
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                archive_result = await self.archive()
+            except (SQLAlchemyError, OSError) as exception:
+                logger.warning('Архивация объявлений не удалась: {0}'.format(exception))
+            else:
+                if archive_result.changed():
+                    logger.info('Архивация объявлений: {0}'.format(archive_result))
+            await asyncio.sleep(self._interval)
+
+
+async def _in_session(call: Callable[[AsyncSession], Awaitable[_ResultType]]) -> _ResultType:
+    async with create_session() as session:
+        return await call(session)
+
+
+def create_archiver() -> AdvertisementArchiver:
+    """Создать архивацию объявлений по настройкам advertisement_lifecycle.
+
+    Returns:
+        AdvertisementArchiver: архивация объявлений
+    """
+    lifecycle = settings.advertisement_lifecycle
+    return AdvertisementArchiver(
+        storage=AdvertisementPartitionStorage(),
+        change_storage=AdvertisementChangeStorage(),
+        facet_storage=AdvertisementFacetStorage(),
+        lifetime_days=lifecycle.lifetime_days,
+        archive_after_days=lifecycle.archive_after_days,
+        premake_days=lifecycle.premake_days,
+        interval_seconds=lifecycle.archive_interval_seconds,
+        lock_timeout_ms=lifecycle.detach_lock_timeout_ms,
+        tombstone_retention_days=lifecycle.tombstone_retention_days,
+    )
+
+
+archiver_component: Component[AdvertisementArchiver] = Component('advertisement_archiver')
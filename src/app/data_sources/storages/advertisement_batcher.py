@@ -0,0 +1,166 @@
+"""Модуль содержит групповую запись объявлений (group commit).
+
+Одиночные объявления из параллельных запросов воркера накапливаются
+не дольше max_delay_ms или до max_rows штук и записываются одним
+многострочным INSERT с одним коммитом.
+"""
+
+import asyncio
+import logging
+
+from prometheus_client import Histogram
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.component import Component
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.advertisement_write_storage import AdvertisementWriteStorage
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+write_batch_size = Histogram(
+    'advertisement_write_batch_size',
+    'Количество объявлений, записанных одним коммитом групповой записи',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+
+
+class AdvertisementBatcher(object):
+    """Групповая запись объявлений.
+
+    Каждый ожидающий запрос получает id своего объявления или свою ошибку:
+    если многострочная запись не удалась, объявления пачки записываются по одному.
+    """
+
+    def __init__(self, storage: AdvertisementWriteStorage, max_delay_seconds: float, max_rows: int):
+        """Создание групповой записи.
+
+        Args:
+            storage (AdvertisementWriteStorage): хранилище изменений объявлений
+            max_delay_seconds (float): максимальное время накопления пачки
+            max_rows (int): максимальный размер пачки
+        """
+        self._storage = storage
+        self._max_delay = max_delay_seconds
+        self._max_rows = max_rows
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._writes: set[asyncio.Task] = set()
+
+    async def add(
+        self,
+        category: str,
+        owner_id: int,
+        title: str,
+        price: int,
+        description: str,
+    ) -> int:
+        """Создать объявление в составе ближайшей пачки.
+
+        Args:
+            category (str): категория объявления
+            owner_id (int): id владельца
+            title (str): заголовок
+            price (int): стоимость
+            description (str): описание
+
+        Returns:
+            int: id созданного объявления
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        row = {
+            'category': category,
+            'owner_id': owner_id,
+            'title': title,
+            'price': price,
+            'description': description,
+        }
+        self._pending.append((row, future))
+        if len(self._pending) >= self._max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    async def close(self):
+        """Записать накопленные объявления и дождаться завершения записи."""
+        self._flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        write_batch_size.observe(len(batch))
+        write = asyncio.create_task(self._write(batch))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[dict, asyncio.Future]]):
+        try:
+            ad_ids = await self._insert(batch)
+        except SQLAlchemyError as exception:
+            await self._write_one_by_one(batch, exception)
+            return
+        except Exception as exception:
+            # Задача записи не должна завершаться необработанной ошибкой:
+            # ошибка передается ожидающим запросам, следующие пачки пишутся как обычно.
+            logger.exception('Ошибка групповой записи объявлений')
+            for _, failed in batch:
+                _resolve(failed, exception=exception)
+            return
+        for (_, written), ad_id in zip(batch, ad_ids):
+            _resolve(written, ad_id=ad_id)
+
+    async def _insert(self, batch: list[tuple[dict, asyncio.Future]]) -> list[int]:
+        async with create_session() as session:
+            return await self._storage.add_rows(
+                session=session,
+                rows=[row for row, _ in batch],
+            )
+
+    async def _write_one_by_one(
+        self,
+        batch: list[tuple[dict, asyncio.Future]],
+        exception: SQLAlchemyError,
+    ):
+        if len(batch) == 1:
+            _resolve(batch[0][1], exception=exception)
+            return
+        logger.warning('Групповая запись объявлений не удалась, запись по одному: {0}'.format(
+            exception,
+        ))
+        for pending in batch:
+            await self._write([pending])
+
+
+def _resolve(future: asyncio.Future, ad_id: int | None = None, exception: Exception | None = None):
+    # Запрос мог быть отменен (например, клиент отключился), пока пачка записывалась.
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(ad_id)
+
+
+def create_batcher() -> AdvertisementBatcher:
+    """Создать групповую запись объявлений по настройкам advertisement_batching.
+
+    Returns:
+        AdvertisementBatcher: групповая запись объявлений
+    """
+    return AdvertisementBatcher(
+        storage=AdvertisementWriteStorage(),
+        max_delay_seconds=settings.advertisement_batching.max_delay_ms / 1000,
+        max_rows=settings.advertisement_batching.max_rows,
+    )
+
+
+batcher_component: Component[AdvertisementBatcher] = Component('advertisement_batcher')
@@ -0,0 +1,360 @@
+"""Модуль содержит класс AdvertisementChangeStorage."""
+
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import Select, and_, case, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import BigInteger, Text
+
+from src.app.data_sources.dialects import dialect_insert
+from src.app.data_sources.dtos.advertisement import Advertisement
+from src.app.data_sources.dtos.advertisement_change import AdvertisementChange
+from src.app.data_sources.models import (
+    AdvertisementAlchemyModel,
+    AdvertisementChangeAlchemyModel,
+    AdvertisementChangeCounterAlchemyModel,
+    UserAlchemyModel,
+)
+from src.app.data_sources.models.advertisement_change import CHANGE_COUNTER_ID, CHANGE_SEQUENCE
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.storages.advertisement_queries import RESPONSE_COLUMNS
+
+
+class ChangesPurgedError(Exception):
+    """Отметки об удалении после запрошенного номера уже удалены из журнала."""
+
+
+@instrument_storage
+class AdvertisementChangeStorage(object):
+    """Класс хранилища журнала изменений объявлений.
+
+    Изменения записываются в транзакции, изменяющей объявления, последним запросом
+    перед коммитом. На postgres номера выделяются последовательностью без блокировок,
+    поэтому транзакция с меньшим номером может зафиксироваться позже. Читатель журнала
+    получает изменения только до номера safe_seq, все изменения до которого
+    уже зафиксированы или отменены, и не может пропустить изменение с меньшим номером.
+    safe_seq периодически продвигает advance_safe_seq.
+    """
+
+    async def record(
+        self,
+        session: AsyncSession,
+        upserted: Iterable[tuple[int, datetime]] = (),
+        deleted: Iterable[int] = (),
+    ):
+        """Записать изменения объявлений, не фиксируя транзакцию.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            upserted (Iterable[tuple[int, datetime]]): id и expires_at новых и измененных объявлений
+            deleted (Iterable[int]): id удаленных объявлений
+        """
+        changes = _change_rows(upserted=upserted, deleted=deleted)
+        if not changes:
+            return
+        seqs = await _allocate(session=session, count=len(changes))
+        for seq, change in zip(seqs, changes):
+            change['seq'] = seq
+        statement = dialect_insert(session, AdvertisementChangeAlchemyModel)
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AdvertisementChangeAlchemyModel.ad_id],
+                set_={
+                    'seq': statement.excluded.seq,
+                    'deleted': statement.excluded.deleted,
+                    'expires_at': statement.excluded.expires_at,
+                    'changed_at': func.now(),
+                },
+            ),
+            changes,
+        )
+
+    async def record_owner(self, session: AsyncSession, owner_id: int):
+        """Записать изменение всех объявлений владельца, не фиксируя транзакцию.
+
+        Используется при изменении публичных данных владельца, которые входят в объявление.
+        Объявления не изменяются после создания, поэтому смена имени владельца -
+        единственный источник изменений уже созданных объявлений.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            owner_id (int): id владельца
+        """
+        advertisements = (await session.execute(
+            select(
+                AdvertisementAlchemyModel.id,
+                AdvertisementAlchemyModel.expires_at,
+            ).where(
+                AdvertisementAlchemyModel.owner_id == owner_id,
+            ).order_by(
+                AdvertisementAlchemyModel.id,
+            ),
+        )).tuples().all()
+        await self.record(session=session, upserted=advertisements)
+
+    async def discard(self, session: AsyncSession, ad_ids: Select | list[int]):
+        """Удалить из журнала изменения архивированных объявлений, не фиксируя транзакцию.
+
+        Отметки об удалении не затрагиваются. Истечение срока жизни не является
+        изменением: получатели журнала знают expires_at каждого объявления.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            ad_ids (Select | list[int]): id объявлений или запрос, выбирающий id
+        """
+        await session.execute(
+            delete(AdvertisementChangeAlchemyModel).where(
+                AdvertisementChangeAlchemyModel.ad_id.in_(ad_ids),
+                AdvertisementChangeAlchemyModel.deleted.is_(False),
+            ),
+        )
+
+    async def get_changes(
+        self,
+        session: AsyncSession,
+        since: int,
+        limit: int,
+    ) -> list[AdvertisementChange]:
+        """Получить изменения объявлений с номером больше since в порядке номеров.
+
+        Журнал хранит только последнее изменение каждого объявления, поэтому
+        объем чтения зависит от числа измененных объявлений, а не от размера каталога.
+        Объявления с истекшим сроком возвращаются до архивации, срок передается в expires_at.
+        На postgres возвращаются только изменения с номером не больше safe_seq.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            since (int): номер последнего полученного изменения
+            limit (int): максимальное количество изменений
+
+        Raises:
+            ChangesPurgedError: отметки об удалении после since уже удалены из журнала
+
+        Returns:
+            list[AdvertisementChange]: изменения объявлений
+        """
+        safe_seq = await _get_safe_seq(session)
+        rows = (await session.execute(
+            _changes_query(since=since, limit=limit, until=safe_seq),
+        )).all()
+        # Номер удаленных отметок проверяется после чтения:
+        # очистка, завершившаяся до проверки, будет замечена.
+        if since < await self.get_purged_seq(session=session):
+            raise ChangesPurgedError(
+                'Журнал изменений очищен после указанного номера, нужна полная синхронизация',
+            )
+        return [
+            AdvertisementChange(
+                seq=row.seq,
+                ad_id=row.ad_id,
+                deleted=row.deleted,
+                advertisement=None if row.id is None else Advertisement.from_row(row),
+            )
+            for row in rows
+        ]
+
+    async def get_changed_ids(
+        self,
+        session: AsyncSession,
+        since: int | None,
+        limit: int,
+    ) -> tuple[list[int], int]:
+        """Получить id объявлений, измененных после since, без чтения самих объявлений.
+
+        Используется для сброса кеша объявлений в памяти других воркеров.
+        Как и get_changes, на postgres возвращает только изменения до safe_seq.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            since (int | None): номер последнего учтенного изменения, None - получить только номер
+            limit (int): максимальное количество изменений
+
+        Returns:
+            tuple[list[int], int]: id измененных объявлений и номер последнего из них
+            (since, если изменений нет)
+        """
+        safe_seq = await _get_safe_seq(session)
+        if since is None:
+            if safe_seq is not None:
+                return [], safe_seq
+            last_seq = (await session.execute(
+                select(func.max(AdvertisementChangeAlchemyModel.seq)),
+            )).scalar()
+            return [], last_seq or 0
+        changes = select(
+            AdvertisementChangeAlchemyModel.seq,
+            AdvertisementChangeAlchemyModel.ad_id,
+        ).where(
+            AdvertisementChangeAlchemyModel.seq > since,
+        )
+        if safe_seq is not None:
+            changes = changes.where(AdvertisementChangeAlchemyModel.seq <= safe_seq)
+        rows = (await session.execute(
+            changes.order_by(AdvertisementChangeAlchemyModel.seq).limit(limit),
+        )).all()
+        if not rows:
+            return [], since
+        return [row.ad_id for row in rows], rows[-1].seq
+
+    async def get_purged_seq(self, session: AsyncSession) -> int:
+        """Получить наибольший номер удаленной из журнала отметки об удалении.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+
+        Returns:
+            int: номер, чтение журнала с меньшего номера может пропустить удаления
+        """
+        purged_seq = (await session.execute(
+            select(AdvertisementChangeCounterAlchemyModel.purged_seq).where(
+                AdvertisementChangeCounterAlchemyModel.id == CHANGE_COUNTER_ID,
+            ),
+        )).scalar()
+        return purged_seq or 0
+
+    async def purge_tombstones(self, session: AsyncSession, before: datetime) -> int:
+        """Удалить отметки об удалении, записанные до before.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            before (datetime): время, до которого записаны удаляемые отметки
+
+        Returns:
+            int: количество удаленных отметок
+        """
+        purged = (await session.execute(
+            delete(AdvertisementChangeAlchemyModel).where(
+                AdvertisementChangeAlchemyModel.deleted.is_(True),
+                AdvertisementChangeAlchemyModel.changed_at < before,
+            ).returning(
+                AdvertisementChangeAlchemyModel.seq,
+            ),
+        )).scalars().all()
+        if purged:
+            purged_seq = AdvertisementChangeCounterAlchemyModel.purged_seq
+            max_purged = max(purged)
+            await session.execute(
+                update(AdvertisementChangeCounterAlchemyModel).where(
+                    AdvertisementChangeCounterAlchemyModel.id == CHANGE_COUNTER_ID,
+                ).values(
+                    purged_seq=case((purged_seq < max_purged, max_purged), else_=purged_seq),
+                ),
+            )
+        await session.commit()
+        return len(purged)
+
+    async def advance_safe_seq(self, session: AsyncSession) -> int | None:
+        """Продвинуть номер, до которого изменения видны читателям журнала.
+
+        Запоминается последний выделенный номер и xmax текущего снимка: номера
+        до него выделены транзакциями с меньшим xid, так как номера выделяются после
+        изменения объявлений. Когда xmin снимка достигнет запомненного xmax, эти
+        транзакции завершены, и запомненный номер становится safe_seq.
+        На бд без последовательностей ничего не делает.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+
+        Returns:
+            int | None: новый safe_seq, None - safe_seq не изменился
+        """
+        if session.bind.dialect.name != 'postgresql':
+            return None
+        # Номер читается отдельным запросом до снимка, в котором вычисляется xmax.
+        last_seq = (await session.execute(
+            select(func.pg_sequence_last_value(cast(CHANGE_SEQUENCE, REGCLASS))),
+        )).scalar()
+        counter = AdvertisementChangeCounterAlchemyModel
+        safe_seq = (await session.execute(
+            update(counter).where(
+                counter.id == CHANGE_COUNTER_ID,
+                _snapshot_xid(func.pg_snapshot_xmin) >= counter.pending_xmax,
+            ).values(
+                safe_seq=counter.pending_seq,
+                pending_seq=counter.pending_seq if last_seq is None else last_seq,
+                pending_xmax=_snapshot_xid(func.pg_snapshot_xmax),
+            ).returning(
+                counter.safe_seq,
+            ),
+        )).scalar()
+        await session.commit()
+        return safe_seq
+
+
+async def _allocate(session: AsyncSession, count: int) -> list[int]:
+    if session.bind.dialect.name == 'postgresql':
+        return (await session.execute(
+            select(
+                func.nextval(CHANGE_SEQUENCE),
+            ).select_from(
+                func.generate_series(1, count),
+            ),
+        )).scalars().all()
+    statement = dialect_insert(session, AdvertisementChangeCounterAlchemyModel)
+    last_seq = AdvertisementChangeCounterAlchemyModel.last_seq
+    allocated_last_seq = (await session.execute(
+        statement.values(
+            id=CHANGE_COUNTER_ID,
+            last_seq=count,
+        ).on_conflict_do_update(
+            index_elements=[AdvertisementChangeCounterAlchemyModel.id],
+            set_={'last_seq': last_seq + statement.excluded.last_seq},
+        ).returning(
+            last_seq,
+        ),
+    )).scalar_one()
+    return list(range(allocated_last_seq - count + 1, allocated_last_seq + 1))
+
+
+def _change_rows(upserted: Iterable[tuple[int, datetime]], deleted: Iterable[int]) -> list:
+    changes = [
+        {'ad_id': ad_id, 'deleted': False, 'expires_at': expires_at}
+        for ad_id, expires_at in upserted
+    ]
+    changes.extend({'ad_id': ad_id, 'deleted': True, 'expires_at': None} for ad_id in deleted)
+    return changes
+
+
+async def _get_safe_seq(session: AsyncSession) -> int | None:
+    if session.bind.dialect.name != 'postgresql':
+        return None
+    safe_seq = (await session.execute(
+        select(AdvertisementChangeCounterAlchemyModel.safe_seq).where(
+            AdvertisementChangeCounterAlchemyModel.id == CHANGE_COUNTER_ID,
+        ),
+    )).scalar()
+    return safe_seq or 0
+
+
+def _snapshot_xid(snapshot_function):
+    # xid8 не приводится к bigint напрямую
+    return cast(cast(snapshot_function(func.pg_current_snapshot()), Text), BigInteger)
+
+
+def _changes_query(since: int, limit: int, until: int | None) -> Select:
+    current_advertisement = and_(
+        AdvertisementAlchemyModel.id == AdvertisementChangeAlchemyModel.ad_id,
+        AdvertisementAlchemyModel.expires_at == AdvertisementChangeAlchemyModel.expires_at,
+    )
+    changes = select(
+        AdvertisementChangeAlchemyModel.seq,
+        AdvertisementChangeAlchemyModel.ad_id,
+        AdvertisementChangeAlchemyModel.deleted,
+        *RESPONSE_COLUMNS,
+    ).select_from(
+        AdvertisementChangeAlchemyModel,
+    ).outerjoin(
+        AdvertisementAlchemyModel,
+        current_advertisement,
+    ).outerjoin(
+        UserAlchemyModel,
+        AdvertisementAlchemyModel.owner_id == UserAlchemyModel.id,
+    )
+    changes = changes.where(AdvertisementChangeAlchemyModel.seq > since)
+    if until is not None:
+        changes = changes.where(AdvertisementChangeAlchemyModel.seq <= until)
+    return changes.order_by(
+        AdvertisementChangeAlchemyModel.seq,
+    ).limit(limit)
@@ -0,0 +1,86 @@
+"""Модуль содержит фоновое продвижение видимой границы журнала изменений объявлений.
+
+Номера изменений на postgres выделяются последовательностью, и транзакция с меньшим
+номером может зафиксироваться позже. Читатели журнала получают изменения только до safe_seq,
+который продвигается периодически в каждом воркере, поэтому изменение становится видно
+в журнале через один-два периода после коммита.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.component import Component
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdvertisementChangeWatermark(object):
+    """Периодическое продвижение safe_seq журнала изменений объявлений."""
+
+    def __init__(self, change_storage: AdvertisementChangeStorage, interval_seconds: float):
+        """Создание продвижения safe_seq.
+
+        Args:
+            change_storage (AdvertisementChangeStorage): хранилище журнала изменений объявлений
+            interval_seconds (float): период продвижения
+        """
+        self._change_storage = change_storage
+        self._interval = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Запустить периодическое продвижение в фоне."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Остановить периодическое продвижение."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass  # noqa: WPS420
+        self._task = None
+
+    async def advance(self) -> int | None:
+        """Продвинуть safe_seq журнала изменений.
+
+        Returns:
+            int | None: новый safe_seq, None - safe_seq не изменился
+        """
+        async with create_session() as session:
+            return await self._change_storage.advance_safe_seq(session=session)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.advance()
+            except (SQLAlchemyError, OSError) as exception:
+                logger.warning('Продвижение safe_seq журнала изменений не удалось: {0}'.format(
+                    exception,
+                ))
+            await asyncio.sleep(self._interval)
+
+
+def create_change_watermark() -> AdvertisementChangeWatermark:
+    """Создать продвижение safe_seq по настройкам advertisement_lifecycle.
+
+    Returns:
+        AdvertisementChangeWatermark: продвижение safe_seq журнала изменений
+    """
+    return AdvertisementChangeWatermark(
+        change_storage=AdvertisementChangeStorage(),
+        interval_seconds=settings.advertisement_lifecycle.safe_seq_interval_seconds,
+    )
+
+
+change_watermark_component: Component[AdvertisementChangeWatermark] = Component(
+    'advertisement_change_watermark',
+)
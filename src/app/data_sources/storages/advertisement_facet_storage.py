@@ -0,0 +1,294 @@
+"""Модуль содержит класс AdvertisementFacetStorage."""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, or_, select, text, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.app.data_sources.dialects import dialect_insert
+from src.app.data_sources.dtos.advertisement_facets import (
+    AdvertisementFacets,
+    CategoryFacet,
+    PriceBucketFacet,
+)
+from src.app.data_sources.models import (
+    AdvertisementAlchemyModel,
+    AdvertisementFacetAlchemyModel,
+    AdvertisementFacetExpiryAlchemyModel,
+)
+from src.app.data_sources.models.advertisement_facet import (
+    FACET_EXPIRY_ID,
+    PRICE_BUCKETS,
+    price_bucket,
+    price_bucket_expression,
+)
+from src.app.data_sources.query_metrics import instrument_storage
+
+
+@instrument_storage
+class AdvertisementFacetStorage(object):
+    """Класс хранилища сводной таблицы фасетов объявлений."""
+
+    async def get_facets(
+        self,
+        session: AsyncSession,
+        category: str | None = None,
+    ) -> AdvertisementFacets:
+        """Получить количества объявлений по категориям и ценовым диапазонам.
+
+        Читается сводная таблица advertisement_facets, размер которой
+        зависит только от числа категорий и ценовых диапазонов.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            category (str | None): категория для гистограммы цен, None - все категории
+
+        Returns:
+            AdvertisementFacets: фасеты объявлений
+        """
+        rows = (await session.execute(
+            select(
+                AdvertisementFacetAlchemyModel.category,
+                AdvertisementFacetAlchemyModel.price_bucket,
+                AdvertisementFacetAlchemyModel.count,
+            ),
+        )).tuples().all()
+        category_counts, bucket_counts = _count_facets(rows=rows, category=category)
+        return AdvertisementFacets(
+            total=sum(category_counts.values()),
+            categories=[
+                CategoryFacet(category=name, count=count)
+                for name, count in sorted(category_counts.items())
+                if count > 0
+            ],
+            price_buckets=_price_bucket_facets(bucket_counts),
+        )
+
+    async def rebuild_facets(self, session: AsyncSession) -> int:
+        """Пересчитать сводную таблицу фасетов по действующим объявлениям.
+
+        Используется для восстановления после расхождения счетчиков
+        и после изменения границ ценовых диапазонов. На postgres таблица фасетов
+        блокируется от записи до конца транзакции, чтобы объявления,
+        создаваемые во время пересчета, были учтены ровно один раз.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+
+        Returns:
+            int: количество строк в сводной таблице
+        """
+        now = datetime.now(timezone.utc)
+        await self._lock_expiry(session)
+        if session.bind.dialect.name == 'postgresql':
+            await session.execute(text(
+                'LOCK TABLE {0} IN EXCLUSIVE MODE'.format(
+                    AdvertisementFacetAlchemyModel.__tablename__,
+                ),
+            ))
+        await session.execute(delete(AdvertisementFacetAlchemyModel))
+        await session.execute(
+            insert(AdvertisementFacetAlchemyModel).from_select(
+                [
+                    AdvertisementFacetAlchemyModel.category,
+                    AdvertisementFacetAlchemyModel.price_bucket,
+                    AdvertisementFacetAlchemyModel.count,
+                ],
+                facet_counts_query(_advertisements(AdvertisementAlchemyModel.expires_at > now)),
+            ),
+        )
+        await _set_expired_until(session, now)
+        facet_count = (await session.execute(
+            select(func.count()).select_from(AdvertisementFacetAlchemyModel),
+        )).scalar_one()
+        await session.commit()
+        return facet_count
+
+    async def expire(self, session: AsyncSession, until: datetime) -> int:
+        """Вычесть из счетчиков фасетов объявления, срок жизни которых истек до until.
+
+        Истекшие объявления не показываются, но остаются в таблице до архивации.
+        Вычитаются объявления, истекшие после предыдущего вызова, затем запоминается until.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            until (datetime): время, до которого истек срок жизни вычитаемых объявлений
+
+        Returns:
+            int: количество вычтенных объявлений
+        """
+        expired_until = await self._lock_expiry(session)
+        conditions = [AdvertisementAlchemyModel.expires_at <= until]
+        if expired_until is not None:
+            conditions.append(AdvertisementAlchemyModel.expires_at > expired_until)
+        expired_count = await self._subtract(session=session, source=_advertisements(*conditions))
+        # Время вычитания не уменьшается: объявления до большего времени уже вычтены.
+        await _set_expired_until(
+            session,
+            until,
+            or_(
+                AdvertisementFacetExpiryAlchemyModel.expired_until.is_(None),
+                AdvertisementFacetExpiryAlchemyModel.expired_until < until,
+            ),
+        )
+        await session.commit()
+        return expired_count
+
+    async def counted_condition(self, session: AsyncSession) -> ColumnElement:
+        """Получить условие, при котором объявление учтено в счетчиках фасетов.
+
+        Время вычитания истекших объявлений блокируется до конца транзакции,
+        поэтому удаляемое объявление не будет вычтено дважды.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+
+        Returns:
+            ColumnElement: условие на колонки таблицы объявлений
+        """
+        expired_until = (await session.execute(
+            select(AdvertisementFacetExpiryAlchemyModel.expired_until).where(
+                AdvertisementFacetExpiryAlchemyModel.id == FACET_EXPIRY_ID,
+            ).with_for_update(read=True),
+        )).scalar()
+        if expired_until is None:
+            return true()
+        return AdvertisementAlchemyModel.expires_at > expired_until
+
+    async def update(
+        self,
+        session: AsyncSession,
+        advertisements: Iterable[tuple[str, int]],
+        delta: int,
+    ):
+        """Изменить счетчики фасетов объявлений, не фиксируя транзакцию.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            advertisements (Iterable[tuple[str, int]]): категории и цены объявлений
+            delta (int): изменение счетчика для каждого объявления
+        """
+        counts = Counter(
+            (category, price_bucket(price))
+            for category, price in advertisements
+        )
+        await self.add_counts(
+            session=session,
+            counts={facet: count * delta for facet, count in counts.items()},
+        )
+
+    async def add_counts(self, session: AsyncSession, counts: dict[tuple[str, int], int]):
+        """Прибавить значения к счетчикам фасетов, не фиксируя транзакцию.
+
+        Строки обновляются в порядке ключа, чтобы параллельные транзакции
+        не блокировали друг друга во встречном порядке.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            counts (dict[tuple[str, int], int]): прибавляемые значения по категории и диапазону
+        """
+        if not counts:
+            return
+        statement = dialect_insert(session, AdvertisementFacetAlchemyModel)
+        await session.execute(
+            statement.values([
+                {'category': category, 'price_bucket': bucket, 'count': count}
+                for (category, bucket), count in sorted(counts.items())
+            ]).on_conflict_do_update(
+                index_elements=[
+                    AdvertisementFacetAlchemyModel.category,
+                    AdvertisementFacetAlchemyModel.price_bucket,
+                ],
+                set_={
+                    AdvertisementFacetAlchemyModel.count: (
+                        AdvertisementFacetAlchemyModel.count + statement.excluded['count']
+                    ),
+                },
+            ),
+        )
+
+    async def _subtract(self, session: AsyncSession, source) -> int:
+        facet_counts = (await session.execute(facet_counts_query(source))).tuples().all()
+        await self.add_counts(
+            session=session,
+            counts={(category, bucket): -count for category, bucket, count in facet_counts},
+        )
+        return sum(count for _, _, count in facet_counts)
+
+    async def _lock_expiry(self, session: AsyncSession) -> datetime | None:
+        await session.execute(
+            dialect_insert(session, AdvertisementFacetExpiryAlchemyModel).values(
+                id=FACET_EXPIRY_ID,
+            ).on_conflict_do_nothing(
+                index_elements=[AdvertisementFacetExpiryAlchemyModel.id],
+            ),
+        )
+        return (await session.execute(
+            select(AdvertisementFacetExpiryAlchemyModel.expired_until).where(
+                AdvertisementFacetExpiryAlchemyModel.id == FACET_EXPIRY_ID,
+            ).with_for_update(),
+        )).scalar()
+
+
+def facet_counts_query(source):
+    """Запрос количества объявлений по категориям и ценовым диапазонам.
+
+    Args:
+        source: таблица или подзапрос с колонками category и price
+
+    Returns:
+        Select: запрос строк (category, price_bucket, count)
+    """
+    buckets = select(
+        source.c.category,
+        price_bucket_expression(source.c.price).label('price_bucket'),
+    ).subquery()
+    return select(
+        buckets.c.category,
+        buckets.c.price_bucket,
+        func.count(),
+    ).group_by(
+        buckets.c.category,
+        buckets.c.price_bucket,
+    )
+
+
+def _advertisements(*conditions):
+    return select(
+        AdvertisementAlchemyModel.category,
+        AdvertisementAlchemyModel.price,
+    ).where(
+        *conditions,
+    ).subquery()
+
+
+async def _set_expired_until(session: AsyncSession, expired_until: datetime, *conditions):
+    await session.execute(
+        update(AdvertisementFacetExpiryAlchemyModel).where(
+            AdvertisementFacetExpiryAlchemyModel.id == FACET_EXPIRY_ID,
+            *conditions,
+        ).values(
+            expired_until=expired_until,
+        ),
+    )
+
+
+def _count_facets(rows: list, category: str | None) -> tuple[Counter, Counter]:
+    category_counts = Counter()
+    bucket_counts = Counter()
+    for row_category, row_bucket, row_count in rows:
+        category_counts[row_category] += row_count
+        if category is None or row_category == category:
+            bucket_counts[row_bucket] += row_count
+    return category_counts, bucket_counts
+
+
+def _price_bucket_facets(bucket_counts: Counter) -> list[PriceBucketFacet]:
+    bounds = (*PRICE_BUCKETS[1:], None)
+    return [
+        PriceBucketFacet(price_min=price_min, price_max=price_max, count=bucket_counts[price_min])
+        for price_min, price_max in zip(PRICE_BUCKETS, bounds)
+    ]
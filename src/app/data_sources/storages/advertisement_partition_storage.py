@@ -0,0 +1,225 @@
+"""Модуль содержит класс AdvertisementPartitionStorage."""
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Select, cast, column, delete, func, select, table, text
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.models import AdvertisementAlchemyModel, AdvertisementIdAlchemyModel
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+
+PARTITION_NAME = re.compile(r'advertisements_p(\d{8})')
+PARTITION_DAY_FORMAT = '%Y%m%d'  # noqa: WPS323
+DEFAULT_PARTITION = 'advertisements_default'
+ARCHIVE_SCHEMA = 'archive'
+# ключ advisory блокировки, под которой секции создаются и архивируются
+PARTITIONS_LOCK_ID = 9024001
+
+logger = logging.getLogger(__name__)
+
+change_storage = AdvertisementChangeStorage()
+facet_storage = AdvertisementFacetStorage()
+
+
+@instrument_storage
+class AdvertisementPartitionStorage(object):
+    """Класс хранилища секций таблицы объявлений."""
+
+    async def prepare_partitions(self, session: AsyncSession, until: datetime) -> list[str]:
+        """Создать секции таблицы объявлений на дни с текущего до until.
+
+        На postgres таблица секционирована по expires_at на сутки UTC. Секции создаются
+        заранее, чтобы новые объявления не попадали в секцию по умолчанию. День пропускается
+        с предупреждением, если его объявления уже есть в секции по умолчанию.
+        На бд без секционирования ничего не делает.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            until (datetime): последний день, для которого нужна секция
+
+        Returns:
+            list[str]: имена созданных секций
+        """
+        if session.bind.dialect.name != 'postgresql':
+            return []
+        await session.execute(select(func.pg_advisory_xact_lock(PARTITIONS_LOCK_ID)))
+        existing_days = await self._partition_days(session)
+        today = datetime.now(timezone.utc).date()
+        day = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+        created = []
+        while day <= until:
+            if day not in existing_days:
+                if await self._create_partition(session=session, day=day):
+                    created.append(_partition_name(day))
+            day += timedelta(days=1)
+        await session.commit()
+        return created
+
+    async def archive_expired(
+        self,
+        session: AsyncSession,
+        before: datetime,
+        lock_timeout_ms: int,
+    ) -> int:
+        """Архивировать объявления, срок жизни которых истек до before.
+
+        На postgres секции, все объявления которых истекли до before, по одной в отдельной
+        транзакции отсоединяются от таблицы и переносятся в схему archive. Отсоединение
+        ждет блокировку таблицы не дольше lock_timeout_ms, неотсоединенная секция
+        архивируется при следующем вызове. На бд без секционирования объявления удаляются.
+        Перед архивацией объявления вычитаются из счетчиков фасетов
+        (см. AdvertisementFacetStorage.expire), архивация счетчики не изменяет.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            before (datetime): время, до которого истек срок жизни архивируемых объявлений
+            lock_timeout_ms (int): ограничение ожидания блокировки таблицы объявлений
+
+        Returns:
+            int: количество архивированных объявлений
+        """
+        await facet_storage.expire(session=session, until=before)
+        if session.bind.dialect.name != 'postgresql':
+            return await self._delete_expired(session=session, before=before)
+        partition_days = await self._partition_days(session)
+        await session.commit()
+        archived_count = 0
+        for day, partition_name in sorted(partition_days.items()):
+            if day + timedelta(days=1) <= before:
+                archived_count += await self._archive_partition(
+                    session=session,
+                    partition_name=partition_name,
+                    lock_timeout_ms=lock_timeout_ms,
+                )
+        return archived_count
+
+    async def _partition_days(self, session: AsyncSession) -> dict[datetime, str]:
+        partition_names = (await session.execute(_partitions_query())).scalars().all()
+        partition_days = {}
+        for partition_name in partition_names:
+            match = PARTITION_NAME.fullmatch(partition_name)
+            if match:
+                day = datetime.strptime(match.group(1), PARTITION_DAY_FORMAT)
+                partition_days[day.replace(tzinfo=timezone.utc)] = partition_name
+        return partition_days
+
+    async def _create_partition(self, session: AsyncSession, day: datetime) -> bool:
+        next_day = day + timedelta(days=1)
+        default_partition = table(DEFAULT_PARTITION, column('expires_at'))
+        in_default = (await session.execute(
+            select(1).select_from(default_partition).where(
+                default_partition.c.expires_at >= day,
+                default_partition.c.expires_at < next_day,
+            ).limit(1),
+        )).scalar()
+        if in_default:
+            logger.warning(
+                'Секция {0} не создана: объявления этого дня уже находятся в секции {1}'.format(
+                    _partition_name(day),
+                    DEFAULT_PARTITION,
+                ),
+            )
+            return False
+        await session.execute(text(
+            "CREATE TABLE {0} PARTITION OF {1} FOR VALUES FROM ('{2}') TO ('{3}')".format(
+                _quote(session, _partition_name(day)),
+                _quote(session, AdvertisementAlchemyModel.__tablename__),
+                day.isoformat(),
+                next_day.isoformat(),
+            ),
+        ))
+        return True
+
+    async def _archive_partition(
+        self,
+        session: AsyncSession,
+        partition_name: str,
+        lock_timeout_ms: int,
+    ) -> int:
+        await session.execute(select(func.pg_advisory_xact_lock(PARTITIONS_LOCK_ID)))
+        if partition_name not in (await self._partition_days(session)).values():
+            # Секцию уже архивировал другой воркер.
+            await session.commit()
+            return 0
+        await _detach_partition(
+            session=session,
+            partition_name=partition_name,
+            lock_timeout_ms=lock_timeout_ms,
+        )
+        archived_count = await _forget_partition(session=session, partition_name=partition_name)
+        await session.execute(text('ALTER TABLE {0} SET SCHEMA {1}'.format(
+            _quote(session, partition_name),
+            _quote(session, ARCHIVE_SCHEMA),
+        )))
+        await session.commit()
+        return archived_count
+
+    async def _delete_expired(self, session: AsyncSession, before: datetime) -> int:
+        deleted_ids = (await session.execute(
+            delete(AdvertisementAlchemyModel).where(
+                AdvertisementAlchemyModel.expires_at <= before,
+            ).returning(
+                AdvertisementAlchemyModel.id,
+            ),
+        )).scalars().all()
+        if deleted_ids:
+            await session.execute(
+                delete(AdvertisementIdAlchemyModel).where(
+                    AdvertisementIdAlchemyModel.id.in_(deleted_ids),
+                ),
+            )
+            await change_storage.discard(session=session, ad_ids=deleted_ids)
+        await session.commit()
+        await advertisement_cache_component.get().invalidate(list(deleted_ids))
+        return len(deleted_ids)
+
+
+async def _detach_partition(session: AsyncSession, partition_name: str, lock_timeout_ms: int):
+    await session.execute(text('SET LOCAL lock_timeout = {0:d}'.format(lock_timeout_ms)))
+    await session.execute(text('ALTER TABLE {0} DETACH PARTITION {1}'.format(
+        _quote(session, AdvertisementAlchemyModel.__tablename__),
+        _quote(session, partition_name),
+    )))
+
+
+async def _forget_partition(session: AsyncSession, partition_name: str) -> int:
+    # После отсоединения секция не изменяется, поэтому удаляются id ровно ее строк.
+    partition_ids = select(table(partition_name, column('id')).c.id)
+    forgotten = await session.execute(
+        delete(AdvertisementIdAlchemyModel).where(
+            AdvertisementIdAlchemyModel.id.in_(partition_ids),
+        ),
+    )
+    await change_storage.discard(session=session, ad_ids=partition_ids)
+    return forgotten.rowcount
+
+
+def _partitions_query() -> Select:
+    pg_inherits = table('pg_inherits', column('inhrelid'), column('inhparent'))
+    pg_class = table('pg_class', column('oid'), column('relname'))
+    return select(
+        pg_class.c.relname,
+    ).join_from(
+        pg_inherits,
+        pg_class,
+        pg_class.c.oid == pg_inherits.c.inhrelid,
+    ).where(
+        pg_inherits.c.inhparent == cast(AdvertisementAlchemyModel.__tablename__, REGCLASS),
+    )
+
+
+def _partition_name(day: datetime) -> str:
+    return '{0}_p{1}'.format(
+        AdvertisementAlchemyModel.__tablename__,
+        day.strftime(PARTITION_DAY_FORMAT),
+    )
+
+
+def _quote(session: AsyncSession, identifier: str) -> str:
+    return session.bind.dialect.identifier_preparer.quote(identifier)
@@ -0,0 +1,99 @@
+"""Модуль содержит общие части запросов объявлений."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.app.data_sources.dtos.advertisement_filter import AdvertisementFilter
+from src.app.data_sources.models import (
+    AdvertisementAlchemyModel,
+    AdvertisementIdAlchemyModel,
+    UserAlchemyModel,
+)
+
+EXPORT_COLUMNS = (
+    AdvertisementAlchemyModel.id,
+    AdvertisementAlchemyModel.category,
+    AdvertisementAlchemyModel.owner_id,
+    AdvertisementAlchemyModel.title,
+    AdvertisementAlchemyModel.price,
+    AdvertisementAlchemyModel.description,
+)
+
+RESPONSE_COLUMNS = (
+    AdvertisementAlchemyModel.id,
+    AdvertisementAlchemyModel.category,
+    AdvertisementAlchemyModel.title,
+    AdvertisementAlchemyModel.price,
+    AdvertisementAlchemyModel.description,
+    AdvertisementAlchemyModel.updated_at,
+    AdvertisementAlchemyModel.created_at,
+    AdvertisementAlchemyModel.expires_at,
+    AdvertisementAlchemyModel.owner_id,
+    UserAlchemyModel.username.label('owner_username'),
+)
+
+
+def advertisement_projection() -> Select:
+    """Запрос действующих объявлений с полями ответа и именем владельца.
+
+    Условие на expires_at оставляет в плане на postgres только секции
+    с действующими объявлениями.
+
+    Returns:
+        Select: запрос объявлений
+    """
+    return select(
+        *RESPONSE_COLUMNS,
+    ).join_from(
+        AdvertisementAlchemyModel,
+        UserAlchemyModel,
+        AdvertisementAlchemyModel.owner_id == UserAlchemyModel.id,
+    ).where(
+        AdvertisementAlchemyModel.expires_at > datetime.now(timezone.utc),
+    )
+
+
+def id_condition(ad_id: int) -> ColumnElement:
+    """Условие выбора объявления по id.
+
+    expires_at объявления берется из таблицы advertisement_ids, поэтому
+    на postgres запрос читает только секцию объявления, а не индексы всех секций.
+
+    Args:
+        ad_id (int): id объявления
+
+    Returns:
+        ColumnElement: условие для Select.where и Delete.where
+    """
+    expires_at = select(
+        AdvertisementIdAlchemyModel.expires_at,
+    ).where(
+        AdvertisementIdAlchemyModel.id == ad_id,
+    ).scalar_subquery()
+    return and_(
+        AdvertisementAlchemyModel.id == ad_id,
+        AdvertisementAlchemyModel.expires_at == expires_at,
+    )
+
+
+def filter_conditions(ad_filter: AdvertisementFilter) -> list:
+    """Условия запроса для фильтра объявлений.
+
+    Args:
+        ad_filter (AdvertisementFilter): фильтр объявлений
+
+    Returns:
+        list: условия для Select.where
+    """
+    conditions = []
+    if ad_filter.category is not None:
+        conditions.append(AdvertisementAlchemyModel.category == ad_filter.category)
+    if ad_filter.price_min is not None:
+        conditions.append(AdvertisementAlchemyModel.price >= ad_filter.price_min)
+    if ad_filter.price_max is not None:
+        conditions.append(AdvertisementAlchemyModel.price <= ad_filter.price_max)
+    if ad_filter.owner_id is not None:
+        conditions.append(AdvertisementAlchemyModel.owner_id == ad_filter.owner_id)
+    return conditions
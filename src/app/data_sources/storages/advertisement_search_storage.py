@@ -0,0 +1,79 @@
+"""Модуль содержит класс AdvertisementSearchStorage."""
+
+from sqlalchemy import Select, and_, case, cast, func, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.data_sources.dtos.advertisement import Advertisement
+from src.app.data_sources.models import AdvertisementAlchemyModel
+from src.app.data_sources.models.advertisement import SEARCH_CONFIG
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.storages.advertisement_queries import advertisement_projection
+
+
+@instrument_storage
+class AdvertisementSearchStorage(object):
+    """Класс хранилища поиска объявлений."""
+
+    async def search(
+        self,
+        session: AsyncSession,
+        text: str,
+        limit: int,
+        offset: int = 0,
+    ) -> list:
+        """Полнотекстовый поиск объявлений по заголовку и описанию.
+
+        На postgres используется генерируемая колонка search_vector с gin индексом,
+        результаты упорядочены по релевантности. На остальных бд (sqlite в тестах)
+        выполняется поиск подстрок: сначала совпадения в заголовке, затем более новые.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            text (str): поисковый запрос
+            limit (int): максимальное количество объявлений на странице
+            offset (int): количество пропускаемых объявлений
+
+        Returns:
+            list: объявления
+        """
+        if session.bind.dialect.name == 'postgresql':
+            query = self._fulltext_query(text)
+        else:
+            query = self._substring_query(text)
+        rows = (await session.execute(
+            query.limit(
+                limit,
+            ).offset(
+                offset,
+            ),
+        )).all()
+        return [Advertisement.from_row(row) for row in rows]
+
+    def _fulltext_query(self, text: str) -> Select:
+        ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), text)
+        return advertisement_projection().where(
+            AdvertisementAlchemyModel.search_vector.op('@@')(ts_query),
+        ).order_by(
+            func.ts_rank_cd(AdvertisementAlchemyModel.search_vector, ts_query).desc(),
+            AdvertisementAlchemyModel.id.desc(),
+        )
+
+    def _substring_query(self, text: str) -> Select:
+        terms = text.split()
+        in_title = and_(*(
+            AdvertisementAlchemyModel.title.icontains(term, autoescape=True)
+            for term in terms
+        ))
+        return advertisement_projection().where(
+            *(
+                or_(
+                    AdvertisementAlchemyModel.title.icontains(term, autoescape=True),
+                    AdvertisementAlchemyModel.description.icontains(term, autoescape=True),
+                )
+                for term in terms
+            ),
+        ).order_by(
+            case((in_title, 1), else_=0).desc(),
+            AdvertisementAlchemyModel.id.desc(),
+        )
@@ -1,13 +1,34 @@
 """Модуль содержит класс AdvertisementStorage."""
 
-from sqlalchemy import delete, insert, select
+from datetime import datetime, timezone
+from functools import partial
+from typing import AsyncIterator
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from src.app.component import Component
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.caches.advertisement_cache import MISSING, advertisement_cache_component
 from src.app.data_sources.dtos.advertisement import Advertisement
+from src.app.data_sources.dtos.advertisement_filter import AdvertisementFilter
 from src.app.data_sources.models import AdvertisementAlchemyModel
-
-
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.single_flight import SingleFlight
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+from src.app.data_sources.storages.advertisement_queries import (
+    EXPORT_COLUMNS,
+    advertisement_projection,
+    filter_conditions,
+    id_condition,
+)
+
+by_id_flight_component: Component[SingleFlight] = Component('advertisement_by_id')
+page_flight_component: Component[SingleFlight] = Component('advertisement_page')
+facet_storage = AdvertisementFacetStorage()
+
+
+@instrument_storage
 class AdvertisementStorage(object):
     """Класс хранилища объявлений."""
 
@@ -19,81 +40,171 @@ class AdvertisementStorage(object):
             ad_id (int): id объявления
 
         Returns:
-            Advertisement | None: объявление или None если не найдено
+            Advertisement | None: объявление или None если не найдено или его срок жизни истек
         """
-        advertisement = (await session.execute(
-            select(AdvertisementAlchemyModel).where(
-                AdvertisementAlchemyModel.id == ad_id,
-            ).options(
-                selectinload(AdvertisementAlchemyModel.owner),
+        row = (await session.execute(
+            advertisement_projection().where(
+                id_condition(ad_id),
             ),
-        )).scalar()
-        if advertisement:
-            return Advertisement.from_orm(advertisement)
+        )).first()
+        if row:
+            return Advertisement.from_row(row)
+
+    async def get_cached_by_id(self, ad_id: int) -> Advertisement | None:
+        """Получение объявления по id через кеш.
 
-    async def get_all(self, session: AsyncSession) -> list:
-        """Получить все объявления.
+        При промахе объявление читается из основной бд отдельной сессией
+        (реплика может еще не содержать изменение, сбросившее запись) и сохраняется в кеш,
+        отсутствующие id тоже кешируются на короткое время.
+        Параллельные промахи по одному id объединяются в одно чтение.
+
+        Args:
+            ad_id (int): id объявления
+
+        Returns:
+            Advertisement | None: объявление или None если не найдено
+        """
+        advertisement = await advertisement_cache_component.get().get(ad_id)
+        if advertisement is MISSING:
+            advertisement = await by_id_flight_component.get().run(
+                ad_id,
+                lambda: self._load_by_id(ad_id=ad_id),
+            )
+        if advertisement is not None and advertisement.is_expired():
+            # Срок жизни объявления истек, пока оно находилось в кеше.
+            return None
+        return advertisement
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        limit: int,
+        after_id: int | None = None,
+        ad_filter: AdvertisementFilter | None = None,
+    ) -> list:
+        """Получить страницу объявлений.
+
+        Пагинация по ключу: объявления упорядочены по id,
+        следующая страница запрашивается с after_id равным id последнего объявления.
+        Параллельные запросы одной и той же страницы объединяются в одно чтение.
 
         Args:
             session: (AsyncSession): сессия подключения к бд
+            limit (int): максимальное количество объявлений на странице
+            after_id (int | None): id объявления, после которого начинается страница
+            ad_filter (AdvertisementFilter | None): фильтр объявлений
 
         Returns:
             list: объявления
         """
-        advertisements = (await session.execute(
-            select(AdvertisementAlchemyModel).options(
-                selectinload(AdvertisementAlchemyModel.owner),
+        return await page_flight_component.get().run(
+            key=(limit, after_id, ad_filter),
+            call=partial(
+                self._select_page,
+                session=session,
+                limit=limit,
+                after_id=after_id,
+                ad_filter=ad_filter,
             ),
-        )).scalars().all()
-        return [Advertisement.from_orm(ad) for ad in advertisements]
+        )
 
-    async def add(
+    async def get_by_owner(
         self,
         session: AsyncSession,
-        category: str,
         owner_id: int,
-        title: str,
-        price: int,
-        description: str,
-    ):
-        """Создание нового объявлени.
+        limit: int,
+        before_id: int | None = None,
+    ) -> list:
+        """Получить страницу объявлений владельца, начиная с новых.
+
+        Пагинация по ключу с использованием индекса (owner_id, id):
+        следующая страница запрашивается с before_id равным id последнего объявления.
 
         Args:
             session: (AsyncSession): сессия подключения к бд
-            category (str): категория объявления
             owner_id (int): id владельца
-            title (str): заголовок
-            price (int): стоимость
-            description (str): описание
+            limit (int): максимальное количество объявлений на странице
+            before_id (int | None): id объявления, до которого начинается страница
+
+        Returns:
+            list: объявления
         """
-        await session.execute(
-            insert(AdvertisementAlchemyModel).values(
-                category=category,
-                owner_id=owner_id,
-                title=title,
-                price=price,
-                description=description,
+        query = advertisement_projection().where(AdvertisementAlchemyModel.owner_id == owner_id)
+        if before_id is not None:
+            query = query.where(AdvertisementAlchemyModel.id < before_id)
+        rows = (await session.execute(
+            query.order_by(
+                AdvertisementAlchemyModel.id.desc(),
+            ).limit(
+                limit,
             ),
-        )
-        await session.commit()
+        )).all()
+        return [Advertisement.from_row(row) for row in rows]
 
-    async def remove(self, session: AsyncSession, ad_id: int):
-        """Удалить объявление.
+    async def stream_all(self, session: AsyncSession, chunk_size: int) -> AsyncIterator[list]:
+        """Потоково прочитать все действующие объявления.
+
+        Строки читаются серверным курсором порциями по chunk_size,
+        поэтому потребление памяти не зависит от размера таблицы.
 
         Args:
             session: (AsyncSession): сессия подключения к бд
-            ad_id (int): id объявления
+            chunk_size (int): количество строк в одной порции
 
-        Raises:
-            ValueError: объявление с указанным id не найдено
+        Yields:
+            list: порция строк объявлений
         """
-        advertisement = await self.get_by_id(session=session, ad_id=ad_id)
-        if not advertisement:
-            raise ValueError('Объявление с указанным id не найдено')
-
-        await session.execute(
-            delete(AdvertisementAlchemyModel).where(
-                AdvertisementAlchemyModel.id == advertisement.id,
+        stream_result = await session.stream(
+            select(
+                *EXPORT_COLUMNS,
+            ).where(
+                AdvertisementAlchemyModel.expires_at > datetime.now(timezone.utc),
+            ).order_by(
+                AdvertisementAlchemyModel.id,
+            ).execution_options(
+                yield_per=chunk_size,
             ),
         )
-        await session.commit()
+        async for partition in stream_result.mappings().partitions():
+            yield partition
+
+    async def warm_up(self, session: AsyncSession):
+        """Выполнить основные запросы чтения, ограничив результат одной строкой.
+
+        SQLAlchemy компилирует запросы заранее, а asyncpg подготавливает их
+        на соединении сессии, поэтому первые запросы пользователей не тратят на это время.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+        """
+        await self.get_by_id(session=session, ad_id=0)
+        await self._select_page(session=session, limit=1, after_id=None, ad_filter=None)
+        await self._select_page(session=session, limit=1, after_id=0, ad_filter=None)
+        await facet_storage.get_facets(session=session)
+
+    async def _load_by_id(self, ad_id: int) -> Advertisement | None:
+        async with create_session() as session:
+            advertisement = await self.get_by_id(session=session, ad_id=ad_id)
+        await advertisement_cache_component.get().set(ad_id, advertisement)
+        return advertisement
+
+    async def _select_page(
+        self,
+        session: AsyncSession,
+        limit: int,
+        after_id: int | None,
+        ad_filter: AdvertisementFilter | None,
+    ) -> list:
+        query = advertisement_projection()
+        if after_id is not None:
+            query = query.where(AdvertisementAlchemyModel.id > after_id)
+        if ad_filter is not None:
+            query = query.where(*filter_conditions(ad_filter))
+        rows = (await session.execute(
+            query.order_by(
+                AdvertisementAlchemyModel.id,
+            ).limit(
+                limit,
+            ),
+        )).all()
+        return [Advertisement.from_row(row) for row in rows]
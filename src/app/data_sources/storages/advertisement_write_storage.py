@@ -0,0 +1,238 @@
+"""Модуль содержит класс AdvertisementWriteStorage."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.models import AdvertisementAlchemyModel, AdvertisementIdAlchemyModel
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+from src.app.data_sources.storages.advertisement_queries import id_condition
+from src.config.config import settings
+
+ID_SEQUENCE = 'advertisements_id_seq'
+COPY_COLUMNS = (
+    'id',
+    'category',
+    'owner_id',
+    'title',
+    'price',
+    'description',
+    'created_at',
+    'expires_at',
+)
+COPY_THRESHOLD = 100
+
+change_storage = AdvertisementChangeStorage()
+facet_storage = AdvertisementFacetStorage()
+
+
+class AdvertisementOwnershipError(Exception):
+    """Объявление принадлежит другому пользователю."""
+
+
+@instrument_storage
+class AdvertisementWriteStorage(object):
+    """Класс хранилища изменений объявлений.
+
+    Вместе с объявлениями в той же транзакции изменяются таблица advertisement_ids,
+    счетчики фасетов и журнал изменений, после коммита объявления удаляются из кеша.
+    """
+
+    async def add(
+        self,
+        session: AsyncSession,
+        category: str,
+        owner_id: int,
+        title: str,
+        price: int,
+        description: str,
+    ) -> int:
+        """Создание нового объявлени.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            category (str): категория объявления
+            owner_id (int): id владельца
+            title (str): заголовок
+            price (int): стоимость
+            description (str): описание
+
+        Returns:
+            int: id созданного объявления
+        """
+        created_at, expires_at = _lifetime()
+        ad_id = (await session.execute(
+            insert(AdvertisementAlchemyModel).values(
+                category=category,
+                owner_id=owner_id,
+                title=title,
+                price=price,
+                description=description,
+                created_at=created_at,
+                expires_at=expires_at,
+            ).returning(
+                AdvertisementAlchemyModel.id,
+            ),
+        )).scalar_one()
+        await _remember_ids(session=session, ad_ids=[ad_id], expires_at=expires_at)
+        await facet_storage.update(session=session, advertisements=[(category, price)], delta=1)
+        await change_storage.record(session=session, upserted=[(ad_id, expires_at)])
+        await session.commit()
+        await advertisement_cache_component.get().invalidate([ad_id])
+        return ad_id
+
+    async def add_many(
+        self,
+        session: AsyncSession,
+        owner_id: int,
+        advertisements: list[dict],
+    ) -> list[int]:
+        """Создание нескольких объявлений одного владельца в одной транзакции.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            owner_id (int): id владельца
+            advertisements (list[dict]): объявления с полями category, title, price, description
+
+        Returns:
+            list[int]: id созданных объявлений в порядке входного списка
+        """
+        return await self.add_rows(
+            session=session,
+            rows=[{**advertisement, 'owner_id': owner_id} for advertisement in advertisements],
+        )
+
+    async def add_rows(self, session: AsyncSession, rows: list[dict]) -> list[int]:
+        """Создание объявлений, возможно разных владельцев, в одной транзакции.
+
+        На postgres с драйвером asyncpg крупные пачки записываются через COPY
+        с заранее выделенными из последовательности id, иначе одним многострочным INSERT.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            rows (list[dict]): объявления с полями category, owner_id, title, price, description
+
+        Returns:
+            list[int]: id созданных объявлений в порядке входного списка
+        """
+        if not rows:
+            return []
+        created_at, expires_at = _lifetime()
+        rows = [{**row, 'created_at': created_at, 'expires_at': expires_at} for row in rows]
+        if session.bind.dialect.driver == 'asyncpg' and len(rows) >= COPY_THRESHOLD:
+            ad_ids = await self._copy_rows(session=session, rows=rows)
+        else:
+            ad_ids = (await session.execute(
+                insert(AdvertisementAlchemyModel).returning(
+                    AdvertisementAlchemyModel.id,
+                    sort_by_parameter_order=True,
+                ),
+                rows,
+            )).scalars().all()
+        await _remember_ids(session=session, ad_ids=ad_ids, expires_at=expires_at)
+        await facet_storage.update(
+            session=session,
+            advertisements=[(row['category'], row['price']) for row in rows],
+            delta=1,
+        )
+        await change_storage.record(
+            session=session,
+            upserted=[(ad_id, expires_at) for ad_id in ad_ids],
+        )
+        await session.commit()
+        await advertisement_cache_component.get().invalidate(list(ad_ids))
+        return list(ad_ids)
+
+    async def remove(self, session: AsyncSession, ad_id: int, owner_id: int | None = None):
+        """Удалить объявление запросом DELETE ... RETURNING.
+
+        Проверка владельца выполняется условием того же запроса, счетчик фасетов
+        уменьшается, если объявление в нем учтено, и отметка об удалении записывается
+        в журнал в той же транзакции.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            ad_id (int): id объявления
+            owner_id (int | None): id владельца, None - удалить без проверки владельца
+
+        Raises:
+            ValueError: объявление с указанным id не найдено
+            AdvertisementOwnershipError: объявление принадлежит другому пользователю
+        """
+        counted = await facet_storage.counted_condition(session)
+        statement = delete(AdvertisementAlchemyModel).where(id_condition(ad_id))
+        if owner_id is not None:
+            statement = statement.where(AdvertisementAlchemyModel.owner_id == owner_id)
+        deleted = (await session.execute(
+            statement.returning(
+                AdvertisementAlchemyModel.category,
+                AdvertisementAlchemyModel.price,
+                counted.label('counted'),
+            ),
+        )).first()
+        if deleted is None:
+            # Причина отказа выясняется отдельным запросом только для неуспешного удаления.
+            existing_id = (await session.execute(
+                select(AdvertisementIdAlchemyModel.id).where(
+                    AdvertisementIdAlchemyModel.id == ad_id,
+                ),
+            )).scalar()
+            if existing_id is None:
+                raise ValueError('Объявление с указанным id не найдено')
+            raise AdvertisementOwnershipError(
+                'Текущий пользователь не является владельцем объявления',
+            )
+        await _forget(session=session, ad_id=ad_id, deleted=deleted)
+        await change_storage.record(session=session, deleted=[ad_id])
+        await session.commit()
+        await advertisement_cache_component.get().invalidate([ad_id])
+
+    async def _copy_rows(self, session: AsyncSession, rows: list[dict]) -> list[int]:
+        ad_ids = (await session.execute(
+            select(
+                func.nextval(ID_SEQUENCE),
+            ).select_from(
+                func.generate_series(1, len(rows)),
+            ),
+        )).scalars().all()
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            AdvertisementAlchemyModel.__tablename__,
+            records=[
+                (ad_id, *(row[copy_column] for copy_column in COPY_COLUMNS[1:]))
+                for ad_id, row in zip(ad_ids, rows)
+            ],
+            columns=COPY_COLUMNS,
+        )
+        return ad_ids
+
+
+async def _remember_ids(session: AsyncSession, ad_ids: list[int], expires_at: datetime):
+    # Первичный ключ advertisement_ids не допускает повторного id.
+    await session.execute(
+        insert(AdvertisementIdAlchemyModel),
+        [{'id': ad_id, 'expires_at': expires_at} for ad_id in ad_ids],
+    )
+
+
+async def _forget(session: AsyncSession, ad_id: int, deleted: Row):
+    await session.execute(
+        delete(AdvertisementIdAlchemyModel).where(AdvertisementIdAlchemyModel.id == ad_id),
+    )
+    if deleted.counted:
+        await facet_storage.update(
+            session=session,
+            advertisements=[(deleted.category, deleted.price)],
+            delta=-1,
+        )
+
+
+def _lifetime() -> tuple[datetime, datetime]:
+    created_at = datetime.now(timezone.utc)
+    lifetime = timedelta(days=settings.advertisement_lifecycle.lifetime_days)
+    return created_at, created_at + lifetime
@@ -1,13 +1,25 @@
 """Модуль содержит класс UserStorage."""
 
-from bcrypt import gensalt, hashpw
-from sqlalchemy import insert, select, update
+from sqlalchemy import case, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.component import Component
+from src.app.data_sources.caches.advertisement_cache import advertisement_cache_component
+from src.app.data_sources.caches.ttl_cache import TTLCache
+from src.app.data_sources.dialects import dialect_insert
 from src.app.data_sources.dtos.user import User
 from src.app.data_sources.models import UserAlchemyModel
+from src.app.data_sources.query_metrics import instrument_storage
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.app.users.password import password_hasher_component
+from src.config.config import settings
 
+user_cache_component: Component[TTLCache] = Component('user_cache')
+token_version_cache_component: Component[TTLCache] = Component('token_version_cache')
+change_storage = AdvertisementChangeStorage()
 
+
+@instrument_storage
 class UserStorage(object):
     """Хранилище пользователей."""
 
@@ -29,6 +41,49 @@ class UserStorage(object):
         if user:
             return User.from_orm(user)
 
+    async def get_cached_user_by_id(self, session: AsyncSession, user_id: int) -> User | None:
+        """Получить пользователя по id с использованием кеша.
+
+        Запись кеша сбрасывается при изменении пользователя через update_user,
+        в остальных случаях данные могут устареть не более чем на время жизни кеша.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            user_id (int): id пользователя
+
+        Returns:
+            User | None: пользователь или None если пользователь не найден
+        """
+        user = user_cache_component.get().get(user_id)
+        if user is None:
+            user = await self.get_user_by_id(session=session, user_id=user_id)
+            if user:
+                user_cache_component.get().set(user_id, user)
+        return user
+
+    async def get_cached_token_version(self, session: AsyncSession, user_id: int) -> int | None:
+        """Получить текущую версию токенов пользователя с использованием кеша.
+
+        Запрашивается только одна колонка, запись кеша сбрасывается в update_user.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+            user_id (int): id пользователя
+
+        Returns:
+            int | None: версия токенов или None если пользователь не найден
+        """
+        token_version = token_version_cache_component.get().get(user_id)
+        if token_version is None:
+            token_version = (await session.execute(
+                select(UserAlchemyModel.token_version).where(
+                    UserAlchemyModel.id == user_id,
+                ),
+            )).scalar()
+            if token_version is not None:
+                token_version_cache_component.get().set(user_id, token_version)
+        return token_version
+
     async def get_user_by_username(self, session: AsyncSession, username: str) -> User | None:
         """Получить пользователя по имени.
 
@@ -47,8 +102,30 @@ class UserStorage(object):
         if user:
             return User.from_orm(user)
 
+    async def warm_up(self, session: AsyncSession):
+        """Выполнить запросы аутентификации для несуществующего пользователя.
+
+        SQLAlchemy компилирует запросы заранее, а asyncpg подготавливает их
+        на соединении сессии.
+
+        Args:
+            session: (AsyncSession): сессия подключения к бд
+        """
+        await self.get_user_by_id(session=session, user_id=0)
+        await self.get_user_by_username(session=session, username='')
+        await session.execute(
+            select(UserAlchemyModel.token_version).where(
+                UserAlchemyModel.id == 0,
+            ),
+        )
+
     async def add_user(self, session: AsyncSession, username: str, password: str):
-        """Добавление нового пользователя.
+        """Добавление нового пользователя одним запросом INSERT ... ON CONFLICT DO NOTHING.
+
+        Пароль хешируется до обращения к бд, поэтому сессия не держит соединение
+        на время хеширования. Занятое имя, в том числе при одновременных регистрациях,
+        определяется по отсутствию id в RETURNING. Если очередь хеширования паролей
+        заполнена, пробрасывается PasswordHasherOverloadedError.
 
         Args:
             session: (AsyncSession): сессия подключения к бд
@@ -58,41 +135,107 @@ class UserStorage(object):
         Raises:
             ValueError: пользователь с таким именем уже существует
         """
-        user = await self.get_user_by_username(session=session, username=username)
-        if user:
-            raise ValueError('Пользователь с таким именем уже существует')
-
-        await session.execute(
-            insert(UserAlchemyModel).values(
+        password_hash = await password_hasher_component.get().hash(password)
+        user_id = (await session.execute(
+            dialect_insert(session, UserAlchemyModel).values(
                 username=username,
-                password_hash=hashpw(password.encode(), gensalt()).decode(),
+                password_hash=password_hash,
                 is_admin=False,
+            ).on_conflict_do_nothing(
+                index_elements=[UserAlchemyModel.username],
+            ).returning(
+                UserAlchemyModel.id,
             ),
-        )
+        )).scalar()
+        if user_id is None:
+            raise ValueError('Пользователь с таким именем уже существует')
         await session.commit()
 
-    async def update_user(self, session: AsyncSession, username: str, updated_user: User):
-        """Изменение данных пользователя.
+    async def update_user(  # noqa: WPS211
+        self,
+        session: AsyncSession,
+        username: str,
+        new_username: str | None = None,
+        password_hash: str | None = None,
+        is_admin: bool | None = None,
+    ) -> User:
+        """Изменение данных пользователя одним запросом UPDATE ... RETURNING.
+
+        Незаданные поля не изменяются. Смена имени или пароля и снятие прав
+        администратора увеличивают версию токенов, после чего ранее выданные
+        токены доступа перестают приниматься.
 
         Args:
             session: (AsyncSession): сессия подключения к бд
             username (str): имя пользователя
-            updated_user (User): измененный пользователь
+            new_username (str | None): новое имя пользователя
+            password_hash (str | None): новый хеш пароля
+            is_admin (bool | None): признак администратора
 
         Raises:
             ValueError: пользователя с таким именем не существует
-        """
-        user = await self.get_user_by_username(session=session, username=username)
-        if not user:
-            raise ValueError('Пользователя с таким именем не существует')
 
-        await session.execute(
+        Returns:
+            User: измененный пользователь
+        """
+        changed_columns = {}
+        revoking_changes = []
+        if new_username is not None:
+            changed_columns['username'] = new_username
+            revoking_changes.append(UserAlchemyModel.username != new_username)
+        if password_hash is not None:
+            changed_columns['password_hash'] = password_hash
+            revoking_changes.append(UserAlchemyModel.password_hash != password_hash)
+        if is_admin is not None:
+            changed_columns['is_admin'] = is_admin
+            if not is_admin:
+                revoking_changes.append(UserAlchemyModel.is_admin)
+        if revoking_changes:
+            token_increment = case((or_(*revoking_changes), 1), else_=0)
+            changed_columns['token_version'] = UserAlchemyModel.token_version + token_increment
+        user = (await session.execute(
             update(UserAlchemyModel).where(
-                UserAlchemyModel.id == user.user_id,
+                UserAlchemyModel.username == username,
             ).values(
-                username=updated_user.username,
-                password_hash=updated_user.password_hash,
-                is_admin=updated_user.is_admin,
+                **changed_columns,
+            ).returning(
+                *UserAlchemyModel.__table__.columns,
             ),
-        )
+        )).first()
+        if not user:
+            raise ValueError('Пользователя с таким именем не существует')
+        if new_username is not None:
+            # Имя владельца входит в объявления, поэтому его объявления попадают в журнал изменений.
+            await change_storage.record_owner(session=session, owner_id=user.id)
         await session.commit()
+        user_cache_component.get().invalidate(user.id)
+        token_version_cache_component.get().invalidate(user.id)
+        if new_username is not None:
+            # Объявления в кеше содержат только публичные данные владельца - его имя.
+            advertisement_cache = advertisement_cache_component.get()
+            await advertisement_cache.invalidate_owner(session=session, owner_id=user.id)
+        return User.from_orm(user)
+
+
+def create_user_cache() -> TTLCache:
+    """Создать кеш пользователей по настройкам user_cache.
+
+    Returns:
+        TTLCache: кеш пользователей
+    """
+    return TTLCache(
+        max_size=settings.user_cache.max_size,
+        ttl_seconds=settings.user_cache.ttl_seconds,
+    )
+
+
+def create_token_version_cache() -> TTLCache:
+    """Создать кеш версий токенов по настройкам token_version_cache.
+
+    Returns:
+        TTLCache: кеш версий токенов
+    """
+    return TTLCache(
+        max_size=settings.token_version_cache.max_size,
+        ttl_seconds=settings.token_version_cache.ttl_seconds,
+    )
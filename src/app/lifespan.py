@@ -0,0 +1,68 @@
+"""Модуль содержит жизненный цикл приложения в процессе воркера."""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.api.metrics.multiprocess import is_enabled, mark_worker_dead
+from src.app.api.metrics.publisher import stats_publisher_component
+from src.app.components import close_components
+from src.app.data_sources.adaptor import close_engine, init_database
+from src.app.data_sources.caches.advertisement_cache_invalidator import cache_invalidator_component
+from src.app.data_sources.storages.advertisement_archiver import archiver_component
+from src.app.data_sources.storages.advertisement_change_watermark import change_watermark_component
+from src.app.startup import Startup
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Жизненный цикл приложения в процессе воркера.
+
+    До начала обслуживания запросов создаются движки бд, открываются соединения пула
+    и подготавливаются основные запросы. Если бд недоступна, воркер запускается
+    неготовым, а прогрев повторяется при проверке готовности. Затем запускаются
+    фоновая архивация объявлений с истекшим сроком жизни, продвижение safe_seq журнала изменений
+    и, для кеша объявлений в памяти при нескольких воркерах, сброс кеша по журналу изменений.
+    В многопроцессном режиме метрик статистика компонентов воркера публикуется в фоне.
+
+    Args:
+        app (FastAPI): приложение
+
+    Yields:
+        None: приложение обслуживает запросы
+    """
+    startup: Startup = app.state.startup
+    await _start(startup)
+    yield
+    await _stop(startup)
+
+
+async def _start(startup: Startup):
+    with startup.measure('engine'):
+        init_database()
+    try:
+        await startup.warm_up()
+    except (SQLAlchemyError, OSError) as exception:
+        # TimeoutError прогрева является подклассом OSError.
+        logger.warning('Прогрев при запуске не удался, воркер не готов: {0}'.format(exception))
+    if settings.advertisement_lifecycle.archiver_enabled:
+        archiver_component.get().start()
+    change_watermark_component.get().start()
+    cache_invalidator = cache_invalidator_component.peek()
+    if cache_invalidator is not None:
+        cache_invalidator.start()
+    if is_enabled():
+        stats_publisher_component.get().start()
+
+
+async def _stop(startup: Startup):
+    startup.stop()
+    await close_components()
+    await close_engine()
+    mark_worker_dead()
@@ -0,0 +1,38 @@
+"""advertisement_filter_indexes
+
+Revision ID: d42de70af064
+Revises: ff218b5980c1
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd42de70af064'
+down_revision: Union[str, None] = 'ff218b5980c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_advertisements_owner_id'), 'advertisements', ['owner_id'], unique=False,
+    )
+    op.create_index(
+        'ix_advertisements_category_id', 'advertisements', ['category', 'id'], unique=False,
+    )
+    op.create_index(
+        'ix_advertisements_category_price', 'advertisements', ['category', 'price'], unique=False,
+    )
+    op.create_index('ix_advertisements_price', 'advertisements', ['price'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_advertisements_price', table_name='advertisements')
+    op.drop_index('ix_advertisements_category_price', table_name='advertisements')
+    op.drop_index('ix_advertisements_category_id', table_name='advertisements')
+    op.drop_index(op.f('ix_advertisements_owner_id'), table_name='advertisements')
@@ -0,0 +1,47 @@
+"""advertisement_search_vector
+
+Revision ID: a2a2a09179ab
+Revises: d42de70af064
+Create Date: 2026-10-18 11:04:52.918310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2a2a09179ab'
+down_revision: Union[str, None] = 'd42de70af064'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'advertisements',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_advertisements_search_vector',
+        'advertisements',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_advertisements_search_vector', table_name='advertisements')
+    op.drop_column('advertisements', 'search_vector')
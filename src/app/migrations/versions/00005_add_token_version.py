@@ -0,0 +1,29 @@
+"""add_token_version
+
+Revision ID: 1f163e47d8ee
+Revises: a2a2a09179ab
+Create Date: 2026-10-18 12:21:07.554093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f163e47d8ee'
+down_revision: Union[str, None] = 'a2a2a09179ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
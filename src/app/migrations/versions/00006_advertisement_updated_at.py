@@ -0,0 +1,34 @@
+"""advertisement_updated_at
+
+Revision ID: 885087b48865
+Revises: 1f163e47d8ee
+Create Date: 2026-10-18 14:02:44.310962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '885087b48865'
+down_revision: Union[str, None] = '1f163e47d8ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'advertisements',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('advertisements', 'updated_at')
@@ -0,0 +1,45 @@
+"""advertisement_facets
+
+Revision ID: 890e2b72819f
+Revises: 885087b48865
+Create Date: 2026-10-18 15:21:07.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '890e2b72819f'
+down_revision: Union[str, None] = '885087b48865'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# границы на момент миграции, см. PRICE_BUCKETS в models/advertisement_facet.py
+PRICE_BUCKETS = (0, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'advertisement_facets',
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('price_bucket', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('category', 'price_bucket'),
+    )
+    bucket = ' '.join(
+        'WHEN price >= {0} THEN {0}'.format(bound)
+        for bound in reversed(PRICE_BUCKETS[1:])
+    )
+    op.execute(
+        'INSERT INTO advertisement_facets (category, price_bucket, count) '
+        'SELECT category, price_bucket, count(*) FROM ('
+        'SELECT category, CASE {0} ELSE {1} END AS price_bucket FROM advertisements'
+        ') AS buckets GROUP BY category, price_bucket'.format(bucket, PRICE_BUCKETS[0]),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('advertisement_facets')
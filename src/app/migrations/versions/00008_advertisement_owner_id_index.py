@@ -0,0 +1,32 @@
+"""advertisement_owner_id_index
+
+Revision ID: e748f27c8bfa
+Revises: 890e2b72819f
+Create Date: 2026-10-18 15:48:12.904517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e748f27c8bfa'
+down_revision: Union[str, None] = '890e2b72819f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_advertisements_owner_id_id', 'advertisements', ['owner_id', 'id'], unique=False,
+    )
+    op.drop_index(op.f('ix_advertisements_owner_id'), table_name='advertisements')
+
+
+def downgrade() -> None:
+    op.create_index(
+        op.f('ix_advertisements_owner_id'), 'advertisements', ['owner_id'], unique=False,
+    )
+    op.drop_index('ix_advertisements_owner_id_id', table_name='advertisements')
@@ -0,0 +1,158 @@
+"""advertisement_partitions
+
+Revision ID: 8c5830f9ec24
+Revises: e748f27c8bfa
+Create Date: 2026-10-18 19:12:40.227603
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5830f9ec24'
+down_revision: Union[str, None] = 'e748f27c8bfa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# значения на момент миграции, см. настройки advertisement_lifecycle
+LIFETIME_DAYS = 30
+PREMAKE_DAYS = 7
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+COLUMNS = 'id, category, owner_id, title, price, description, updated_at'
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        'ix_advertisements_category_id', 'advertisements', ['category', 'id'], unique=False,
+    )
+    op.create_index(
+        'ix_advertisements_category_price', 'advertisements', ['category', 'price'], unique=False,
+    )
+    op.create_index(
+        'ix_advertisements_owner_id_id', 'advertisements', ['owner_id', 'id'], unique=False,
+    )
+    op.create_index('ix_advertisements_price', 'advertisements', ['price'], unique=False)
+    op.create_index(
+        'ix_advertisements_search_vector',
+        'advertisements',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def _drop_constraints(table_name: str) -> None:
+    for index_name in (
+        'ix_advertisements_category_id',
+        'ix_advertisements_category_price',
+        'ix_advertisements_owner_id_id',
+        'ix_advertisements_price',
+        'ix_advertisements_search_vector',
+    ):
+        op.drop_index(index_name, table_name=table_name)
+    op.drop_constraint('advertisements_owner_id_fkey', table_name, type_='foreignkey')
+    op.drop_constraint('advertisements_pkey', table_name, type_='primary')
+
+
+def _columns() -> list:
+    return [
+        sa.Column(
+            'id',
+            sa.BigInteger(),
+            server_default=sa.text("nextval('advertisements_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('owner_id', sa.BigInteger(), nullable=True),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('price', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], name='advertisements_owner_id_fkey'),
+    ]
+
+
+def upgrade() -> None:
+    # Миграция копирует все объявления в одной транзакции под блокировкой ACCESS EXCLUSIVE,
+    # чтение и запись объявлений ждут до ее завершения: на большой таблице
+    # ее нужно выполнять в окно обслуживания (см. README).
+    # Существующие объявления получают полный срок жизни от момента миграции,
+    # поэтому после развертывания ни одно объявление не истекает сразу.
+    op.execute('CREATE SCHEMA IF NOT EXISTS archive')
+    op.rename_table('advertisements', 'advertisements_unpartitioned')
+    _drop_constraints('advertisements_unpartitioned')
+    op.execute('ALTER SEQUENCE advertisements_id_seq OWNED BY NONE')
+    op.create_table(
+        'advertisements',
+        *_columns(),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'expires_at', name='advertisements_pkey'),
+        postgresql_partition_by='RANGE (expires_at)',
+    )
+    op.execute('ALTER SEQUENCE advertisements_id_seq OWNED BY advertisements.id')
+    op.execute('CREATE TABLE advertisements_default PARTITION OF advertisements DEFAULT')
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    for day_number in range(LIFETIME_DAYS + PREMAKE_DAYS + 1):
+        day = today + timedelta(days=day_number)
+        op.execute(
+            "CREATE TABLE advertisements_p{0:%Y%m%d} PARTITION OF advertisements "
+            "FOR VALUES FROM ('{0:%Y-%m-%d} 00:00:00+00') TO ('{1:%Y-%m-%d} 00:00:00+00')".format(
+                day, day + timedelta(days=1),
+            ),
+        )
+    _create_indexes()
+    op.execute(
+        'INSERT INTO advertisements ({0}, created_at, expires_at) '
+        "SELECT {0}, updated_at, now() + interval '{1} days' "
+        'FROM advertisements_unpartitioned'.format(
+            COLUMNS, LIFETIME_DAYS,
+        ),
+    )
+    op.drop_table('advertisements_unpartitioned')
+
+
+def downgrade() -> None:
+    # Архивированные секции остаются в схеме archive и в таблицу не возвращаются,
+    # схема удаляется, только если архив пуст.
+    op.rename_table('advertisements', 'advertisements_partitioned')
+    _drop_constraints('advertisements_partitioned')
+    op.execute('ALTER SEQUENCE advertisements_id_seq OWNED BY NONE')
+    op.create_table(
+        'advertisements',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', name='advertisements_pkey'),
+    )
+    op.execute('ALTER SEQUENCE advertisements_id_seq OWNED BY advertisements.id')
+    _create_indexes()
+    op.execute(
+        'INSERT INTO advertisements ({0}) '
+        'SELECT {0} FROM advertisements_partitioned'.format(COLUMNS),
+    )
+    op.drop_table('advertisements_partitioned')
+    op.execute('DROP SCHEMA archive')
@@ -0,0 +1,61 @@
+"""advertisement_changes
+
+Revision ID: fea73e071a6b
+Revises: 8c5830f9ec24
+Create Date: 2026-10-18 21:04:37.216845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fea73e071a6b'
+down_revision: Union[str, None] = '8c5830f9ec24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# см. CHANGE_COUNTER_ID в models/advertisement_change.py
+CHANGE_COUNTER_ID = 1
+
+
+def upgrade() -> None:
+    op.create_table(
+        'advertisement_changes',
+        sa.Column('ad_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'changed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('ad_id'),
+        sa.UniqueConstraint('seq'),
+    )
+    op.create_table(
+        'advertisement_change_counter',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('last_seq', sa.BigInteger(), nullable=False),
+        sa.Column('purged_seq', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Существующие объявления попадают в журнал,
+    # чтобы синхронизация с since=0 получала весь каталог.
+    op.execute(
+        'INSERT INTO advertisement_changes (ad_id, seq, deleted, expires_at) '
+        'SELECT id, row_number() OVER (ORDER BY id), false, expires_at FROM advertisements',
+    )
+    op.execute(
+        'INSERT INTO advertisement_change_counter (id, last_seq, purged_seq) '
+        'SELECT {0}, count(*), 0 FROM advertisement_changes'.format(CHANGE_COUNTER_ID),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('advertisement_change_counter')
+    op.drop_table('advertisement_changes')
@@ -0,0 +1,54 @@
+"""advertisement_ids
+
+Revision ID: af1f2994a4e7
+Revises: fea73e071a6b
+Create Date: 2026-10-18 23:41:09.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'af1f2994a4e7'
+down_revision: Union[str, None] = 'fea73e071a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# см. FACET_EXPIRY_ID в models/advertisement_facet.py
+FACET_EXPIRY_ID = 1
+
+
+def upgrade() -> None:
+    op.create_table(
+        'advertisement_ids',
+        sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Повторяющийся id в таблице объявлений прерывает миграцию нарушением первичного ключа.
+    op.execute(
+        'INSERT INTO advertisement_ids (id, expires_at) SELECT id, expires_at FROM advertisements',
+    )
+    op.create_table(
+        'advertisement_facet_expiry',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('expired_until', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Истекшие, но еще не архивированные объявления учтены в фасетах
+    # и будут вычтены при первой архивации.
+    op.execute(
+        'INSERT INTO advertisement_facet_expiry (id, expired_until) VALUES ({0}, NULL)'.format(
+            FACET_EXPIRY_ID,
+        ),
+    )
+
+
+def downgrade() -> None:
+    # Объявления, вычтенные из фасетов до архивации, остаются вычтенными,
+    # счетчики восстанавливаются командой python -m src.app.rebuild_facets.
+    op.drop_table('advertisement_facet_expiry')
+    op.drop_table('advertisement_ids')
@@ -0,0 +1,54 @@
+"""advertisement_change_sequence
+
+Revision ID: 182408765fde
+Revises: af1f2994a4e7
+Create Date: 2026-10-19 00:27:51.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '182408765fde'
+down_revision: Union[str, None] = 'af1f2994a4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# см. CHANGE_COUNTER_ID и CHANGE_SEQUENCE в models/advertisement_change.py
+CHANGE_COUNTER_ID = 1
+CHANGE_SEQUENCE = 'advertisement_change_seq'
+WATERMARK_COLUMNS = ('safe_seq', 'pending_seq', 'pending_xmax')
+
+
+def upgrade() -> None:
+    op.execute('CREATE SEQUENCE {0}'.format(CHANGE_SEQUENCE))
+    for column_name in WATERMARK_COLUMNS:
+        op.add_column(
+            'advertisement_change_counter',
+            sa.Column(column_name, sa.BigInteger(), server_default='0', nullable=False),
+        )
+    op.alter_column('advertisement_change_counter', 'pending_seq', server_default=None)
+    op.alter_column('advertisement_change_counter', 'pending_xmax', server_default=None)
+    # Изменения, записанные до миграции, зафиксированы и сразу видны читателям.
+    op.execute(
+        "SELECT setval('{0}', greatest(last_seq, 1), last_seq > 0) "
+        'FROM advertisement_change_counter WHERE id = {1}'.format(
+            CHANGE_SEQUENCE, CHANGE_COUNTER_ID,
+        ),
+    )
+    op.execute(
+        'UPDATE advertisement_change_counter SET safe_seq = last_seq, pending_seq = last_seq',
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        'UPDATE advertisement_change_counter '
+        "SET last_seq = coalesce(pg_sequence_last_value('{0}'), last_seq)".format(CHANGE_SEQUENCE),
+    )
+    for column_name in reversed(WATERMARK_COLUMNS):
+        op.drop_column('advertisement_change_counter', column_name)
+    op.execute('DROP SEQUENCE {0}'.format(CHANGE_SEQUENCE))
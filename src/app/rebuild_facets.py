@@ -0,0 +1,36 @@
+"""Модуль пересчитывает сводную таблицу фасетов объявлений.
+
+Запуск из корня проекта:
+
+    poetry run python -m src.app.rebuild_facets
+"""
+
+import asyncio
+import sys
+
+from src.app.data_sources.adaptor import close_engine, create_session, init_database
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+
+
+async def rebuild() -> int:
+    """Пересчитать фасеты в отдельной транзакции.
+
+    Returns:
+        int: количество строк в сводной таблице
+    """
+    init_database()
+    try:  # noqa: WPS501
+        async with create_session() as session:
+            return await AdvertisementFacetStorage().rebuild_facets(session=session)
+    finally:
+        await close_engine()
+
+
+def main():
+    """Пересчитать фасеты и вывести количество строк сводной таблицы."""
+    facet_count = asyncio.run(rebuild())
+    sys.stdout.write('advertisement_facets rebuilt: {0} rows\n'.format(facet_count))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,60 @@
-"""Модуль является точкой входа в приложение."""
+"""Модуль является точкой входа в приложение.
+
+Родительский процесс только запускает воркеры, поэтому модули приложения
+импортируются в фабрике create_app, которая вызывается в каждом воркере.
+"""
+
+import shutil
+from typing import TYPE_CHECKING
 
 import uvicorn
-from fastapi import FastAPI
 
-from src.app.api.advertisements.controller import router as ad_router
-from src.app.api.users.controller import router as users_router
+from src.app.api.metrics.multiprocess import prepare_directory
+from src.app.startup import Startup
 from src.config.config import settings
 
-app = FastAPI()
-app.include_router(users_router)
-app.include_router(ad_router)
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+APP_FACTORY = 'src.app.service:create_app'
+
+
+def create_app() -> 'FastAPI':
+    """Создать приложение.
+
+    Вызывается в каждом процессе воркера.
+
+    Returns:
+        FastAPI: приложение
+    """
+    startup = Startup()
+    with startup.measure('imports'):
+        from src.app.worker import build_app  # noqa: WPS433
+    return build_app(startup)
+
+
+def main():
+    """Запустить сервис с параметрами из конфигурации."""
+    workers = settings.service.worker_count
+    metrics_directory = prepare_directory() if workers > 1 else None
+    try:  # noqa: WPS501
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=settings.service.host,
+            port=settings.service.port,
+            workers=workers,
+            loop=settings.service.loop,
+            http=settings.service.http,
+            backlog=settings.service.backlog,
+            timeout_keep_alive=settings.service.timeout_keep_alive,
+            timeout_graceful_shutdown=settings.service.timeout_graceful_shutdown,
+            access_log=settings.service.access_log,
+        )
+    finally:
+        if metrics_directory:
+            shutil.rmtree(metrics_directory, ignore_errors=True)
 
 
 if __name__ == '__main__':
-    uvicorn.run(
-        app,
-        host=settings.service.host,
-        port=settings.service.port,
-    )
+    main()
@@ -0,0 +1,120 @@
+"""Модуль содержит подготовку воркера к обслуживанию запросов и учет времени запуска.
+
+Модуль импортируется в родительском процессе сервиса, который только запускает воркеры,
+поэтому модули приложения и sqlalchemy импортируются внутри функций.
+"""
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator
+
+from src.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupReport(object):
+    """Готовность воркера и длительность этапов запуска в секундах."""
+
+    ready: bool
+    phases: dict[str, float]
+
+
+class Startup(object):
+    """Этапы запуска воркера: импорт приложения, создание движков, прогрев пула и запросов.
+
+    Воркер готов к обслуживанию запросов после прогрева. Если прогрев при запуске
+    не удался (например, бд недоступна), он повторяется при проверке готовности.
+    """
+
+    def __init__(self):
+        """Создание учета запуска."""
+        self.ready = False
+        self._stopping = False
+        self._phases: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Измерить длительность этапа запуска.
+
+        Args:
+            phase (str): название этапа
+
+        Yields:
+            None: выполняется этап
+        """
+        started_at = perf_counter()
+        try:  # noqa: WPS501
+            yield
+        finally:
+            self._phases[phase] = perf_counter() - started_at
+
+    async def warm_up(self):
+        """Открыть соединения пула и подготовить основные запросы.
+
+        Raises:
+            TimeoutError: прогрев не завершился за postgres.warmup_timeout секунд
+        """
+        async with self._lock:
+            if self.ready or self._stopping:
+                return
+            from src.app.data_sources.adaptor import get_database  # noqa: WPS433
+
+            try:
+                await asyncio.wait_for(
+                    self._warm_up_pools(get_database()),
+                    settings.postgres.warmup_timeout,
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError('Прогрев пула соединений не завершился вовремя')
+            self.ready = True
+        logger.info('Воркер готов, длительность этапов запуска: {0}'.format(self.report().phases))
+
+    def stop(self):
+        """Отметить, что воркер останавливается и не принимает новые запросы."""
+        self._stopping = True
+        self.ready = False
+
+    def report(self) -> StartupReport:
+        """Получить готовность воркера и длительность этапов запуска.
+
+        Returns:
+            StartupReport: готовность и длительность этапов, включая чтение конфигурации
+        """
+        phases = {'config': settings.load_seconds or 0, **self._phases}
+        return StartupReport(
+            ready=self.ready,
+            phases={phase: round(seconds, 6) for phase, seconds in phases.items()},
+        )
+
+    async def _warm_up_pools(self, database):
+        from src.app.data_sources.database import open_connections  # noqa: WPS433
+
+        async with AsyncExitStack() as stack:
+            with self.measure('pool'):
+                connections = []
+                for engine in database.engines:
+                    connections.extend(await stack.enter_async_context(
+                        open_connections(engine, settings.postgres.warmup_connections),
+                    ))
+            with self.measure('statements'):
+                await asyncio.gather(*(
+                    _prepare_statements(database, connection)
+                    for connection in connections
+                ))
+
+
+async def _prepare_statements(database, connection):
+    from src.app.data_sources.storages.advertisement_storage import (  # noqa: WPS433
+        AdvertisementStorage,
+    )
+    from src.app.data_sources.storages.user_storage import UserStorage  # noqa: WPS433
+
+    async with database.session_factory(bind=connection) as session:
+        await AdvertisementStorage().warm_up(session=session)
+        await UserStorage().warm_up(session=session)
@@ -4,21 +4,28 @@ from datetime import datetime, timedelta
 
 from jose import jwt
 
+from src.app.data_sources.dtos.user import User
 from src.config.config import settings
 
 
-def create_access_token(user_id: int) -> str:
+def create_access_token(user: User) -> str:
     """Функция для создания jwt токена.
 
+    Помимо id токен содержит имя пользователя, признак администратора и версию токенов,
+    что позволяет проверять токен без загрузки пользователя из бд.
+
     Args:
-        user_id (int): id пользователя
+        user (User): пользователь
 
     Returns:
         str: jwt токен
     """
     expire = datetime.utcnow() + timedelta(days=settings.access_token.expire_days)
     to_encode = {
-        'sub': str(user_id),
+        'sub': str(user.user_id),
+        'username': user.username,
+        'adm': user.is_admin,
+        'ver': user.token_version,
         'exp': expire,
     }
     return jwt.encode(
@@ -1,10 +1,10 @@
 """Модуль содержащий функции для аутентификации пользователя."""
 
-from bcrypt import checkpw
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.data_sources.dtos.user import User
 from src.app.data_sources.storages.user_storage import UserStorage
+from src.app.users.password import password_hasher_component
 
 
 async def authenticate_user(
@@ -15,6 +15,8 @@ async def authenticate_user(
 ) -> User | None:
     """Метод для проверки пароля пользователя.
 
+    Если очередь проверки паролей заполнена, пробрасывается PasswordHasherOverloadedError.
+
     Args:
         storage (UserStorage): хранилище пользователей
         session(AsyncSession): сессия подключения к бд
@@ -27,5 +29,5 @@ async def authenticate_user(
     user = await storage.get_user_by_username(session=session, username=username)
     if not user:
         return None
-    if checkpw(password.encode(), user.password_hash.encode()):
+    if await password_hasher_component.get().verify(password, user.password_hash):
         return user
@@ -0,0 +1,136 @@
+"""Модуль для хеширования и проверки паролей вне цикла событий.
+
+bcrypt отпускает GIL на время вычисления хеша, поэтому достаточно пула потоков:
+цикл событий продолжает обслуживать другие запросы, пока хеш считается.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, TypeVar
+
+from bcrypt import checkpw, gensalt, hashpw
+
+from src.app.component import Component
+from src.config.config import settings
+
+_ResultType = TypeVar('_ResultType')
+
+
+class PasswordHasherOverloadedError(Exception):
+    """Очередь пула хеширования паролей заполнена."""
+
+
+@dataclass
+class PasswordHasherStats(object):
+    """Статистика пула хеширования паролей."""
+
+    workers: int
+    max_queue: int
+    in_progress: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class PasswordHasher(object):
+    """Ограниченный пул потоков для операций bcrypt."""
+
+    def __init__(self, workers: int, max_queue: int):
+        """Создание пула.
+
+        Args:
+            workers (int): количество потоков
+            max_queue (int): максимальное количество операций, ожидающих свободный поток
+        """
+        self._workers = workers
+        self._max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait: float = 0
+        self._max_wait: float = 0
+
+    async def hash(self, password: str) -> str:
+        """Получить bcrypt хеш пароля.
+
+        Args:
+            password (str): пароль
+
+        Returns:
+            str: хеш пароля
+        """
+        password_hash = await self._run(hashpw, password.encode(), gensalt())
+        return password_hash.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Проверить пароль.
+
+        Args:
+            password (str): пароль
+            password_hash (str): хеш пароля
+
+        Returns:
+            bool: пароль соответствует хешу
+        """
+        return await self._run(checkpw, password.encode(), password_hash.encode())
+
+    def stats(self) -> PasswordHasherStats:
+        """Получить статистику пула.
+
+        Returns:
+            PasswordHasherStats: статистика пула
+        """
+        return PasswordHasherStats(
+            workers=self._workers,
+            max_queue=self._max_queue,
+            in_progress=min(self._pending, self._workers),
+            queue_depth=max(self._pending - self._workers, 0),
+            completed=self._completed,
+            rejected=self._rejected,
+            total_wait_seconds=self._total_wait,
+            max_wait_seconds=self._max_wait,
+        )
+
+    def shutdown(self):
+        """Дождаться завершения начатых операций и остановить потоки пула."""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., _ResultType], *args) -> _ResultType:
+        if self._pending >= self._workers + self._max_queue:
+            self._rejected += 1
+            raise PasswordHasherOverloadedError('Сервис перегружен, повторите запрос позже')
+
+        submitted_at = perf_counter()
+
+        def job() -> tuple[float, _ResultType]:  # noqa: WPS430
+            return perf_counter() - submitted_at, func(*args)
+
+        self._pending += 1
+        try:  # noqa: WPS501
+            wait, job_result = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+        self._completed += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        return job_result
+
+
+def create_password_hasher() -> PasswordHasher:
+    """Создать пул хеширования паролей по настройкам password_hasher.
+
+    Returns:
+        PasswordHasher: пул хеширования паролей
+    """
+    return PasswordHasher(
+        workers=settings.password_hasher.workers,
+        max_queue=settings.password_hasher.max_queue,
+    )
+
+
+password_hasher_component: Component[PasswordHasher] = Component('password_hasher')
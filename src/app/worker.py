@@ -0,0 +1,52 @@
+"""Модуль содержит сборку приложения в процессе воркера.
+
+Модуль импортируется фабрикой create_app из src.app.service, то есть только
+в процессах воркеров, поэтому модули приложения импортируются здесь напрямую.
+"""
+
+from fastapi import FastAPI
+
+from src.app.api.advertisements.catalog import router as catalog_router
+from src.app.api.advertisements.controller import router as ad_router
+from src.app.api.advertisements.publication import router as publication_router
+from src.app.api.metrics.controller import router as metrics_router
+from src.app.api.metrics.middleware import PrometheusMiddleware
+from src.app.api.rate_limit.middleware import RateLimitMiddleware
+from src.app.api.rate_limit.store import create_store
+from src.app.api.request_id.middleware import RequestIdMiddleware
+from src.app.api.service.controller import router as service_router
+from src.app.api.users.controller import router as users_router
+from src.app.components import create_components
+from src.app.lifespan import lifespan
+from src.app.startup import Startup
+from src.config.config import settings
+
+ROUTERS = (
+    users_router,
+    catalog_router,
+    ad_router,
+    publication_router,
+    service_router,
+    metrics_router,
+)
+
+
+def build_app(startup: Startup) -> FastAPI:
+    """Собрать приложение: объекты воркера, middleware, роутеры и жизненный цикл.
+
+    Args:
+        startup (Startup): учет запуска воркера
+
+    Returns:
+        FastAPI: приложение
+    """
+    app = FastAPI(lifespan=lifespan)
+    app.state.startup = startup
+    create_components()
+    if settings.rate_limit.enabled:
+        app.add_middleware(RateLimitMiddleware, store=create_store())
+    app.add_middleware(PrometheusMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    for router in ROUTERS:
+        app.include_router(router)
+    return app
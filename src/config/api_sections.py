@@ -0,0 +1,117 @@
+"""Модуль содержит секции настроек сервера, бд, аутентификации и HTTP."""
+
+import os
+from typing import Literal
+
+from src.config.base import SettingsModel
+
+
+class ServiceSettings(SettingsModel):
+    """Параметры запуска сервера и воркеров."""
+
+    host: str
+    port: int
+    workers: int | None
+    loop: Literal['auto', 'asyncio', 'uvloop']
+    http: Literal['auto', 'h11', 'httptools']
+    backlog: int
+    timeout_keep_alive: int
+    timeout_graceful_shutdown: int
+    access_log: bool
+    metrics_token: str | None
+    metrics_interval_seconds: float
+
+    @property
+    def worker_count(self) -> int:
+        """Количество воркеров: из настроек или по числу процессоров.
+
+        Returns:
+            int: количество воркеров
+        """
+        return self.workers or os.cpu_count() or 1
+
+
+class AccessTokenSettings(SettingsModel):
+    """Параметры токенов доступа."""
+
+    token_type: str
+    expire_days: int
+    secret: str
+    stateless_claims: bool
+
+
+class PostgresSettings(SettingsModel):
+    """Параметры подключения к основной бд, реплик и пулов соединений."""
+
+    login: str
+    password: str
+    db_name: str
+    host: str
+    port: int
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_cache_size: int
+    replicas: list[str]
+    replica_selection: Literal['round_robin', 'least_connections']
+    warmup_connections: int
+    warmup_timeout: float
+
+    @property
+    def url(self):
+        """Адрес сервера бд с учетными данными.
+
+        Returns:
+            str: строка login:password@host:port
+        """
+        return '{0}:{1}@{2}:{3}'.format(
+            self.login,
+            self.password,
+            self.host,
+            self.port,
+        )
+
+    @property
+    def uri(self):
+        """Адрес подключения к основной бд для sqlalchemy.
+
+        Returns:
+            str: адрес подключения
+        """
+        return 'postgresql+asyncpg://{0}/{1}'.format(self.url, self.db_name)
+
+
+class PasswordHasherSettings(SettingsModel):
+    """Параметры пула хеширования паролей."""
+
+    workers: int
+    max_queue: int
+
+
+class HttpCacheSettings(SettingsModel):
+    """Заголовки кеширования ответов HTTP."""
+
+    max_age: int
+    s_maxage: int
+    stale_while_revalidate: int
+
+
+class RateLimitRuleSettings(SettingsModel):
+    """Лимит частоты запросов маршрута."""
+
+    rate: float
+    burst: int
+    keys: list[Literal['ip', 'username', 'ip_username', 'subject']]
+
+
+class RateLimitSettings(SettingsModel):
+    """Параметры ограничения частоты запросов."""
+
+    enabled: bool
+    backend: Literal['memory', 'redis']
+    redis_url: str
+    max_keys: int
+    max_body_size: int
+    routes: dict[str, RateLimitRuleSettings]
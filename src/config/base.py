@@ -0,0 +1,47 @@
+"""Модуль содержит базовую модель настроек, читаемых из config.yml и переменных окружения."""
+
+from pathlib import Path
+
+import yaml
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SettingsModel(BaseSettings):
+    """Модель настроек: значения из переменных окружения EMP_* важнее значений из файла."""
+
+    model_config = SettingsConfigDict(env_prefix='EMP_', env_nested_delimiter='_')
+
+    @classmethod
+    def from_yaml(cls, config_path: str) -> 'SettingsModel':
+        """Загрузить настройки из yaml файла.
+
+        Args:
+            config_path (str): путь к файлу конфигурации
+
+        Returns:
+            SettingsModel: настройки
+        """
+        return cls(**yaml.safe_load(Path(config_path).read_text()))
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls,
+        init_settings,
+        env_settings,
+        dotenv_settings,
+        file_secret_settings,
+    ):
+        """Задать приоритет источников: переменные окружения важнее файла.
+
+        Args:
+            settings_cls: класс настроек
+            init_settings: значения из файла конфигурации
+            env_settings: значения из переменных окружения
+            dotenv_settings: значения из .env файла, не используются
+            file_secret_settings: значения из файлов секретов
+
+        Returns:
+            tuple: источники в порядке приоритета
+        """
+        return env_settings, init_settings, file_secret_settings
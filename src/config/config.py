@@ -2,71 +2,71 @@
 Модуль для конфигурации проекта.
 
 Позволяет импортировать конфигурацию из config.yml файла.
+Файл читается при первом обращении к настройкам, а не при импорте модуля.
 """
 
-from pathlib import Path
-
-import yaml
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-
-class _SettingsModel(BaseSettings):
-    model_config = SettingsConfigDict(env_prefix='EMP_', env_nested_delimiter='_')
-
-    @classmethod
-    def from_yaml(cls, config_path: str) -> '_SettingsModel':
-        return cls(**yaml.safe_load(Path(config_path).read_text()))
-
-    @classmethod
-    def settings_customise_sources(
-        cls,
-        settings_cls,
-        init_settings,
-        env_settings,
-        dotenv_settings,
-        file_secret_settings,
-    ):
-        return env_settings, init_settings, file_secret_settings
-
-
-class _ServiceSettings(_SettingsModel):
-    host: str
-    port: int
-
-
-class _AccessTokenSetting(_SettingsModel):
-    token_type: str
-    expire_days: int
-    secret: str
-
-
-class _PostgresSettings(_SettingsModel):
-    login: str
-    password: str
-    db_name: str
-    host: str
-    port: int
-
-    @property
-    def url(self):
-        return '{0}:{1}@{2}:{3}'.format(
-            self.login,
-            self.password,
-            self.host,
-            self.port,
-        )
-
-    @property
-    def uri(self):
-        return 'postgresql+asyncpg://{0}/{1}'.format(self.url, self.db_name)
-
-
-class Settings(_SettingsModel):
+from time import perf_counter
+from typing import Any
+
+from src.config.api_sections import (
+    AccessTokenSettings,
+    HttpCacheSettings,
+    PasswordHasherSettings,
+    PostgresSettings,
+    RateLimitSettings,
+    ServiceSettings,
+)
+from src.config.base import SettingsModel
+from src.config.storage_sections import (
+    AdvertisementCacheSettings,
+    AdvertisementLifecycleSettings,
+    CacheSettings,
+    SingleFlightSettings,
+    SlowQuerySettings,
+    WriteBatchingSettings,
+)
+
+
+class Settings(SettingsModel):
     """Настройки сервиса."""
 
-    service: _ServiceSettings
-    access_token: _AccessTokenSetting
-    postgres: _PostgresSettings
-
-
-settings = Settings.from_yaml('src/config/config.yml')
+    service: ServiceSettings
+    access_token: AccessTokenSettings
+    postgres: PostgresSettings
+    password_hasher: PasswordHasherSettings
+    user_cache: CacheSettings
+    token_version_cache: CacheSettings
+    advertisement_cache: AdvertisementCacheSettings
+    http_cache: HttpCacheSettings
+    rate_limit: RateLimitSettings
+    advertisement_batching: WriteBatchingSettings
+    single_flight: SingleFlightSettings
+    slow_queries: SlowQuerySettings
+    advertisement_lifecycle: AdvertisementLifecycleSettings
+
+
+class _LazySettings(object):
+    """Настройки, загружаемые из файла конфигурации при первом обращении."""
+
+    def __init__(self, config_path: str):
+        self._config_path = config_path
+        self._settings: Settings | None = None
+        self.load_seconds: float | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def load(self) -> Settings:
+        """Загрузить настройки, если они еще не загружены.
+
+        Returns:
+            Settings: настройки сервиса
+        """
+        if self._settings is None:
+            started_at = perf_counter()
+            self._settings = Settings.from_yaml(self._config_path)
+            self.load_seconds = perf_counter() - started_at
+        return self._settings
+
+
+settings = _LazySettings('src/config/config.yml')
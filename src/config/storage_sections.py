@@ -0,0 +1,60 @@
+"""Модуль содержит секции настроек кешей, записи и жизненного цикла объявлений."""
+
+from typing import Literal
+
+from src.config.base import SettingsModel
+
+
+class CacheSettings(SettingsModel):
+    """Параметры кеша в памяти процесса."""
+
+    max_size: int
+    ttl_seconds: float
+
+
+class AdvertisementCacheSettings(CacheSettings):
+    """Параметры кеша объявлений."""
+
+    backend: Literal['memory', 'redis']
+    redis_url: str
+    negative_ttl_seconds: float
+    invalidated_ttl_seconds: float
+    multi_worker_ttl_seconds: float
+    invalidation_interval_seconds: float
+
+
+class SingleFlightSettings(SettingsModel):
+    """Параметры объединения одинаковых параллельных чтений."""
+
+    enabled: bool
+    wait_timeout_seconds: float
+
+
+class WriteBatchingSettings(SettingsModel):
+    """Параметры групповой записи объявлений."""
+
+    enabled: bool
+    max_delay_ms: float
+    max_rows: int
+
+
+class AdvertisementLifecycleSettings(SettingsModel):
+    """Параметры срока жизни и архивации объявлений."""
+
+    lifetime_days: int
+    archive_after_days: int
+    premake_days: int
+    archiver_enabled: bool
+    archive_interval_seconds: float
+    detach_lock_timeout_ms: int
+    tombstone_retention_days: int
+    safe_seq_interval_seconds: float
+
+
+class SlowQuerySettings(SettingsModel):
+    """Параметры журнала медленных запросов."""
+
+    threshold_ms: float
+    capacity: int
+    explain_sample_rate: float
+    explain_timeout_ms: int
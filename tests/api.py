@@ -0,0 +1,87 @@
+"""Модуль содержит запросы к API, общие для тестов."""
+
+import httpx
+from fastapi import status
+
+BASE_URL = 'http://test'
+PASSWORD = 'test-password'  # noqa: S105
+
+
+async def register(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    """Зарегистрировать пользователя.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        username (str): имя пользователя
+
+    Returns:
+        httpx.Response: ответ регистрации
+    """
+    return await client.post('/api/users/register', json={
+        'username': username,
+        'password': PASSWORD,
+    })
+
+
+async def login(client: httpx.AsyncClient, username: str) -> dict[str, str]:
+    """Получить заголовки авторизации зарегистрированного пользователя.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        username (str): имя пользователя
+
+    Returns:
+        dict[str, str]: заголовок Authorization с токеном доступа
+    """
+    response = await client.post('/api/users/auth', data={
+        'username': username,
+        'password': PASSWORD,
+    })
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return {'Authorization': 'Bearer {0}'.format(response.json()['access_token'])}
+
+
+async def register_and_login(client: httpx.AsyncClient, username: str) -> dict[str, str]:
+    """Зарегистрировать пользователя и получить заголовки авторизации.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        username (str): имя пользователя
+
+    Returns:
+        dict[str, str]: заголовок Authorization с токеном доступа
+    """
+    response = await register(client, username)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return await login(client, username)
+
+
+def advertisement(title: str, price: int = 1, category: str = 'Sell') -> dict:
+    """Тело запроса создания объявления.
+
+    Args:
+        title (str): заголовок
+        price (int): стоимость
+        category (str): категория
+
+    Returns:
+        dict: поля объявления
+    """
+    return {'category': category, 'title': title, 'price': price, 'description': 'description'}
+
+
+async def create_advertisements(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    advertisements: list[dict],
+):
+    """Создать объявления по одному.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        headers (dict[str, str]): заголовки авторизации владельца
+        advertisements (list[dict]): тела запросов создания
+    """
+    for body in advertisements:
+        response = await client.post('/api/advertisements/create', headers=headers, json=body)
+        assert response.status_code == status.HTTP_200_OK, response.text
@@ -0,0 +1,100 @@
+"""Общие фикстуры тестов.
+
+Приложение работает на sqlite файле во временном каталоге теста, как бенчмарк
+с --backend sqlite: схема создается по orm моделям. Модуль тестов может переопределить
+фикстуру database_backend, чтобы выполнить тесты и на postgres из конфигурации сервиса
+со схемой, созданной миграциями (как бенчмарк с --backend postgres --reset).
+Асинхронные тесты выполняются плагином anyio, запросы отправляются через ASGI транспорт httpx.
+Жизненный цикл приложения не запускается: фоновые задачи в тестах не нужны.
+"""
+
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from benchmarks import database
+from src.config.config import settings
+from tests.api import BASE_URL
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Асинхронные тесты выполняются в цикле asyncio.
+
+    Returns:
+        str: имя бэкенда anyio
+    """
+    return 'asyncio'
+
+
+@pytest.fixture
+def rate_limit_enabled() -> bool:
+    """Ограничение частоты запросов, модуль тестов может переопределить фикстуру.
+
+    Returns:
+        bool: включено ли ограничение частоты запросов
+    """
+    return False
+
+
+@pytest.fixture
+def database_backend() -> str:
+    """Бд приложения, модуль тестов может переопределить фикстуру.
+
+    Returns:
+        str: sqlite или postgres
+    """
+    return 'sqlite'
+
+
+@pytest.fixture
+async def app(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    rate_limit_enabled: bool,
+    database_backend: str,
+) -> AsyncIterator[FastAPI]:
+    """Приложение с пустой бд.
+
+    Таблицы postgres очищаются перед тестом.
+
+    Args:
+        tmp_path (Path): временный каталог теста
+        monkeypatch (pytest.MonkeyPatch): подмена настроек на время теста
+        rate_limit_enabled (bool): включено ли ограничение частоты запросов
+        database_backend (str): sqlite или postgres
+
+    Yields:
+        FastAPI: приложение
+    """
+    from src.app.components import close_components  # noqa: WPS433
+    from src.app.service import create_app  # noqa: WPS433
+
+    monkeypatch.setattr(settings.rate_limit, 'enabled', rate_limit_enabled)
+    if database_backend == 'postgres':
+        database.use_postgres()
+    else:
+        database.use_sqlite(str(tmp_path / 'test.sqlite3'))
+    application = create_app()
+    await database.prepare_schema(database_backend, reset=True)
+    yield application
+    await close_components()
+    await database.dispose()
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """Клиент приложения.
+
+    Args:
+        app (FastAPI): приложение
+
+    Yields:
+        httpx.AsyncClient: клиент
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as test_client:
+        yield test_client
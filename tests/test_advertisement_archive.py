@@ -0,0 +1,155 @@
+"""Тесты архивации объявлений с истекшим сроком жизни.
+
+На sqlite истекшие объявления удаляются, на postgres секция истекшего дня отсоединяется
+и переносится в схему archive. Тесты на postgres выполняются, если задана переменная
+окружения TEST_POSTGRES: бд из конфигурации сервиса должна быть создана миграциями,
+ее таблицы очищаются.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, text, update
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.models import AdvertisementAlchemyModel, AdvertisementIdAlchemyModel
+from src.app.data_sources.storages.advertisement_archiver import archiver_component
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+POSTGRES = 'postgres'
+TEST_POSTGRES_ENV = 'TEST_POSTGRES'
+EXPIRED_DAY = datetime(2020, 1, 1, tzinfo=timezone.utc)  # noqa: WPS432
+EXPIRED_PARTITION = 'advertisements_p20200101'
+ADVERTISEMENTS_COUNT = 4
+ARCHIVED_IDS = (1, 3)
+REMAINING_IDS = (2, 4)
+EXPIRED_AT = EXPIRED_DAY + timedelta(hours=12)  # noqa: WPS432
+PARTITION_BOUNDS = "FOR VALUES FROM ('{0}') TO ('{1}')".format(
+    EXPIRED_DAY.isoformat(),
+    (EXPIRED_DAY + timedelta(days=1)).isoformat(),
+)
+
+
+@pytest.fixture(params=['sqlite', POSTGRES])
+def database_backend(request: pytest.FixtureRequest) -> str:
+    """Тесты модуля выполняются на sqlite и, если задан TEST_POSTGRES, на postgres.
+
+    Args:
+        request (pytest.FixtureRequest): параметр фикстуры
+
+    Returns:
+        str: sqlite или postgres
+    """
+    if request.param == POSTGRES and TEST_POSTGRES_ENV not in os.environ:
+        pytest.skip('postgres для тестов не задан ({0})'.format(TEST_POSTGRES_ENV))
+    return request.param
+
+
+@pytest.fixture
+async def headers(
+    client: httpx.AsyncClient,
+    database_backend: str,
+) -> AsyncIterator[dict[str, str]]:
+    """Владелец объявлений, у части которых истек срок жизни.
+
+    На postgres истекшие объявления переносятся обновлением expires_at
+    в секцию истекшего дня, после теста секция удаляется.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        database_backend (str): sqlite или postgres
+
+    Yields:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    owner_headers = await register_and_login(client, 'owner')
+    await create_advertisements(client, owner_headers, [
+        advertisement('title {0}'.format(index))
+        for index in range(ADVERTISEMENTS_COUNT)
+    ])
+    if database_backend == POSTGRES:
+        await _execute('CREATE TABLE {0} PARTITION OF advertisements {1}'.format(
+            EXPIRED_PARTITION,
+            PARTITION_BOUNDS,
+        ))
+    await _expire(ARCHIVED_IDS)
+    yield owner_headers
+    if database_backend == POSTGRES:
+        await _execute('DROP TABLE IF EXISTS archive.{0}'.format(EXPIRED_PARTITION))
+        await _execute('DROP TABLE IF EXISTS {0}'.format(EXPIRED_PARTITION))
+
+
+async def _execute(statement: str):
+    async with create_session() as session:
+        await session.execute(text(statement))
+        await session.commit()
+
+
+async def _expire(ad_ids: tuple[int, ...]):
+    async with create_session() as session:
+        for model in (AdvertisementAlchemyModel, AdvertisementIdAlchemyModel):
+            await session.execute(
+                update(model).where(model.id.in_(ad_ids)).values(expires_at=EXPIRED_AT),
+            )
+        await session.commit()
+
+
+async def _ids(model) -> tuple[int, ...]:
+    async with create_session() as session:
+        ad_ids = await session.execute(select(model.id).order_by(model.id))
+    return tuple(ad_ids.scalars())
+
+
+async def test_archive_keeps_ids_consistent(headers: dict[str, str]):
+    """Архивация убирает истекшие объявления вместе с их строками advertisement_ids."""
+    archive_result = await archiver_component.get().archive()
+
+    assert archive_result.archived_advertisements == len(ARCHIVED_IDS)
+    assert await _ids(AdvertisementAlchemyModel) == REMAINING_IDS
+    assert await _ids(AdvertisementIdAlchemyModel) == REMAINING_IDS
+
+
+async def test_archived_ids_are_not_found(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Архивированные id не находятся, новые объявления получают новые id."""
+    await archiver_component.get().archive()
+    archived_id = ARCHIVED_IDS[0]
+
+    fetched = await client.get('/api/advertisements/{0}'.format(archived_id))
+    deleted = await client.delete('/api/advertisements/{0}'.format(archived_id), headers=headers)
+    created = await client.post('/api/advertisements/bulk', headers=headers, json={
+        'items': [advertisement('new')],
+    })
+
+    assert fetched.status_code == status.HTTP_404_NOT_FOUND
+    assert deleted.status_code == status.HTTP_404_NOT_FOUND
+    assert created.json()['created_ids'] == [ADVERTISEMENTS_COUNT + 1]
+
+
+async def test_archive_is_idempotent(headers: dict[str, str]):
+    """Повторная архивация ничего не архивирует и не изменяет id."""
+    await archiver_component.get().archive()
+
+    archive_result = await archiver_component.get().archive()
+
+    assert archive_result.archived_advertisements == 0
+    assert await _ids(AdvertisementIdAlchemyModel) == REMAINING_IDS
+
+
+async def test_partition_moves_to_archive_schema(database_backend: str, headers: dict[str, str]):
+    """На postgres строки секции истекшего дня переносятся в схему archive."""
+    if database_backend != POSTGRES:
+        pytest.skip('секции есть только на postgres')
+    await archiver_component.get().archive()
+
+    async with create_session() as session:
+        archived_count = (await session.execute(
+            select(func.count()).select_from(text('archive.{0}'.format(EXPIRED_PARTITION))),
+        )).scalar_one()
+
+    assert archived_count == len(ARCHIVED_IDS)
@@ -0,0 +1,153 @@
+"""Тесты групповой записи объявлений.
+
+Хранилище заменено записывающим вызовы, сессия бд открывается на sqlite приложения.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.data_sources.storages.advertisement_batcher import AdvertisementBatcher
+from src.config.config import settings
+from tests.api import advertisement, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+FAILING = 'failing'
+FIRST = 'first'
+SECOND = 'second'
+MAX_ROWS = 3
+LONG_DELAY_SECONDS = 10
+SHORT_DELAY_SECONDS = 0.01
+
+
+class _Storage(object):
+    """Хранилище, записывающее заголовки пачек и выдающее id по порядку."""
+
+    def __init__(self, error: Exception | None = None):
+        self.batches: list[list[str]] = []
+        self._error = error
+        self._last_id = 0
+
+    async def add_rows(self, session, rows: list[dict]) -> list[int]:
+        titles = [row['title'] for row in rows]
+        self.batches.append(titles)
+        if self._error is not None:
+            raise self._error
+        if FAILING in titles:
+            raise SQLAlchemyError(FAILING)
+        first_id = self._last_id + 1
+        self._last_id += len(rows)
+        return list(range(first_id, self._last_id + 1))
+
+
+def _batcher(storage: _Storage, max_delay_seconds: float) -> AdvertisementBatcher:
+    return AdvertisementBatcher(
+        storage=storage,
+        max_delay_seconds=max_delay_seconds,
+        max_rows=MAX_ROWS,
+    )
+
+
+def _add(batcher: AdvertisementBatcher, title: str) -> asyncio.Task:
+    return asyncio.create_task(batcher.add(
+        category='Sell',
+        owner_id=1,
+        title=title,
+        price=1,
+        description='description',
+    ))
+
+
+async def test_full_batch_is_written_at_once(app: FastAPI):
+    """Пачка из max_rows объявлений записывается сразу одним вызовом без ожидания таймера."""
+    storage = _Storage()
+    batcher = _batcher(storage, LONG_DELAY_SECONDS)
+
+    tasks = [_add(batcher, str(index)) for index in range(MAX_ROWS)]
+
+    ad_ids = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    assert ad_ids == [1, 2, 3]
+    assert storage.batches == [['0', '1', '2']]
+
+
+async def test_partial_batch_is_written_after_delay(app: FastAPI):
+    """Неполная пачка записывается по истечении max_delay."""
+    storage = _Storage()
+    batcher = _batcher(storage, SHORT_DELAY_SECONDS)
+
+    ad_ids = await asyncio.gather(_add(batcher, FIRST), _add(batcher, SECOND))
+
+    assert ad_ids == [1, 2]
+    assert storage.batches == [[FIRST, SECOND]]
+
+
+async def test_close_writes_pending_rows(app: FastAPI):
+    """Остановка записывает накопленные объявления, не дожидаясь таймера."""
+    storage = _Storage()
+    batcher = _batcher(storage, LONG_DELAY_SECONDS)
+    pending = _add(batcher, 'pending')
+    await asyncio.sleep(0)
+
+    await batcher.close()
+
+    assert await pending == 1
+
+
+async def test_failed_batch_is_retried_one_by_one(app: FastAPI):
+    """После ошибки бд пачка пишется по одному, ошибку получает только свой запрос."""
+    storage = _Storage()
+    batcher = _batcher(storage, LONG_DELAY_SECONDS)
+    titles = [FIRST, FAILING, SECOND]
+    tasks = [_add(batcher, title) for title in titles]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert outcomes[0] == 1
+    assert isinstance(outcomes[1], SQLAlchemyError)
+    assert outcomes[2] == 2
+    assert storage.batches == [titles] + [[title] for title in titles]
+
+
+async def test_unexpected_error_is_shared(app: FastAPI):
+    """Ошибка не бд передается всем запросам пачки без повторной записи."""
+    storage = _Storage(error=RuntimeError(FAILING))
+    batcher = _batcher(storage, SHORT_DELAY_SECONDS)
+
+    outcomes = await asyncio.gather(
+        _add(batcher, FIRST),
+        _add(batcher, SECOND),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert len(storage.batches) == 1
+
+
+@pytest.fixture
+def batching_enabled(monkeypatch: pytest.MonkeyPatch):
+    """Групповая запись включается до создания приложения.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): подмена настроек на время теста
+    """
+    monkeypatch.setattr(settings.advertisement_batching, 'enabled', value=True)
+
+
+@pytest.mark.usefixtures('batching_enabled')
+async def test_concurrent_creations_are_batched(client: httpx.AsyncClient):
+    """При включенной групповой записи все параллельно созданные объявления сохраняются."""
+    headers = await register_and_login(client, 'owner')
+    titles = [str(index) for index in range(MAX_ROWS)]
+
+    responses = await asyncio.gather(*(
+        client.post('/api/advertisements/create', headers=headers, json=advertisement(title))
+        for title in titles
+    ))
+    page = (await client.get('/api/advertisements')).json()
+
+    assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+    assert sorted(ad['title'] for ad in page['items']) == titles
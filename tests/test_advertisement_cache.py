@@ -0,0 +1,125 @@
+"""Тесты кеша объявлений в памяти при нескольких воркерах.
+
+Другой воркер имитируется запросом, выполненным с отдельным кешем объявлений.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import status
+
+from src.app.data_sources.caches.advertisement_cache import (
+    MISSING,
+    AdvertisementCache,
+    advertisement_cache_component,
+    create_advertisement_cache,
+)
+from src.app.data_sources.caches.advertisement_cache_invalidator import (
+    AdvertisementCacheInvalidator,
+    cache_invalidator_component,
+)
+from src.app.data_sources.caches.backends import MemoryCacheBackend
+from src.config.config import settings
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+DETAIL_URL = '/api/advertisements/1'
+WORKERS = 4
+TTL_SECONDS = 60
+
+
+@pytest.fixture(autouse=True)
+def multiple_workers(monkeypatch: pytest.MonkeyPatch):
+    """Приложение создается для нескольких воркеров.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): подмена настроек на время теста
+    """
+    monkeypatch.setattr(settings.service, 'workers', WORKERS)
+
+
+@asynccontextmanager
+async def _other_worker() -> AsyncIterator[None]:
+    worker_cache = advertisement_cache_component.get()
+    advertisement_cache_component.set(create_advertisement_cache())
+    try:  # noqa: WPS501
+        yield
+    finally:
+        advertisement_cache_component.set(worker_cache)
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient) -> dict[str, str]:
+    """Заголовки авторизации владельца с одним созданным другим воркером объявлением.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    owner_headers = await register_and_login(client, 'owner')
+    async with _other_worker():
+        await create_advertisements(client, owner_headers, [advertisement('first')])
+    return owner_headers
+
+
+@pytest.fixture
+async def invalidator(headers: dict[str, str]) -> AdvertisementCacheInvalidator:
+    """Сброс кеша, запомнивший номер журнала после создания объявления.
+
+    Args:
+        headers (dict[str, str]): заголовок Authorization владельца
+
+    Returns:
+        AdvertisementCacheInvalidator: сброс кеша воркера
+    """
+    cache_invalidator = cache_invalidator_component.get()
+    await cache_invalidator.poll()
+    return cache_invalidator
+
+
+async def test_memory_cache_is_default(client: httpx.AsyncClient):
+    """Кеш по умолчанию создается в памяти с коротким ttl и сбросом по журналу изменений."""
+    response = await client.get('/api/advertisements/0')
+    cache_stats = advertisement_cache_component.get().stats()
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert cache_stats.backend == MemoryCacheBackend.__name__
+    assert cache_invalidator_component.peek() is not None
+
+
+async def _detail_status(client: httpx.AsyncClient) -> int:
+    return (await client.get(DETAIL_URL)).status_code
+
+
+async def test_removal_by_other_worker_is_invalidated(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    invalidator: AdvertisementCacheInvalidator,
+):
+    """Удаленное другим воркером объявление сбрасывается из кеша по журналу изменений."""
+    assert await _detail_status(client) == status.HTTP_200_OK
+    async with _other_worker():
+        await client.delete(DETAIL_URL, headers=headers)
+
+    assert await _detail_status(client) == status.HTTP_200_OK
+    assert await invalidator.poll() == 1
+    assert await _detail_status(client) == status.HTTP_404_NOT_FOUND
+
+
+async def test_fill_after_invalidation_is_dropped():
+    """Чтение, завершенное после сброса записи, не сохраняет прочитанное объявление в кеш."""
+    cache = AdvertisementCache(
+        backend=MemoryCacheBackend(max_size=WORKERS, ttl_seconds=TTL_SECONDS),
+        ttl_seconds=TTL_SECONDS,
+        negative_ttl_seconds=TTL_SECONDS,
+        invalidated_ttl_seconds=TTL_SECONDS,
+    )
+    await cache.invalidate([1])
+    await cache.set(1, None)
+
+    assert await cache.get(1) is MISSING
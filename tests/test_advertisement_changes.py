@@ -0,0 +1,157 @@
+"""Тесты журнала изменений объявлений на sqlite.
+
+На sqlite номера изменений выделяются счетчиком в транзакции записи,
+поэтому изменения видны читателям сразу после коммита без продвижения safe_seq.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import status
+from sqlalchemy import update
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.models import AdvertisementAlchemyModel
+from src.app.data_sources.storages.advertisement_archiver import archiver_component
+from src.app.data_sources.storages.advertisement_change_storage import AdvertisementChangeStorage
+from src.app.data_sources.storages.user_storage import UserStorage
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+CHANGES_URL = '/api/advertisements/changes'
+SINGLE_COUNT = 3
+BULK_COUNT = 4
+CHANGES_COUNT = SINGLE_COUNT + BULK_COUNT
+OWNER = 'owner'
+CHANGES_KEY = 'items'
+NEXT_SINCE = 'next_since'
+ADVERTISEMENT = 'advertisement'
+EXPIRED_AT = datetime(2020, 1, 1, tzinfo=timezone.utc)  # noqa: WPS432
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient) -> dict[str, str]:
+    """Владелец с объявлениями, созданными по одному и пакетом.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    owner_headers = await register_and_login(client, OWNER)
+    await create_advertisements(client, owner_headers, [
+        advertisement('single {0}'.format(index))
+        for index in range(SINGLE_COUNT)
+    ])
+    response = await client.post('/api/advertisements/bulk', headers=owner_headers, json={
+        'items': [advertisement('bulk {0}'.format(index)) for index in range(BULK_COUNT)],
+    })
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return owner_headers
+
+
+async def _changes(client: httpx.AsyncClient, since: int = 0, limit: int = 100) -> dict:
+    response = await client.get(CHANGES_URL, params={'since': since, 'limit': limit})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return response.json()
+
+
+def _seqs(page: dict) -> list[int]:
+    return [change['seq'] for change in page[CHANGES_KEY]]
+
+
+async def test_empty_feed(client: httpx.AsyncClient):
+    """Пустой журнал возвращает since как next_since."""
+    assert await _changes(client) == {CHANGES_KEY: [], NEXT_SINCE: 0, 'has_more': False}
+
+
+async def test_changes_are_ordered_by_seq(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Созданные объявления получают номера по порядку записи с текущим состоянием."""
+    page = await _changes(client)
+    first_change = page[CHANGES_KEY][0]
+    ad_ids = [change['ad_id'] for change in page[CHANGES_KEY]]
+
+    assert _seqs(page) == list(range(1, CHANGES_COUNT + 1))
+    assert ad_ids == _seqs(page)
+    assert first_change[ADVERTISEMENT]['title'] == 'single 0'
+    assert first_change[ADVERTISEMENT]['owner']['username'] == OWNER
+    assert page[NEXT_SINCE] == CHANGES_COUNT
+
+
+async def test_pages_cover_feed_without_gaps(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Страницы по next_since содержат все изменения ровно один раз."""
+    seqs = []
+    page = {NEXT_SINCE: 0, 'has_more': True}
+    while page['has_more']:
+        page = await _changes(client, since=page[NEXT_SINCE], limit=SINGLE_COUNT)
+        seqs.extend(_seqs(page))
+
+    assert seqs == list(range(1, CHANGES_COUNT + 1))
+
+
+async def test_deletion_replaces_change_with_tombstone(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Удаление записывает отметку с новым номером, прежнее изменение объявления удаляется."""
+    response = await client.delete('/api/advertisements/2', headers=headers)
+    full_feed = await _changes(client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (await _changes(client, since=CHANGES_COUNT))[CHANGES_KEY] == [
+        {'seq': CHANGES_COUNT + 1, 'ad_id': 2, 'deleted': True, ADVERTISEMENT: None},
+    ]
+    assert len(full_feed[CHANGES_KEY]) == CHANGES_COUNT
+    assert 2 not in _seqs(full_feed)
+
+
+async def test_owner_rename_records_changes(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Переименование владельца записывает его объявления заново с новым именем."""
+    async with create_session() as session:
+        await UserStorage().update_user(session=session, username=OWNER, new_username='renamed')
+    changes = (await _changes(client, since=CHANGES_COUNT))[CHANGES_KEY]
+    usernames = {change[ADVERTISEMENT]['owner']['username'] for change in changes}
+
+    assert len(changes) == CHANGES_COUNT
+    assert usernames == {'renamed'}
+
+
+async def test_purged_tombstones_require_full_sync(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """После удаления отметок чтение с since до последней удаленной отметки возвращает 410."""
+    await client.delete('/api/advertisements/2', headers=headers)
+    async with create_session() as session:
+        purged_count = await AdvertisementChangeStorage().purge_tombstones(
+            session=session,
+            before=datetime.now(timezone.utc) + timedelta(days=1),
+        )
+    gone = await client.get(CHANGES_URL, params={'since': CHANGES_COUNT})
+
+    assert purged_count == 1
+    assert gone.status_code == status.HTTP_410_GONE
+    assert not (await _changes(client, since=CHANGES_COUNT + 1))[CHANGES_KEY]
+
+
+async def test_archived_advertisements_leave_feed(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Архивированные объявления удаляются из журнала без отметок об удалении."""
+    async with create_session() as session:
+        await session.execute(
+            update(AdvertisementAlchemyModel).where(
+                AdvertisementAlchemyModel.id.in_([1, 3]),
+            ).values(
+                expires_at=EXPIRED_AT,
+            ),
+        )
+        await session.commit()
+    archive_result = await archiver_component.get().archive()
+
+    assert archive_result.archived_advertisements == 2
+    assert _seqs(await _changes(client)) == [2, 4, 5, 6, 7]
@@ -0,0 +1,114 @@
+"""Тесты счетчиков фасетов объявлений после истечения срока жизни.
+
+Истекшие объявления вычитаются из счетчиков архивацией и остаются в таблице
+до архивации, поэтому их удаление не должно вычитать их второй раз.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import status
+from sqlalchemy import update
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.models import AdvertisementAlchemyModel, AdvertisementIdAlchemyModel
+from src.app.data_sources.models.advertisement_facet import price_bucket
+from src.app.data_sources.storages.advertisement_archiver import archiver_component
+from src.app.data_sources.storages.advertisement_facet_storage import AdvertisementFacetStorage
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+FACETS_URL = '/api/advertisements/facets'
+EXPIRED_ID = 2
+REMAINING_CATEGORIES = (
+    {'category': 'Sell', 'count': 1},
+    {'category': 'Service', 'count': 1},
+)
+EXPENSIVE_PRICE = 2000
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient) -> dict[str, str]:
+    """Владелец трех объявлений, срок жизни второго истек, но оно еще не архивировано.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    owner_headers = await register_and_login(client, 'owner')
+    await create_advertisements(client, owner_headers, [
+        advertisement('sell'),
+        advertisement('buy', price=EXPENSIVE_PRICE, category='Buy'),
+        advertisement('service', category='Service'),
+    ])
+    expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    async with create_session() as session:
+        for model in (AdvertisementAlchemyModel, AdvertisementIdAlchemyModel):
+            await session.execute(
+                update(model).where(model.id == EXPIRED_ID).values(expires_at=expires_at),
+            )
+        await session.commit()
+    return owner_headers
+
+
+async def _facets(client: httpx.AsyncClient) -> dict:
+    response = await client.get(FACETS_URL)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return response.json()
+
+
+async def test_expired_advertisements_are_subtracted(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Архивация вычитает истекшие объявления из категорий и ценовых диапазонов."""
+    archive_result = await archiver_component.get().archive()
+    facets = await _facets(client)
+
+    assert archive_result.expired_advertisements == 1
+    assert archive_result.archived_advertisements == 0
+    assert facets['total'] == len(REMAINING_CATEGORIES)
+    assert facets['categories'] == list(REMAINING_CATEGORIES)
+    bucket_counts = {bucket['price_min']: bucket['count'] for bucket in facets['price_buckets']}
+    assert bucket_counts[price_bucket(EXPENSIVE_PRICE)] == 0
+
+
+async def test_expired_are_subtracted_once(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Повторная архивация не вычитает уже вычтенные объявления."""
+    await archiver_component.get().archive()
+
+    archive_result = await archiver_component.get().archive()
+
+    assert archive_result.expired_advertisements == 0
+    assert (await _facets(client))['total'] == len(REMAINING_CATEGORIES)
+
+
+async def test_removing_expired_keeps_counts(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Удаление вычтенного истекшего объявления не изменяет счетчики."""
+    await archiver_component.get().archive()
+
+    response = await client.delete('/api/advertisements/{0}'.format(EXPIRED_ID), headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert (await _facets(client))['total'] == len(REMAINING_CATEGORIES)
+
+
+async def test_rebuild_matches_counters(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Пересчет сводной таблицы после вычитания истекших объявлений дает те же фасеты."""
+    await archiver_component.get().archive()
+    facets = await _facets(client)
+
+    async with create_session() as session:
+        await AdvertisementFacetStorage().rebuild_facets(session=session)
+
+    assert await _facets(client) == facets
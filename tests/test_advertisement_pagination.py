@@ -0,0 +1,93 @@
+"""Тесты постраничного получения объявлений по курсору after_id."""
+
+import httpx
+import pytest
+from fastapi import status
+
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+ADVERTISEMENTS_COUNT = 6
+LIMIT = 3
+CURSOR = 'next_cursor'
+
+
+async def _page(client: httpx.AsyncClient, **query) -> tuple[list[int], int | None]:
+    response = await client.get('/api/advertisements', params=query)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    page = response.json()
+    return [ad['id'] for ad in page['items']], page[CURSOR]
+
+
+@pytest.fixture
+async def ad_ids(client: httpx.AsyncClient) -> list[int]:
+    """Объявления категорий Sell и Buy по очереди.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        list[int]: id объявлений в порядке создания
+    """
+    headers = await register_and_login(client, 'owner')
+    categories = ('Sell', 'Buy')
+    await create_advertisements(client, headers, [
+        advertisement('title', price=index, category=categories[index % 2])
+        for index in range(ADVERTISEMENTS_COUNT)
+    ])
+    return list(range(1, ADVERTISEMENTS_COUNT + 1))
+
+
+async def test_pages_follow_cursor_without_gaps(client: httpx.AsyncClient, ad_ids: list[int]):
+    """Страницы по курсору содержат все объявления по возрастанию id без повторов."""
+    first_ids, first_cursor = await _page(client, limit=LIMIT)
+    second_ids, _ = await _page(client, limit=LIMIT, after_id=first_cursor)
+
+    assert first_ids == ad_ids[:LIMIT]
+    assert first_cursor == ad_ids[LIMIT - 1]
+    assert second_ids == ad_ids[LIMIT:]
+
+
+async def test_full_last_page_is_followed_by_empty_page(
+    client: httpx.AsyncClient,
+    ad_ids: list[int],
+):
+    """Полная последняя страница возвращает курсор, следующая за ней страница пуста."""
+    previous_cursor = ad_ids[LIMIT - 1]
+    _, last_cursor = await _page(client, limit=LIMIT, after_id=previous_cursor)
+    empty_page = await _page(client, limit=LIMIT, after_id=last_cursor)
+
+    assert last_cursor == ad_ids[-1]
+    assert empty_page == ([], None)
+
+
+async def test_short_page_has_no_cursor(client: httpx.AsyncClient, ad_ids: list[int]):
+    """Неполная страница не возвращает курсор."""
+    previous_cursor = ad_ids[LIMIT - 1]
+    page = await _page(client, limit=LIMIT + 1, after_id=previous_cursor)
+
+    assert page == (ad_ids[LIMIT:], None)
+
+
+async def test_cursor_is_applied_after_filter(client: httpx.AsyncClient, ad_ids: list[int]):
+    """Курсор фильтрованной страницы указывает на последнее подходящее объявление."""
+    buy_ids = ad_ids[1::2]
+    first_ids, first_cursor = await _page(client, limit=2, category='Buy')
+    second_page = await _page(client, limit=2, category='Buy', after_id=first_cursor)
+
+    assert first_ids == buy_ids[:2]
+    assert first_cursor == buy_ids[1]
+    assert second_page == (buy_ids[2:], None)
+
+
+@pytest.mark.parametrize('query', [
+    {'limit': 0},
+    {'limit': 101},
+    {'after_id': -1},
+])
+async def test_invalid_page_parameters(client: httpx.AsyncClient, query: dict):
+    """Лимит вне допустимого диапазона и отрицательный курсор отклоняются."""
+    response = await client.get('/api/advertisements', params=query)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
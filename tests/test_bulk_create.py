@@ -0,0 +1,98 @@
+"""Тесты пакетного создания объявлений."""
+
+import httpx
+import pytest
+from fastapi import status
+
+from tests.api import advertisement, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+BULK_URL = '/api/advertisements/bulk'
+MAX_ITEMS = 1000
+TITLE = 'title'
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient) -> dict[str, str]:
+    """Заголовки авторизации владельца.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    return await register_and_login(client, 'owner')
+
+
+async def _bulk(client: httpx.AsyncClient, headers: dict[str, str], batch: list) -> httpx.Response:
+    return await client.post(BULK_URL, headers=headers, json={'items': batch})
+
+
+async def _titles(client: httpx.AsyncClient) -> list[str]:
+    page = (await client.get('/api/advertisements')).json()
+    return [ad[TITLE] for ad in page['items']]
+
+
+def _error_locations(bulk_result: dict) -> list[tuple[int, list]]:
+    return [
+        (error['index'], [detail['loc'] for detail in error['detail']])
+        for error in bulk_result['errors']
+    ]
+
+
+async def test_invalid_items_are_reported_by_index(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Некорректные элементы возвращаются с индексом и полем ошибки, корректные создаются."""
+    response = await _bulk(client, headers, [
+        advertisement('first'),
+        advertisement('second', category='Unknown'),
+        advertisement('third', price=-1),
+        advertisement('fourth'),
+    ])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['created_ids'] == [1, 2]
+    assert _error_locations(response.json()) == [
+        (1, [['category']]),
+        (2, [['price']]),
+    ]
+    assert await _titles(client) == ['first', 'fourth']
+
+
+async def test_missing_fields_are_reported(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Каждое отсутствующее поле элемента возвращается отдельной ошибкой."""
+    response = await _bulk(client, headers, [{TITLE: 'only'}])
+
+    assert not response.json()['created_ids']
+    assert _error_locations(response.json()) == [
+        (0, [['category'], ['price'], ['description']]),
+    ]
+    assert not await _titles(client)
+
+
+@pytest.mark.parametrize('batch', [
+    [],
+    [advertisement(TITLE) for _ in range(MAX_ITEMS + 1)],
+    ['not an object'],
+])
+async def test_invalid_batch_is_rejected(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    batch: list,
+):
+    """Пустой, слишком большой пакет или пакет не из объектов отклоняется целиком."""
+    response = await _bulk(client, headers, batch)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert not await _titles(client)
+
+
+async def test_bulk_requires_authentication(client: httpx.AsyncClient):
+    """Пакет без токена доступа не принимается."""
+    response = await _bulk(client, {}, [advertisement(TITLE)])
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
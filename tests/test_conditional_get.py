@@ -0,0 +1,120 @@
+"""Тесты условных GET запросов объявлений по ETag и Last-Modified."""
+
+import httpx
+import pytest
+from fastapi import status
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.user_storage import UserStorage
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+DETAIL_URL = '/api/advertisements/1'
+LIST_URL = '/api/advertisements'
+OWNER = 'owner'
+ETAG = 'etag'
+LAST_MODIFIED = 'last-modified'
+IF_NONE_MATCH = 'If-None-Match'
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient) -> dict[str, str]:
+    """Заголовки авторизации владельца с одним созданным объявлением.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+
+    Returns:
+        dict[str, str]: заголовок Authorization владельца
+    """
+    owner_headers = await register_and_login(client, OWNER)
+    await create_advertisements(client, owner_headers, [advertisement('first')])
+    return owner_headers
+
+
+@pytest.mark.parametrize('url', [DETAIL_URL, LIST_URL])
+async def test_matching_etag_returns_not_modified(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    url: str,
+):
+    """Совпадающий ETag возвращает 304 без тела с теми же заголовками кеширования."""
+    response = await client.get(url)
+
+    not_modified = await client.get(url, headers={IF_NONE_MATCH: response.headers[ETAG]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not not_modified.content
+    assert not_modified.headers[ETAG] == response.headers[ETAG]
+    assert not_modified.headers[LAST_MODIFIED] == response.headers[LAST_MODIFIED]
+
+
+async def test_weak_etag_in_list_returns_not_modified(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Слабый ETag среди нескольких значений If-None-Match тоже совпадает."""
+    etag = (await client.get(DETAIL_URL)).headers[ETAG]
+
+    response = await client.get(DETAIL_URL, headers={
+        IF_NONE_MATCH: '"other", W/{0}'.format(etag),
+    })
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.parametrize('url', [DETAIL_URL, LIST_URL])
+async def test_if_modified_since(client: httpx.AsyncClient, headers: dict[str, str], url: str):
+    """If-Modified-Since не раньше Last-Modified возвращает 304, более раннее время - 200."""
+    last_modified = (await client.get(url)).headers[LAST_MODIFIED]
+
+    not_modified = await client.get(url, headers={'If-Modified-Since': last_modified})
+    modified = await client.get(url, headers={
+        'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT',
+    })
+
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert modified.status_code == status.HTTP_200_OK
+
+
+async def test_if_none_match_takes_precedence(client: httpx.AsyncClient, headers: dict[str, str]):
+    """При несовпадающем ETag If-Modified-Since не учитывается."""
+    last_modified = (await client.get(DETAIL_URL)).headers[LAST_MODIFIED]
+
+    response = await client.get(DETAIL_URL, headers={
+        IF_NONE_MATCH: '"other"',
+        'If-Modified-Since': last_modified,
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_list_etag_changes_with_new_advertisement(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """После создания объявления старый ETag страницы больше не совпадает."""
+    etag = (await client.get(LIST_URL)).headers[ETAG]
+    await create_advertisements(client, headers, [advertisement('second')])
+
+    response = await client.get(LIST_URL, headers={IF_NONE_MATCH: etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['items']) == 2
+
+
+async def test_detail_etag_changes_with_owner_rename(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Переименование владельца изменяет ETag объявления, хотя само объявление не изменялось."""
+    etag = (await client.get(DETAIL_URL)).headers[ETAG]
+    async with create_session() as session:
+        await UserStorage().update_user(session=session, username=OWNER, new_username='renamed')
+
+    response = await client.get(DETAIL_URL, headers={IF_NONE_MATCH: etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['owner']['username'] == 'renamed'
@@ -0,0 +1,27 @@
+"""Тесты публикации статистики компонентов воркера в метрики prometheus."""
+
+import httpx
+import pytest
+from fastapi import status
+from prometheus_client import REGISTRY
+
+pytestmark = pytest.mark.anyio
+
+METRICS_URL = '/metrics'
+
+
+def _advertisement_misses() -> float:
+    return REGISTRY.get_sample_value('cache_misses_total', {'cache': 'advertisement'}) or 0
+
+
+async def test_cache_statistics_are_published_on_scrape(client: httpx.AsyncClient):
+    """Запрос метрик переносит прирост статистики кеша в счетчик prometheus."""
+    await client.get(METRICS_URL)
+    misses_before = _advertisement_misses()
+    await client.get('/api/advertisements/0')
+
+    response = await client.get(METRICS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert _advertisement_misses() == misses_before + 1
+    assert 'db_pool_overflow_events_total' in response.text
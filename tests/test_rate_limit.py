@@ -0,0 +1,130 @@
+"""Тесты ограничения частоты запросов с хранилищем корзин в памяти."""
+
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from prometheus_client import REGISTRY
+
+from src.app.api.rate_limit.store import MemoryTokenBucketStore
+from src.config.config import settings
+from tests.api import BASE_URL, PASSWORD, advertisement, register, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+REGISTER_ROUTE = 'POST /api/users/register'
+AUTH_ROUTE = 'POST /api/users/auth'
+BULK_ROUTE = 'POST /api/advertisements/bulk'
+OTHER_IP = '10.0.0.2'
+USERNAME = 'user'
+
+
+@pytest.fixture
+def rate_limit_enabled() -> bool:
+    """Ограничение частоты запросов включено для всех тестов модуля.
+
+    Returns:
+        bool: включено ли ограничение частоты запросов
+    """
+    return True
+
+
+@pytest.fixture
+async def other_client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """Клиент приложения с другого адреса.
+
+    Args:
+        app (FastAPI): приложение
+
+    Yields:
+        httpx.AsyncClient: клиент
+    """
+    transport = httpx.ASGITransport(app=app, client=(OTHER_IP, 1))
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as test_client:
+        yield test_client
+
+
+def _burst(route: str) -> int:
+    return settings.rate_limit.routes[route].burst
+
+
+def _rejected_requests(route_path: str) -> float:
+    sample = REGISTRY.get_sample_value('http_requests_total', {
+        'method': 'POST',
+        'route': route_path,
+        'status': str(status.HTTP_429_TOO_MANY_REQUESTS),
+    })
+    return sample or 0
+
+
+def _limited_codes(burst: int) -> list[int]:
+    return [status.HTTP_200_OK for _ in range(burst)] + [status.HTTP_429_TOO_MANY_REQUESTS]
+
+
+async def _auth(client: httpx.AsyncClient, username: str) -> int:
+    response = await client.post('/api/users/auth', data={
+        'username': username,
+        'password': PASSWORD,
+    })
+    return response.status_code
+
+
+async def test_register_burst_is_limited_by_ip(
+    client: httpx.AsyncClient,
+    other_client: httpx.AsyncClient,
+):
+    """Регистрации сверх емкости корзины адреса отклоняются с Retry-After и меткой маршрута."""
+    burst = _burst(REGISTER_ROUTE)
+    rejected_before = _rejected_requests('/api/users/register')
+    responses = [
+        await register(client, 'user{0}'.format(index))
+        for index in range(burst + 1)
+    ]
+    codes = [response.status_code for response in responses]
+
+    assert codes == _limited_codes(burst)
+    assert int(responses[-1].headers['retry-after']) >= 1
+    assert _rejected_requests('/api/users/register') == rejected_before + 1
+    assert (await register(other_client, 'other')).status_code == status.HTTP_200_OK
+
+
+async def test_auth_is_limited_by_ip_and_username(
+    client: httpx.AsyncClient,
+    other_client: httpx.AsyncClient,
+):
+    """Вход одного пользователя с одного адреса ограничен, с другого адреса - нет."""
+    await register(client, USERNAME)
+    burst = _burst(AUTH_ROUTE)
+    codes = [await _auth(client, USERNAME) for _ in range(burst + 1)]
+
+    assert codes == _limited_codes(burst)
+    assert await _auth(other_client, USERNAME) == status.HTTP_200_OK
+
+
+async def test_bulk_is_limited_by_subject(client: httpx.AsyncClient):
+    """Пакетное создание ограничено по пользователю, анонимный запрос доходит до проверки токена."""
+    headers = await register_and_login(client, USERNAME)
+    burst = _burst(BULK_ROUTE)
+    codes = [
+        (await client.post(
+            '/api/advertisements/bulk',
+            headers=headers,
+            json={'items': [advertisement('title')]},
+        )).status_code
+        for _ in range(burst + 1)
+    ]
+    anonymous = await client.post('/api/advertisements/bulk', json={'items': []})
+
+    assert codes == _limited_codes(burst)
+    assert anonymous.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_rejected_take_keeps_other_tokens():
+    """Отклоненный запрос не забирает токены из корзин, в которых они есть."""
+    store = MemoryTokenBucketStore(max_keys=10)
+    rate = 0.001
+
+    assert await store.take(['full'], rate, burst=1) == 0
+    assert await store.take(['full', 'spare'], rate, burst=1) > 0
+    assert await store.take(['spare'], rate, burst=1) == 0
@@ -0,0 +1,36 @@
+"""Тесты регистрации пользователей с занятым именем."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import status
+
+from tests.api import register
+
+pytestmark = pytest.mark.anyio
+
+USERNAME = 'user'
+CONCURRENT_REGISTRATIONS = 3
+
+
+async def test_taken_username_is_rejected(client: httpx.AsyncClient):
+    """Повторная регистрация с тем же именем отклоняется."""
+    first = await register(client, USERNAME)
+    second = await register(client, USERNAME)
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_concurrent_registrations_create_one_user(client: httpx.AsyncClient):
+    """Из одновременных регистраций с одним именем успешна только одна."""
+    responses = await asyncio.gather(*(
+        register(client, USERNAME)
+        for _ in range(CONCURRENT_REGISTRATIONS)
+    ))
+    codes = sorted(response.status_code for response in responses)
+
+    assert codes == [status.HTTP_200_OK] + [
+        status.HTTP_400_BAD_REQUEST for _ in range(CONCURRENT_REGISTRATIONS - 1)
+    ]
@@ -0,0 +1,132 @@
+"""Тесты объединения одинаковых параллельных чтений."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import status
+from prometheus_client import REGISTRY
+
+from src.app.data_sources.single_flight import SingleFlight
+from tests.api import advertisement, create_advertisements, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+KEY = 'key'
+NAME = 'test'
+WAIT_TIMEOUT_SECONDS = 0.01
+CONCURRENT_READS = 5
+
+
+class _Read(object):
+    """Чтение, которое завершается по сигналу и считает вызовы."""
+
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self._error = error
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        call_number = self.calls
+        await self.release.wait()
+        if self._error is not None:
+            raise self._error
+        return call_number
+
+
+async def _start(flight: SingleFlight, read: _Read, count: int) -> list[asyncio.Task]:
+    tasks = [
+        asyncio.create_task(flight.run(KEY, read))
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def _requests_count(name: str, outcome: str) -> float:
+    sample = REGISTRY.get_sample_value(
+        'single_flight_requests_total',
+        {'name': name, 'outcome': outcome},
+    )
+    return sample or 0
+
+
+async def test_concurrent_reads_share_one_call():
+    """Одинаковые параллельные чтения выполняют одно чтение и получают его результат."""
+    flight = SingleFlight(NAME, wait_timeout_seconds=1)
+    read = _Read()
+    tasks = await _start(flight, read, CONCURRENT_READS)
+    read.release.set()
+
+    assert set(await asyncio.gather(*tasks)) == {1}
+    assert read.calls == 1
+    assert flight.in_flight() == 0
+
+
+async def test_error_is_shared():
+    """Ошибку чтения получают все ожидавшие его запросы."""
+    flight = SingleFlight(NAME, wait_timeout_seconds=1)
+    read = _Read(error=KeyError(KEY))
+    tasks = await _start(flight, read, CONCURRENT_READS)
+    read.release.set()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(outcome, KeyError) for outcome in outcomes)
+    assert read.calls == 1
+
+
+async def test_follower_reads_after_timeout():
+    """Не дождавшийся чужого чтения запрос выполняет чтение сам."""
+    flight = SingleFlight(NAME, wait_timeout_seconds=WAIT_TIMEOUT_SECONDS)
+    read = _Read()
+    leader, follower = await _start(flight, read, 2)
+    await asyncio.sleep(WAIT_TIMEOUT_SECONDS * 2)
+
+    assert read.calls == 2
+    assert not follower.done()
+
+    read.release.set()
+
+    assert await leader == 1
+    assert await follower == 2
+
+
+async def test_follower_reads_after_leader_cancel():
+    """Отмена выполнявшего чтение запроса не отменяет ожидавшие запросы."""
+    flight = SingleFlight(NAME, wait_timeout_seconds=1)
+    read = _Read()
+    leader, follower = await _start(flight, read, 2)
+    leader.cancel()
+    await asyncio.sleep(0)
+    read.release.set()
+
+    assert await follower == 2
+    assert leader.cancelled()
+    assert flight.in_flight() == 0
+
+
+async def test_disabled_flight_reads_every_time():
+    """Выключенное объединение выполняет каждое чтение отдельно."""
+    flight = SingleFlight(NAME, wait_timeout_seconds=1, enabled=False)
+    read = _Read()
+    tasks = await _start(flight, read, 2)
+    read.release.set()
+
+    assert await asyncio.gather(*tasks) == [1, 2]
+
+
+async def test_concurrent_page_requests_are_coalesced(client: httpx.AsyncClient):
+    """Параллельные запросы одной страницы объявлений объединяются в воркере."""
+    headers = await register_and_login(client, 'owner')
+    await create_advertisements(client, headers, [advertisement('title')])
+    coalesced_before = _requests_count('advertisement_page', 'coalesced')
+
+    responses = await asyncio.gather(*(
+        client.get('/api/advertisements', params={'category': 'Sell'})
+        for _ in range(CONCURRENT_READS)
+    ))
+
+    assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+    assert len({response.content for response in responses}) == 1
+    assert _requests_count('advertisement_page', 'coalesced') > coalesced_before
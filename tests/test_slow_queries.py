@@ -0,0 +1,38 @@
+"""Тесты журнала медленных запросов воркера."""
+
+import os
+
+import httpx
+import pytest
+from fastapi import status
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.user_storage import UserStorage
+from tests.api import login, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+SLOW_QUERIES_URL = '/api/service/slow-queries'
+ADMIN = 'admin'
+
+
+async def test_report_contains_worker_pid(client: httpx.AsyncClient):
+    """Журнал медленных запросов возвращается вместе с pid воркера, которому он принадлежит."""
+    await register_and_login(client, ADMIN)
+    async with create_session() as session:
+        await UserStorage().update_user(session=session, username=ADMIN, is_admin=True)
+
+    response = await client.get(SLOW_QUERIES_URL, headers=await login(client, ADMIN))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['worker_pid'] == os.getpid()
+    assert isinstance(response.json()['items'], list)
+
+
+async def test_report_requires_admin(client: httpx.AsyncClient):
+    """Журнал медленных запросов недоступен обычному пользователю."""
+    headers = await register_and_login(client, 'user')
+
+    response = await client.get(SLOW_QUERIES_URL, headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
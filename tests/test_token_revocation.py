@@ -0,0 +1,109 @@
+"""Тесты отзыва токенов доступа по версии токенов пользователя.
+
+Каждый тест выполняется с проверкой токена по пользователю из бд и в режиме stateless_claims.
+"""
+
+import httpx
+import pytest
+from fastapi import status
+
+from src.app.data_sources.adaptor import create_session
+from src.app.data_sources.storages.user_storage import UserStorage
+from src.config.config import settings
+from tests.api import login, register_and_login
+
+pytestmark = pytest.mark.anyio
+
+PROTECTED_URL = '/api/users/me/advertisements'
+USERNAME = 'user'
+
+user_storage = UserStorage()
+
+
+@pytest.fixture(params=[False, True], ids=['database_user', 'stateless_claims'])
+def stateless_claims(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Режим проверки токена.
+
+    Args:
+        request (pytest.FixtureRequest): параметр фикстуры
+        monkeypatch (pytest.MonkeyPatch): подмена настроек на время теста
+
+    Returns:
+        bool: включен ли режим stateless_claims
+    """
+    monkeypatch.setattr(settings.access_token, 'stateless_claims', request.param)
+    return request.param
+
+
+@pytest.fixture
+async def headers(client: httpx.AsyncClient, stateless_claims: bool) -> dict[str, str]:
+    """Заголовки авторизации пользователя, токен которого принимается.
+
+    Args:
+        client (httpx.AsyncClient): клиент приложения
+        stateless_claims (bool): режим проверки токена
+
+    Returns:
+        dict[str, str]: заголовок Authorization пользователя
+    """
+    user_headers = await register_and_login(client, USERNAME)
+    assert await _status(client, user_headers) == status.HTTP_200_OK
+    return user_headers
+
+
+async def _status(client: httpx.AsyncClient, headers: dict[str, str]) -> int:
+    return (await client.get(PROTECTED_URL, headers=headers)).status_code
+
+
+async def _update_user(**changes):
+    async with create_session() as session:
+        await user_storage.update_user(session=session, username=USERNAME, **changes)
+
+
+async def test_password_change_revokes_token(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Смена хеша пароля отзывает выданный токен."""
+    async with create_session() as session:
+        user = await user_storage.get_user_by_username(session=session, username=USERNAME)
+    await _update_user(password_hash='{0}-changed'.format(user.password_hash))
+
+    assert await _status(client, headers) == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_same_password_keeps_token(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Запись того же хеша пароля не изменяет версию токенов."""
+    async with create_session() as session:
+        user = await user_storage.get_user_by_username(session=session, username=USERNAME)
+    await _update_user(password_hash=user.password_hash)
+
+    assert await _status(client, headers) == status.HTTP_200_OK
+
+
+async def test_rename_revokes_token(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Переименование отзывает токен, содержащий старое имя."""
+    await _update_user(new_username='renamed')
+
+    assert await _status(client, headers) == status.HTTP_401_UNAUTHORIZED
+    assert await _status(client, await login(client, 'renamed')) == status.HTTP_200_OK
+
+
+async def test_only_demotion_revokes_token(client: httpx.AsyncClient, headers: dict[str, str]):
+    """Назначение администратором не отзывает токен, снятие прав администратора отзывает."""
+    await _update_user(is_admin=True)
+    admin_headers = await login(client, USERNAME)
+
+    assert await _status(client, headers) == status.HTTP_200_OK
+
+    await _update_user(is_admin=False)
+
+    assert await _status(client, admin_headers) == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_token_of_other_user_is_not_revoked(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+):
+    """Отзыв токенов одного пользователя не затрагивает токены другого."""
+    other_headers = await register_and_login(client, 'other')
+    await _update_user(new_username='renamed')
+
+    assert await _status(client, other_headers) == status.HTTP_200_OK